@@ -0,0 +1,279 @@
+"""bench.py
+===========
+Benchmark do laço de simulação com cargas sintéticas (`workload.py`).
+
+Para cada algoritmo × tamanho (10² → 10⁶ tarefas) gera a carga, executa
+`Simulator.run` e mede:
+- `setup_s` / `run_s`: construção do simulador e execução (perf_counter);
+- `ticks_per_s`: ticks simulados por segundo de `run`;
+- `events_per_s`: eventos de escalonamento por segundo (chegadas, conclusões
+  e eventos de mutex/E/S das tarefas concluídas);
+- `peak_rss_mb`: pico de memória residente do processo que rodou o caso.
+
+Uso:
+    python main.py bench --sizes 100,1000,10000 --save-baseline bench_baseline.json
+    python main.py bench --compare bench_baseline.json --tolerance 0.2
+
+Decisões de design:
+- Cada caso roda num processo novo (pool de 1 processo descartado ao fim),
+  então o pico de RSS é só daquele caso e nada vaza entre tamanhos. A carga
+  é gerada dentro do processo filho a partir dos parâmetros e da semente –
+  só um dict pequeno atravessa o pipe. `--inline` roda tudo no processo
+  atual (para perfilar), e aí o RSS é cumulativo.
+- A saída é JSON (`--out`) e o arquivo de baseline tem o mesmo formato;
+  `--compare` acusa regressão quando `ticks_per_s` cai mais que
+  `--tolerance` em relação ao baseline e encerra com código 1 (útil em CI).
+- O sink de eventos é silencioso e `tick_limit` vem de `tick_budget`,
+  suficiente para a carga terminar.
+- `--check-smp` não mede nada: roda cada caso no `Simulator` e no
+  `SMPSimulator` com 1 núcleo e sai com código 1 se timeline, espera,
+  suspensão ou término divergirem (use com `--mutex-density`/`--io-density`
+  e tamanhos pequenos).
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from simulator import Simulator, ENGINES
+from smp import SMPSimulator
+from workload import ARRIVALS, BURSTS, generate_workload, tick_budget
+
+
+ALGORITHMS = ("FIFO", "SRTF", "PRIOP", "PRIOPEnv", "RR", "MLFQ", "CFS", "EDF")
+SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+BASELINE_VERSION = 1
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KiB; macOS, bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _case_config(case):
+    """Gera a carga do caso e devolve a configuração do simulador."""
+    tasks = generate_workload(
+        case["tasks"], case["arrival"], case["rate"], case["burst"], case["mean_burst"],
+        case["mutex_density"], case["mutexes"], case["io_density"], case["mean_io"],
+        seed=case["seed"],
+    )
+    return {
+        "algorithm": case["algorithm"], "quantum": case["quantum"], "alpha": case["alpha"],
+        "tasks": tasks, "engine": case["engine"], "timeline": case["timeline"],
+        "events": "none", "tick_limit": tick_budget(tasks),
+    }
+
+
+def run_case(case):
+    """Executa um caso (dict de parâmetros) e devolve a linha de resultado."""
+    config = _case_config(case)
+    random.seed(case["seed"])
+
+    started = time.perf_counter()
+    sim = Simulator(config)
+    built = time.perf_counter()
+    sim.run()
+    finished = time.perf_counter()
+
+    done = [t for t in sim.tasks if t.completed]
+    events = len(sim.arrivals_map) + len(done) + sum(len(t.events) + len(t.io_events) for t in done)
+    run_s = finished - built
+    return {
+        "algorithm": case["algorithm"],
+        "engine": case["engine"],
+        "tasks": case["tasks"],
+        "completed": len(done),
+        "ticks": sim.time,
+        "events": events,
+        "setup_s": built - started,
+        "run_s": run_s,
+        "ticks_per_s": sim.time / run_s if run_s else 0.0,
+        "events_per_s": events / run_s if run_s else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _outcome(sim):
+    return {
+        "time": sim.time,
+        "timeline": list(sim.timeline),
+        "wait_map": {k: list(v.intervals()) for k, v in sim.wait_map.items()},
+        "suspended_map": {k: list(v.intervals()) for k, v in sim.suspended_map.items()},
+        "finish_map": sim.finish_map,
+    }
+
+
+def check_uniprocessor(case):
+    """Compara `Simulator` e `SMPSimulator` com 1 núcleo no mesmo caso.
+
+    Returns:
+        list[str]: campos do resultado que divergem (vazia se idênticos)
+    """
+    outcomes = []
+    for cls, extra in ((Simulator, {}), (SMPSimulator, {"cpus": 1})):
+        random.seed(case["seed"])
+        sim = cls(dict(_case_config(case), **extra))
+        sim.run()
+        outcomes.append(_outcome(sim))
+    single, smp = outcomes
+    return [key for key in single if single[key] != smp[key]]
+
+
+def _cases(sizes, algorithms, **params):
+    for size in sizes:
+        for algorithm in algorithms:
+            yield dict(params, algorithm=algorithm, tasks=size)
+
+
+def run_benchmark(sizes=SIZES, algorithms=ALGORITHMS, engine="event", timeline="rle",
+                  arrival="poisson", rate=None, burst="exponential", mean_burst=5,
+                  mutex_density=0.0, mutexes=1, io_density=0.0, mean_io=3,
+                  quantum=4, alpha=1, seed=0, inline=False, progress=None):
+    """Executa todos os casos e devolve a lista de resultados.
+
+    `rate=None` usa 0.9 / mean_burst (CPU ~90% ocupada). `progress(row)` é
+    chamado após cada caso, se informado.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Motor de simulação desconhecido: {engine}")
+    rate = rate if rate is not None else 0.9 / mean_burst
+    results = []
+    for case in _cases(sizes, algorithms, engine=engine, timeline=timeline,
+                       arrival=arrival, rate=rate, burst=burst, mean_burst=mean_burst,
+                       mutex_density=mutex_density, mutexes=mutexes,
+                       io_density=io_density, mean_io=mean_io,
+                       quantum=quantum, alpha=alpha, seed=seed):
+        if inline:
+            row = run_case(case)
+        else:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                row = pool.submit(run_case, case).result()
+        results.append(row)
+        if progress:
+            progress(row)
+    return results
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Lista as regressões de `ticks_per_s` em relação ao baseline.
+
+    Casos são casados por (algoritmo, motor, tarefas); casos ausentes no
+    baseline são ignorados.
+    """
+    index = {(r["algorithm"], r["engine"], r["tasks"]): r for r in baseline["results"]}
+    regressions = []
+    for row in results:
+        base = index.get((row["algorithm"], row["engine"], row["tasks"]))
+        if base and row["ticks_per_s"] < base["ticks_per_s"] * (1 - tolerance):
+            regressions.append((row, base))
+    return regressions
+
+
+def _format_row(row):
+    rss = "-" if row["peak_rss_mb"] is None else f"{row['peak_rss_mb']:.0f}"
+    return (f"{row['algorithm']:<9}{row['tasks']:>9}{row['completed']:>10}{row['ticks']:>10}"
+            f"{row['run_s']:>9.3f}{row['ticks_per_s']:>13.0f}{row['events_per_s']:>13.0f}{rss:>8}")
+
+
+def _list(cast):
+    return lambda text: [cast(v) for v in text.split(",") if v.strip()]
+
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="main.py bench", description="Benchmark do simulador com cargas sintéticas")
+    p.add_argument("--sizes", type=_list(int), default=list(SIZES), help="Números de tarefas, ex: 100,1000,10000")
+    p.add_argument("--algorithms", type=_list(str), default=list(ALGORITHMS), help="Algoritmos (separados por vírgula)")
+    p.add_argument("--engine", choices=ENGINES, default="event", help="Motor de simulação")
+    p.add_argument("--arrival", choices=ARRIVALS, default="poisson", help="Processo de chegada")
+    p.add_argument("--rate", type=float, default=None, help="Taxa de chegada (tarefas/tick; default 0.9/mean-burst)")
+    p.add_argument("--burst", choices=BURSTS, default="exponential", help="Distribuição da duração")
+    p.add_argument("--mean-burst", dest="mean_burst", type=float, default=5, help="Duração média (ticks)")
+    p.add_argument("--mutex-density", dest="mutex_density", type=float, default=0.0, help="Probabilidade de seção crítica por tarefa")
+    p.add_argument("--io-density", dest="io_density", type=float, default=0.0, help="Operações de E/S por tick de CPU")
+    p.add_argument("--quantum", type=int, default=4)
+    p.add_argument("--alpha", type=int, default=1)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--inline", action="store_true", help="Roda no processo atual (sem isolamento de memória)")
+    p.add_argument("--out", help="Grava os resultados em JSON")
+    p.add_argument("--save-baseline", dest="save_baseline", help="Grava os resultados como baseline")
+    p.add_argument("--compare", help="Compara com um baseline e sai com código 1 se houver regressão")
+    p.add_argument("--tolerance", type=float, default=0.2, help="Queda relativa de ticks/s tolerada (default 0.2)")
+    p.add_argument("--check-smp", dest="check_smp", action="store_true",
+                   help="Só verifica que o SMP com 1 núcleo reproduz o Simulator (código 1 se divergir)")
+    return p
+
+
+def _check_smp(args):
+    rate = args.rate if args.rate is not None else 0.9 / args.mean_burst
+    failed = 0
+    for case in _cases(args.sizes, args.algorithms, engine=args.engine, timeline="rle",
+                       arrival=args.arrival, rate=rate, burst=args.burst,
+                       mean_burst=args.mean_burst, mutex_density=args.mutex_density,
+                       mutexes=1, io_density=args.io_density, mean_io=3,
+                       quantum=args.quantum, alpha=args.alpha, seed=args.seed):
+        diverged = check_uniprocessor(case)
+        if diverged:
+            failed += 1
+            print(f"DIVERGÊNCIA {case['algorithm']} n={case['tasks']}: {', '.join(diverged)}")
+    if failed:
+        return 1
+    print("SMP com 1 núcleo idêntico ao Simulator.")
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.check_smp:
+        return _check_smp(args)
+    print(f"{'algoritmo':<9}{'tarefas':>9}{'concl.':>10}{'ticks':>10}{'run_s':>9}{'ticks/s':>13}{'eventos/s':>13}{'RSS_MB':>8}")
+    results = run_benchmark(
+        args.sizes, args.algorithms, args.engine, arrival=args.arrival, rate=args.rate,
+        burst=args.burst, mean_burst=args.mean_burst, mutex_density=args.mutex_density,
+        io_density=args.io_density, quantum=args.quantum, alpha=args.alpha, seed=args.seed,
+        inline=args.inline, progress=lambda row: print(_format_row(row), flush=True),
+    )
+    document = {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "params": {k: v for k, v in vars(args).items()
+                   if k not in ("out", "save_baseline", "compare", "tolerance", "inline", "check_smp")},
+        "results": results,
+    }
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        ignored = ("sizes", "algorithms", "engine")
+        changed = sorted(k for k, v in document["params"].items()
+                         if k not in ignored and baseline.get("params", {}).get(k) != v)
+        if changed:
+            print(f"Aviso: parâmetros da carga diferem do baseline: {', '.join(changed)}")
+        regressions = compare(results, baseline, args.tolerance)
+        for row, base in regressions:
+            print(f"REGRESSÃO {row['algorithm']} n={row['tasks']}: "
+                  f"{row['ticks_per_s']:.0f} ticks/s (baseline {base['ticks_per_s']:.0f})")
+        if regressions:
+            return 1
+        print("Sem regressões em relação ao baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""config_cache.py
+==================
+Cache em disco da tabela de tarefas já interpretada (`load_config(..., cache=True)`).
+
+Reinterpretar um arquivo grande e inalterado a cada execução custa segundos
+(uma chamada a `parse_task_line` por linha). O cache guarda o resultado em
+formato binário colunar, ao lado do arquivo:
+
+    <pasta do config>/__configcache__/<nome do arquivo>.bin
+
+Formato: `MAGIC` + `marshal` de uma tupla com a chave, o cabeçalho e as
+colunas – ids e cores como uma única string separada por '\\n' (linhas não
+contêm '\\n'), as colunas numéricas como bytes de `array` (32 bits quando
+os valores cabem, senão 64; prazo ausente = -1) e os eventos de mutex e de E/S achatados em
+arrays com deslocamentos por tarefa.
+`marshal` é rápido e compacto, mas específico da versão do Python; por isso a
+versão faz parte de `MAGIC` e qualquer incompatibilidade vira cache ausente.
+
+Chave: tamanho + `st_mtime_ns` (verificação barata) e o hash BLAKE2b do
+conteúdo. Se tamanho e mtime batem, o cache é usado sem ler o arquivo; se só
+o mtime mudou (arquivo regravado com o mesmo conteúdo, como a GUI faz antes
+de cada execução), o hash decide e a chave é atualizada. Falhas de E/S ao
+gravar são ignoradas: o cache é só uma otimização.
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+from array import array
+
+MAGIC = b"SCFGCACHE3-%d.%d\n" % sys.version_info[:2]
+CACHE_DIR = "__configcache__"
+
+_LOCK, _UNLOCK = 0, 1
+
+
+def cache_path(filename):
+    """Caminho do arquivo de cache de `filename`."""
+    folder, name = os.path.split(os.path.abspath(filename))
+    return os.path.join(folder, CACHE_DIR, name + ".bin")
+
+
+def file_hash(filename):
+    """Hash BLAKE2b (hex) do conteúdo do arquivo, lido em blocos."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TaskTable:
+    """Tabela colunar de tarefas no formato de `parse_task_line`.
+
+    `add(task)` acrescenta uma tarefa; iterar devolve dicts iguais aos de
+    `parse_task_line`, na ordem do arquivo. Inteiros fora de 64 bits não cabem
+    nas colunas: a tabela passa a `cacheable = False` (e não é gravada).
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.colors = []
+        self.arrivals = array("q")
+        self.durations = array("q")
+        self.priorities = array("q")
+        self.deadlines = array("q")   # -1 = sem prazo
+        self.mutex_offsets = array("q", [0])
+        self.mutex_kinds = array("b")
+        self.mutex_ids = array("q")
+        self.mutex_times = array("q")
+        self.io_offsets = array("q", [0])
+        self.io_times = array("q")
+        self.io_durations = array("q")
+        self.cacheable = True
+
+    def add(self, task):
+        if not self.cacheable:
+            return
+        try:
+            self.arrivals.append(task["arrival"])
+            self.durations.append(task["duration"])
+            self.priorities.append(task["priority"])
+            deadline = task.get("deadline")
+            self.deadlines.append(-1 if deadline is None else deadline)
+            for event in task["events"]:
+                self.mutex_kinds.append(_LOCK if event["type"] == "lock" else _UNLOCK)
+                self.mutex_ids.append(event["mutex_id"])
+                self.mutex_times.append(event["time"])
+            for io in task["io_events"]:
+                self.io_times.append(io["time"])
+                self.io_durations.append(io["duration"])
+        except OverflowError:
+            self.cacheable = False
+            return
+        self.ids.append(task["id_"])
+        self.colors.append(task["color"])
+        self.mutex_offsets.append(len(self.mutex_kinds))
+        self.io_offsets.append(len(self.io_times))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        kinds, mutex_ids, mutex_times = self.mutex_kinds, self.mutex_ids, self.mutex_times
+        io_times, io_durations = self.io_times, self.io_durations
+        mutex_bounds = zip(self.mutex_offsets, self.mutex_offsets[1:])
+        io_bounds = zip(self.io_offsets, self.io_offsets[1:])
+        for id_, color, arrival, duration, priority, deadline, (m0, m1), (i0, i1) in zip(
+                self.ids, self.colors, self.arrivals, self.durations, self.priorities,
+                self.deadlines, mutex_bounds, io_bounds):
+            events = [{"type": "lock" if kind == _LOCK else "unlock", "mutex_id": m, "time": t}
+                      for kind, m, t in zip(kinds[m0:m1], mutex_ids[m0:m1], mutex_times[m0:m1])
+                      ] if m0 != m1 else []
+            io_events = [{"type": "io", "time": t, "duration": d}
+                         for t, d in zip(io_times[i0:i1], io_durations[i0:i1])
+                         ] if i0 != i1 else []
+            yield {
+                "id_": id_,
+                "color": color,
+                "arrival": arrival,
+                "duration": duration,
+                "priority": priority,
+                "events": events,
+                "io_events": io_events,
+                "deadline": None if deadline < 0 else deadline,
+            }
+
+    _ARRAYS = ("arrivals", "durations", "priorities", "deadlines", "mutex_offsets", "mutex_kinds",
+               "mutex_ids", "mutex_times", "io_offsets", "io_times", "io_durations")
+
+    def dumps(self, key, header):
+        columns = ("\n".join(self.ids), "\n".join(self.colors)) + \
+            tuple(_pack(getattr(self, name)) for name in self._ARRAYS)
+        return MAGIC + marshal.dumps((key, header, len(self.ids), columns))
+
+    @classmethod
+    def loads(cls, data):
+        """(chave, cabeçalho, tabela) a partir de `dumps`, ou None se inválido."""
+        if not data.startswith(MAGIC):
+            return None
+        table = cls()
+        try:
+            key, header, count, columns = marshal.loads(data[len(MAGIC):])
+            table.ids = columns[0].split("\n") if count else []
+            table.colors = columns[1].split("\n") if count else []
+            for name, (typecode, raw) in zip(cls._ARRAYS, columns[2:]):
+                column = array(typecode)
+                column.frombytes(raw)
+                setattr(table, name, column)
+        except (EOFError, ValueError, TypeError):  # truncado/corrompido
+            return None
+        if len(table.ids) != count or len(table.colors) != count or len(table.arrivals) != count:
+            return None
+        return key, header, table
+
+
+def _pack(column):
+    """(typecode, bytes) da coluna no menor tipo que a comporta (32 ou 64 bits)."""
+    if column.typecode == "q":
+        try:
+            return "i", array("i", column).tobytes()
+        except OverflowError:
+            pass
+    return column.typecode, column.tobytes()
+
+
+def load(filename):
+    """(cabeçalho, TaskTable) do cache válido para `filename`, ou None.
+
+    Atualiza o mtime guardado quando só ele mudou (mesmo hash).
+    """
+    path = cache_path(filename)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    loaded = TaskTable.loads(data)
+    if loaded is None:
+        return None
+    (size, mtime_ns, digest), header, table = loaded
+    st = os.stat(filename)
+    if st.st_size != size:
+        return None
+    if st.st_mtime_ns != mtime_ns:
+        if file_hash(filename) != digest:
+            return None
+        _write(path, table.dumps((size, st.st_mtime_ns, digest), header))
+    return header, table
+
+
+def store(filename, header, table):
+    """Grava o cache de `filename` (silenciosamente ignorado se não for possível)."""
+    if not table.cacheable:
+        return
+    st = os.stat(filename)
+    key = (st.st_size, st.st_mtime_ns, file_hash(filename))
+    _write(cache_path(filename), table.dumps(key, header))
+
+
+def _write(path, data):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        pass
@@ -8,15 +8,39 @@ Primeira linha (algoritmos atuais):
     SRTF;quantum
     PRIOP;quantum
     PRIOPEnv;quantum;alpha
+    RR;quantum
+    MLFQ;quantum          (quantum do nível 0; ver `scheduler.make_mlfq_scheduler`)
+    CFS;quantum           (quantum ignorado; ver `scheduler.make_cfs_scheduler`)
+    EDF;quantum
 Linhas seguintes:
-    id;cor;ingresso;duracao;prioridade;lista_eventos
+    id;cor;ingresso;duracao;prioridade;lista_eventos[;prazo]
+O prazo (opcional) é relativo ao ingresso: a tarefa deve terminar até o
+tick `ingresso + prazo`. Sem prazo (ou prazo negativo), `deadline` é None.
 
 Decisões de design:
 - Parsing tolerante: campos faltantes recebem defaults evitando falha dura.
 - Defaults centralizados em `DEFAULTS` para reutilização por CLI e geração de template.
 - Separação `parse_task_line` mantém `load_config` enxuto e testável.
+- Modo streaming (`load_config(..., stream=True)` / `iter_tasks`): as tarefas
+  vêm de um gerador que lê e interpreta uma linha por vez (opcionalmente
+  sobre um `mmap` do arquivo). `Simulator` consome `config["tasks"]` uma
+  única vez ao montar a tabela de TCBs, então nem as linhas nem os dicts de
+  tarefa ficam todos em memória ao mesmo tempo – só as TCBs.
+- Parser compilado: cada token de evento é classificado e decomposto por uma
+  única regex pré-compilada (`_EVENT_RE`), em vez de testes de prefixo e
+  `split`s encadeados.
+- Cache (`load_config(..., cache=True)`, ver `config_cache`): a tabela de
+  tarefas interpretada é gravada em formato binário colunar ao lado do
+  arquivo; recargas de um arquivo inalterado não passam pelo parser.
 """
 
+import gc
+import mmap
+import os
+import re
+
+import config_cache
+
 DEFAULTS = {
     "algorithm": "FIFO",
     "quantum": 3,
@@ -31,7 +55,6 @@ def generate_default_config(path="sample_config.txt", tasks=5):
     algoritmo;quantum
     id;cor;ingresso;duracao;prioridade;lista_eventos
     """
-    import os
     if os.path.exists(path):
         return path
     with open(path, "w") as f:
@@ -41,70 +64,104 @@ def generate_default_config(path="sample_config.txt", tasks=5):
             f.write(f"T{i};{DEFAULTS['color']};{i-1};{2 + (i % 3)};{DEFAULTS['priority']};\n")
     return path
 
+# Um token de evento: MLxx:tt / MUxx:tt (mutex) ou IO:xx-yy / IOxx-yy (E/S).
+# Os números são capturados de forma ampla e convertidos com `int()`, como
+# no parser original (que aceitava, p.ex., espaços e sinal).
+_MUTEX_RE = r"M([LU])([^:]*):(.*)"
+_IO_RE = r"IO:?([^-]*)-(.*)"
+_EVENT_RE = re.compile(f"{_MUTEX_RE}|{_IO_RE}", re.DOTALL)
+_MUTEX_ONLY_RE = re.compile(_MUTEX_RE, re.DOTALL)
+_IO_ONLY_RE = re.compile(_IO_RE, re.DOTALL)
+_COLOR_RE = re.compile(r"#?([0-9A-Fa-f]{6})")
+
+
+def _to_int(val, default):
+    try:
+        return int(val)
+    except (ValueError, TypeError):
+        return default
+
+
+def _validate_hex_color(color_str):
+    """Cor #RRGGBB em maiúsculas (o '#' é opcional na entrada), senão o default."""
+    match = _COLOR_RE.fullmatch(color_str) if color_str else None
+    return "#" + match.group(1).upper() if match else DEFAULTS['color']
+
+
+def _mutex_event(action, mutex_str, time_str):
+    try:
+        return {
+            "type": "lock" if action == "L" else "unlock",
+            "mutex_id": int(mutex_str),
+            "time": int(time_str)  # tempo relativo ao início da tarefa
+        }
+    except ValueError:
+        return None
+
+
+def _io_event(time_str, duration_str):
+    try:
+        return {
+            "type": "io",
+            "time": int(time_str),        # tempo relativo ao início da tarefa
+            "duration": int(duration_str) # duração da operação em ticks
+        }
+    except ValueError:
+        return None
+
+
+def _parse_deadline(field):
+    """Prazo relativo do 7º campo; vazio, inválido ou negativo = sem prazo.
+
+    O campo também passa pelo laço de eventos de `parse_task_line`, mas um
+    inteiro nunca casa com `_EVENT_RE` e é ignorado lá.
+    """
+    deadline = _to_int(field, None)
+    return deadline if deadline is not None and deadline >= 0 else None
+
+
 def parse_task_line(line):
+    """Interpreta uma linha de tarefa `id;cor;ingresso;duracao;prioridade;eventos[;prazo]`.
+
+    Cada token de evento é normalizado uma vez (`strip().upper()`) e casado
+    com uma única regex pré-compilada, que já decide entre mutex e E/S.
+    Tokens inválidos são ignorados.
+    """
     parts = line.split(";")
     # Garante pelo menos 5 campos (id, cor, ingresso, duração, prioridade)
     while len(parts) < 5:
         parts.append("")
-    
-    id_ = parts[0]
-    color = parts[1]
-    arrival = parts[2]
-    duration = parts[3]
-    priority = parts[4]
-    
-    events = ",".join(parts[5:]) if len(parts) > 5 else ""
-    def to_int(val, default):
-        try:
-            return int(val)
-        except (ValueError, TypeError):
-            return default
-    
-    def validate_hex_color(color_str):
-        """Valida se é uma cor hexadecimal válida, senão usa default."""
-        if not color_str:
-            return DEFAULTS['color']
-        
-        # Se não começa com #, adiciona
-        if not color_str.startswith("#"):
-            color_str = "#" + color_str
-        
-        # Valida formato #RRGGBB (6 caracteres hex)
-        if len(color_str) == 7 and all(c in "0123456789ABCDEFabcdef" for c in color_str[1:]):
-            return color_str.upper()
-        else:
-            return DEFAULTS['color']
-    
-    arrival_i = to_int(arrival, 0)
-    duration_i = to_int(duration, 1)
-    priority_i = to_int(priority, DEFAULTS['priority'])
-    color_v = validate_hex_color(color)
-    
+
     # Parsear eventos de mutex e IO
     mutex_events = []
     io_events = []
-    if events:
-        for event_str in events.split(','):
-            event_str = event_str.strip()
-            if event_str:
-                # Tenta parsear como mutex primeiro
-                parsed_event = parse_mutex_event(event_str)
-                if parsed_event:
-                    mutex_events.append(parsed_event)
-                else:
-                    # Tenta parsear como IO
-                    parsed_io = parse_io_event(event_str)
-                    if parsed_io:
-                        io_events.append(parsed_io)
-    
+    for field in parts[5:]:
+        for token in field.split(","):
+            token = token.strip()
+            if not token:
+                continue
+            match = _EVENT_RE.fullmatch(token.upper())
+            if match is None:
+                continue
+            action, mutex_str, time_str, io_time, io_duration = match.groups()
+            if action is not None:
+                event = _mutex_event(action, mutex_str, time_str)
+                if event:
+                    mutex_events.append(event)
+            else:
+                event = _io_event(io_time, io_duration)
+                if event:
+                    io_events.append(event)
+
     return {
-        "id_": id_,
-        "color": color_v,
-        "arrival": arrival_i,
-        "duration": duration_i,
-        "priority": priority_i,
+        "id_": parts[0],
+        "color": _validate_hex_color(parts[1]),
+        "arrival": _to_int(parts[2], 0),
+        "duration": _to_int(parts[3], 1),
+        "priority": _to_int(parts[4], DEFAULTS['priority']),
         "events": mutex_events,
-        "io_events": io_events
+        "io_events": io_events,
+        "deadline": _parse_deadline(parts[6]) if len(parts) > 6 else None,
     }
 
 def parse_mutex_event(event_str):
@@ -120,31 +177,8 @@ def parse_mutex_event(event_str):
         dict or None: {"type": "lock"|"unlock", "mutex_id": int, "time": int}
                       ou None se formato inválido
     """
-    event_str = event_str.strip().upper()
-    
-    if not (event_str.startswith("ML") or event_str.startswith("MU")):
-        return None
-    
-    try:
-        action = event_str[:2]  # "ML" ou "MU"
-        rest = event_str[2:]    # "01:5" ou "02:10"
-        
-        if ":" not in rest:
-            return None
-        
-        mutex_str, time_str = rest.split(":", 1)
-        mutex_id = int(mutex_str)
-        time_val = int(time_str)
-        
-        action_type = "lock" if action == "ML" else "unlock"
-        
-        return {
-            "type": action_type,
-            "mutex_id": mutex_id,
-            "time": time_val  # tempo relativo ao início da tarefa
-        }
-    except (ValueError, IndexError):
-        return None
+    match = _MUTEX_ONLY_RE.fullmatch(event_str.strip().upper())
+    return _mutex_event(*match.groups()) if match else None
 
 def parse_io_event(event_str):
     """Parseia evento de E/S no formato IO:xx-yy.
@@ -158,45 +192,12 @@ def parse_io_event(event_str):
         dict or None: {"type": "io", "time": int, "duration": int}
                       ou None se formato inválido
     """
-    event_str = event_str.strip().upper()
-    
-    if not event_str.startswith("IO"):
-        return None
-    
-    try:
-        rest = event_str[2:]  # ":2-5" ou ":10-3" ou "2-5" (compatibilidade)
-        
-        # Remove o ":" se estiver presente
-        if rest.startswith(":"):
-            rest = rest[1:]
-        
-        if "-" not in rest:
-            return None
-        
-        time_str, duration_str = rest.split("-", 1)
-        time_val = int(time_str)
-        duration_val = int(duration_str)
-        
-        return {
-            "type": "io",
-            "time": time_val,        # tempo relativo ao início da tarefa
-            "duration": duration_val # duração da operação em ticks
-        }
-    except (ValueError, IndexError):
-        return None
-
-def load_config(filename):
-    # Gera config padrão se arquivo não existir
-    import os
-    if not os.path.exists(filename):
-        generate_default_config(filename)
+    match = _IO_ONLY_RE.fullmatch(event_str.strip().upper())
+    return _io_event(*match.groups()) if match else None
 
-    with open(filename, "r") as f:
-        lines = [line.strip() for line in f if line.strip()]
-    if not lines:
-        raise ValueError("Arquivo de configuração vazio.")
-
-    header = lines[0].split(";")
+def parse_header(line):
+    """Interpreta a primeira linha: (algoritmo, quantum, alpha)."""
+    header = line.strip().split(";")
     algorithm = header[0] if header and header[0] else DEFAULTS['algorithm']
     try:
         quantum = int(header[1]) if len(header) > 1 and header[1] else DEFAULTS['quantum']
@@ -205,13 +206,103 @@ def load_config(filename):
 
     # Alpha para PRIOPEnv (preemptivo com envelhecimento)
     alpha = 0
-    if algorithm.upper() == "PRIOPEnv":
+    if algorithm.upper() == "PRIOPENV":
         try:
             alpha = int(header[2]) if len(header) > 2 and header[2] else 0
         except ValueError:
             alpha = 0
+    return algorithm, quantum, alpha
+
+
+def _iter_lines(filename, use_mmap=False):
+    """Linhas não vazias (sem espaços nas pontas) do arquivo, uma por vez."""
+    if not use_mmap:
+        with open(filename, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+        return
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap não aceita arquivo vazio
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b""):
+                line = raw.decode("utf-8").strip()
+                if line:
+                    yield line
+
+
+def iter_tasks(filename, use_mmap=False):
+    """Gerador das tarefas do arquivo (dicts de `parse_task_line`), em ordem.
+
+    Pula a linha de cabeçalho e interpreta uma linha por vez: memória extra
+    constante e a primeira tarefa disponível assim que sua linha é lida.
+    `use_mmap=True` lê o arquivo mapeado em memória (páginas sob demanda do
+    sistema operacional, sem buffer de leitura do Python).
+    """
+    lines = _iter_lines(filename, use_mmap)
+    next(lines, None)  # cabeçalho
+    for line in lines:
+        yield parse_task_line(line)
+
+
+def _materialize(tasks):
+    """`list(tasks)` com o coletor cíclico pausado.
+
+    Montar milhões de dicts/listas dispara repetidas coletas de geração 2
+    que percorrem todos os objetos já criados (mais da metade do tempo de
+    carga de 1M tarefas). Os dicts de tarefa não formam ciclos, então pausar
+    o `gc` durante a montagem é seguro; o estado anterior é restaurado.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return list(tasks)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _iter_and_cache(filename, header, tasks):
+    """Repassa `tasks` acumulando a tabela; grava o cache ao esgotar."""
+    table = config_cache.TaskTable()
+    for task in tasks:
+        table.add(task)
+        yield task
+    config_cache.store(filename, header, table)
+
+
+def load_config(filename, stream=False, use_mmap=False, cache=False):
+    """Carrega o arquivo de configuração.
+
+    Com `stream=True`, `tasks` é um gerador (`iter_tasks`) em vez de uma
+    lista: só pode ser percorrido uma vez, o que basta para `Simulator`.
+    `use_mmap` vale para os dois modos.
+
+    Com `cache=True`, usa/grava o cache em disco de `config_cache`. No modo
+    streaming sem cache válido, a tabela é gravada quando o gerador é
+    esgotado (ou seja, ao fim da montagem do `Simulator`).
+    """
+    # Gera config padrão se arquivo não existir
+    if not os.path.exists(filename):
+        generate_default_config(filename)
+
+    cached = config_cache.load(filename) if cache else None
+    if cached is not None:
+        (algorithm, quantum, alpha), table = cached
+        tasks = iter(table) if stream else _materialize(table)
+    else:
+        header = next(_iter_lines(filename, use_mmap), None)
+        if header is None:
+            raise ValueError("Arquivo de configuração vazio.")
+        algorithm, quantum, alpha = parse_header(header)
 
-    tasks = [parse_task_line(line) for line in lines[1:]]
+        tasks = iter_tasks(filename, use_mmap)
+        if cache:
+            tasks = _iter_and_cache(filename, (algorithm, quantum, alpha), tasks)
+        if not stream:
+            tasks = _materialize(tasks)
 
     return {
         "algorithm": algorithm,
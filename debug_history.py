@@ -0,0 +1,93 @@
+"""debug_history.py
+===================
+Histórico de snapshots do modo debug com deltas e compartilhamento estrutural.
+
+Guardar um `Simulator.snapshot()` completo por tick faz memória e tempo
+crescerem com (ticks × tarefas). `DebugHistory` recebe os mesmos snapshots
+(`append`) mas armazena:
+
+- a cada `keyframe_every` entradas, um quadro-chave com a lista de estados
+  das tarefas (os dicts não alterados são os mesmos objetos do quadro
+  anterior – nada é copiado);
+- nas demais, apenas as tarefas cujo estado mudou (`{índice: estado}`) e os
+  campos escalares do tick; fila de prontos e mutexes iguais aos da entrada
+  anterior reutilizam o mesmo objeto;
+- `timeline` e `wait_map` já chegam como visões O(1) (`TimelineView`,
+  `IntervalMapView`) que só referenciam o armazenamento append-only do
+  simulador;
+- `waited_ticks` não é guardado: muda a cada tick para toda tarefa na fila
+  (o que faria todo delta ter O(fila) entradas) e é recalculado a partir da
+  visão de `wait_map` na reconstrução.
+
+`history[i]` reconstrói o snapshot completo sob demanda, aplicando no máximo
+`keyframe_every - 1` deltas sobre o quadro-chave mais próximo. A interface é a
+de uma lista somente-append (`append`, `len`, indexação, iteração).
+"""
+
+
+class DebugHistory:
+    """Sequência de snapshots armazenada como quadros-chave + deltas."""
+
+    def __init__(self, keyframe_every=64):
+        self.keyframe_every = max(1, keyframe_every)
+        self._entries = []
+        self._last_tasks = None   # estados completos da última entrada
+        self._last = None         # última entrada armazenada
+
+    def append(self, snap):
+        """Registra um snapshot no formato de `Simulator.snapshot()`."""
+        tasks = [{k: v for k, v in state.items() if k != "waited_ticks"} for state in snap["tasks"]]
+        entry = {k: v for k, v in snap.items() if k != "tasks"}
+        last = self._last
+        if last is not None:
+            # Reaproveita objetos iguais aos da entrada anterior
+            for key in ("ready_queue", "mutexes"):
+                if entry[key] == last[key]:
+                    entry[key] = last[key]
+
+        if len(self._entries) % self.keyframe_every == 0 or self._last_tasks is None \
+                or len(tasks) != len(self._last_tasks):
+            previous = self._last_tasks or []
+            shared = [previous[k] if k < len(previous) and previous[k] == state else state
+                      for k, state in enumerate(tasks)]
+            entry["keyframe"] = tuple(shared)
+            self._last_tasks = list(shared)
+        else:
+            changed = {}
+            current = self._last_tasks
+            for k, state in enumerate(tasks):
+                if state != current[k]:
+                    changed[k] = state
+                    current[k] = state
+            entry["changed"] = changed
+        self._entries.append(entry)
+        self._last = entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._entries)))]
+        if index < 0:
+            index += len(self._entries)
+        if not 0 <= index < len(self._entries):
+            raise IndexError("debug history index out of range")
+        base = index
+        while "keyframe" not in self._entries[base]:
+            base -= 1
+        tasks = list(self._entries[base]["keyframe"])
+        for entry in self._entries[base + 1:index + 1]:
+            for k, state in entry["changed"].items():
+                tasks[k] = state
+        snap = {k: v for k, v in self._entries[index].items() if k not in ("keyframe", "changed")}
+        wait_map = snap["wait_map"]
+        snap["tasks"] = [dict(state, waited_ticks=wait_map.total(state["id"])) for state in tasks]
+        return snap
+
+    def __iter__(self):
+        for i in range(len(self._entries)):
+            yield self[i]
+
+    def clear(self):
+        self.__init__(self.keyframe_every)
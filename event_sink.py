@@ -0,0 +1,148 @@
+"""event_sink.py
+================
+Destinos (sinks) para os eventos produzidos pelo `Simulator`.
+
+Antes o simulador chamava `print` diretamente a cada início de E/S,
+desbloqueio, preempção e conclusão; em execuções grandes a escrita em stdout
+virava o gargalo. Agora cada ocorrência é enviada a um sink:
+
+- `NullSink`: descarta tudo. `enabled = False`, e o simulador testa essa flag
+  antes de montar o evento, então o custo com saída desligada é um teste de
+  atributo (nenhuma string é formatada).
+- `ConsoleSink`: mensagens legíveis em português (comportamento original).
+- `BufferedSink`: guarda registros estruturados (dicts) em memória.
+- `JsonlSink`: escreve um registro JSON por linha em um stream/arquivo.
+
+Interface de um sink:
+- `emit(kind, time, **fields)`: evento estruturado (`kind` em `EVENT_KINDS`);
+- `write(text)`: texto livre para humanos (Gantt no terminal, modo debug).
+  Sinks estruturados o ignoram;
+- `close()`: libera recursos (arquivo aberto pelo sink).
+
+`make_sink(spec)` converte o valor de `config["events"]` (nome ou instância)
+em um sink.
+"""
+
+import json
+import sys
+
+
+# Tipo de evento -> mensagem do console (mesmos textos dos antigos prints)
+EVENT_KINDS = {
+    "sim_start": "Iniciando simulação com algoritmo: {algorithm}",
+    "sim_end": "Simulação encerrada.",
+    "io_start": "[IO START] Tarefa {task} iniciando E/S (duração={duration} ticks) em t={time}",
+    "io_end": "[PRE-TICK] Tarefa {task} desbloqueada de IO em t={time}",
+    "mutex_block": "Tarefa {task} bloqueada aguardando M{mutex}",
+    "mutex_release": "Tarefa {task} liberou M{mutex}",
+    "mutex_acquire": "[UNLOCK] Tarefa {task} desbloqueada - adquiriu M{mutex}",
+    "quantum_expired": "Tarefa {task} preemptada por quantum em t={time}",
+    "complete": "Tarefa {task} concluída em t={time}",
+    "migrate": "[SMP] Tarefa {task} migrou da CPU {source} para a CPU {target} em t={time}",
+    "deadline_miss": "[PRAZO] Tarefa {task} perdeu o prazo (t={deadline}) sem terminar",
+}
+
+SINKS = ("console", "jsonl", "buffer", "none")
+
+
+class NullSink:
+    """Descarta todos os eventos (modo silencioso / execuções em lote)."""
+
+    enabled = False
+
+    def emit(self, kind, time, **fields):
+        pass
+
+    def write(self, text):
+        pass
+
+    def close(self):
+        pass
+
+
+class ConsoleSink:
+    """Imprime mensagens legíveis, uma por evento."""
+
+    enabled = True
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def emit(self, kind, time, **fields):
+        print(EVENT_KINDS[kind].format(time=time, **fields), file=self.stream or sys.stdout)
+
+    def write(self, text):
+        print(text, file=self.stream or sys.stdout)
+
+    def close(self):
+        pass
+
+
+class BufferedSink:
+    """Acumula registros `{"kind", "time", ...campos}` em `records`."""
+
+    enabled = True
+
+    def __init__(self):
+        self.records = []
+
+    def emit(self, kind, time, **fields):
+        fields["kind"] = kind
+        fields["time"] = time
+        self.records.append(fields)
+
+    def write(self, text):
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonlSink:
+    """Escreve cada evento como uma linha JSON.
+
+    Aceita um stream já aberto ou um caminho; "-" significa stdout. Só fecha
+    o arquivo se foi ele quem o abriu.
+    """
+
+    enabled = True
+
+    def __init__(self, target="-"):
+        if hasattr(target, "write"):
+            self.stream, self._owns = target, False
+        elif target in (None, "-"):
+            self.stream, self._owns = sys.stdout, False
+        else:
+            self.stream, self._owns = open(target, "w", encoding="utf-8"), True
+
+    def emit(self, kind, time, **fields):
+        record = {"kind": kind, "time": time}
+        record.update(fields)
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def write(self, text):
+        pass
+
+    def close(self):
+        if self._owns:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+def make_sink(spec="console", target=None):
+    """Cria um sink a partir do nome (`SINKS`) ou devolve a instância recebida.
+
+    `target` é o destino do `JsonlSink` (caminho ou stream; default stdout).
+    """
+    if spec is None or spec == "none":
+        return NullSink()
+    if not isinstance(spec, str):
+        return spec
+    if spec == "console":
+        return ConsoleSink()
+    if spec == "jsonl":
+        return JsonlSink(target if target is not None else "-")
+    if spec == "buffer":
+        return BufferedSink()
+    raise ValueError(f"Destino de eventos desconhecido: {spec}")
@@ -0,0 +1,291 @@
+"""gantt.py
+===========
+Extração de intervalos e desenho do gráfico de Gantt.
+
+O renderizador antigo (em `interface.py`) percorria a timeline inteira uma vez
+por tarefa, montava conjuntos Python de ticks de execução/espera/suspensão e
+fazia uma chamada `broken_barh` por segmento, além de um rótulo por tick no
+eixo x. Aqui:
+
+- `gantt_rows` extrai os intervalos de todas as tarefas numa só passada
+  sobre as corridas da timeline compacta (`run_arrays`), com NumPy: corridas
+  vizinhas da mesma tarefa (que só diferem pela marca de sorteio) são
+  fundidas, agrupadas por tarefa e cortadas no tempo de vida. Espera e
+  suspensão são diferenças de conjuntos de intervalos, também vetorizadas –
+  com timeline run-length o custo depende do número de corridas, não do
+  número de ticks (no modo denso o RLE é um único passo NumPy nos slots);
+- `draw_gantt` desenha cada categoria (contorno da vida, execução, espera,
+  suspensão) como uma única `PolyCollection`;
+- o eixo x só mostra todos os ticks em gráficos curtos (`MAX_TICK_LABELS`);
+  acima disso um `MaxNLocator` escolhe marcas inteiras espaçadas;
+- `save_figure_async` grava o PNG numa thread, com figura própria (Agg),
+  sem travar a interface; `export_gantt` / `save_figure` fazem o mesmo de
+  forma síncrona para a CLI (`main.py --gantt`), em PNG, SVG ou PDF.
+
+Semântica igual à original: tarefas são as que aparecem na timeline, em
+ordem de id; a vida vai de `arrivals_map` (default 0) a `finish_map`
+(default: fim da timeline); espera é a vida menos a execução; suspensão é o
+que `suspended_map` marca dentro da vida, menos a execução, com a duração
+escrita no meio do bloco (quando o bloco é largo o bastante para o rótulo).
+
+matplotlib só é importado dentro das funções de desenho, e nunca via pyplot:
+importar este módulo não carrega matplotlib nem exige display.
+"""
+
+import threading
+
+import numpy as np
+
+IDLE = -1
+
+# Até este número de ticks o eixo x rotula todos os ticks (como antes)
+MAX_TICK_LABELS = 50
+# Rótulos de duração de suspensão: só em blocos com ao menos 1/200 da largura
+# do eixo (cabem na figura), e no máximo este número deles
+LABEL_MIN_FRACTION = 1 / 200
+MAX_DURATION_LABELS = 300
+DEFAULT_COLORS = ("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+                  "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf")  # tab10
+
+
+def _intervals(pairs):
+    """Lista de pares (início, fim) -> arrays (inícios, fins)."""
+    if not pairs:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    arr = np.asarray(pairs, dtype=np.int64)
+    return arr[:, 0], arr[:, 1]
+
+
+def _clip(starts, ends, low, high):
+    """Corta intervalos em [low, high) e descarta os vazios."""
+    starts = np.maximum(starts, low)
+    ends = np.minimum(ends, high)
+    keep = ends > starts
+    return starts[keep], ends[keep]
+
+
+def _difference(a_starts, a_ends, b_starts, b_ends):
+    """A − B para conjuntos de intervalos disjuntos e ordenados.
+
+    Os pontos extremos de A e B dividem a reta em segmentos elementares;
+    cada segmento está ou não em A e em B (busca binária), e os segmentos
+    consecutivos que sobram são fundidos.
+    """
+    if not len(a_starts) or not len(b_starts):
+        return a_starts, a_ends
+    points = np.unique(np.concatenate((a_starts, a_ends, b_starts, b_ends)))
+    lo, hi = points[:-1], points[1:]
+
+    def inside(starts, ends):
+        k = np.searchsorted(starts, lo, side="right") - 1
+        return (k >= 0) & (ends[np.maximum(k, 0)] > lo)
+
+    keep = inside(a_starts, a_ends) & ~inside(b_starts, b_ends)
+    if not keep.any():
+        return a_starts[:0], a_ends[:0]
+    edges = np.diff(np.concatenate(([False], keep, [False])).astype(np.int8))
+    return lo[edges[:-1] == 1], hi[np.flatnonzero(edges[1:] == -1)]
+
+
+def _complement(starts, ends, low, high):
+    """[low, high) menos os intervalos (ordenados, disjuntos, dentro da faixa)."""
+    gap_starts = np.concatenate(([low], ends))
+    gap_ends = np.concatenate((starts, [high]))
+    keep = gap_ends > gap_starts
+    return gap_starts[keep], gap_ends[keep]
+
+
+def _execution_runs(timeline):
+    """(tarefa, início, fim) das corridas de execução, com corridas vizinhas
+    da mesma tarefa fundidas, agrupadas por índice de tarefa."""
+    if timeline.run_length:
+        slots, ends = timeline.run_arrays()
+        slots = np.array(slots, dtype=np.int32)
+        ends = np.array(ends, dtype=np.int64)
+    else:
+        # Modo denso: o RLE é calculado aqui, sobre o array de slots por tick
+        slots = np.array(timeline.slots(), dtype=np.int32)
+        ends = np.arange(1, len(slots) + 1, dtype=np.int64)
+    if not len(slots):
+        return slots, ends, ends
+    starts = np.concatenate(([0], ends[:-1]))
+    first = np.concatenate(([True], slots[1:] != slots[:-1]))
+    heads = np.flatnonzero(first)
+    tails = np.concatenate((heads[1:] - 1, [len(slots) - 1]))
+    seg_slots, seg_starts, seg_ends = slots[heads], starts[heads], ends[tails]
+    busy = seg_slots != IDLE
+    seg_slots, seg_starts, seg_ends = seg_slots[busy], seg_starts[busy], seg_ends[busy]
+    order = np.argsort(seg_slots, kind="stable")
+    return seg_slots[order], seg_starts[order], seg_ends[order]
+
+
+def gantt_rows(simulator):
+    """Intervalos do Gantt por tarefa, prontos para `draw_gantt`.
+
+    Aceita o `Simulator` (ou objeto com `timeline`, `arrivals_map`,
+    `finish_map`, `suspended_map` e `task_colors`); a timeline pode ser uma
+    `Timeline` ou `TimelineView`. Com `timelines` (`SMPSimulator`), a
+    execução de cada tarefa junta as corridas de todos os núcleos.
+
+    Returns:
+        dict: {"total_time": int, "rows": [{"id", "color", "life": (início, fim),
+               "exec", "wait", "suspended"}]}, onde cada categoria é um par
+               de arrays NumPy (inícios, fins)
+    """
+    timeline = simulator.timeline
+    total_time = len(timeline)
+    arrivals = simulator.arrivals_map
+    finishes = simulator.finish_map
+    suspended_map = simulator.suspended_map
+    task_colors = getattr(simulator, "task_colors", None) or {}
+    names = timeline.task_ids
+
+    seg_slots, seg_starts, seg_ends = _execution_runs(timeline)
+    timelines = getattr(simulator, "timelines", None)
+    if timelines and len(timelines) > 1:
+        # SMP: corridas de todos os núcleos, por tarefa e depois por início
+        runs = [_execution_runs(core_timeline) for core_timeline in timelines]
+        seg_slots, seg_starts, seg_ends = (np.concatenate(parts) for parts in zip(*runs))
+        order = np.lexsort((seg_starts, seg_slots))
+        seg_slots, seg_starts, seg_ends = seg_slots[order], seg_starts[order], seg_ends[order]
+    present, first = np.unique(seg_slots, return_index=True)
+    bounds = dict(zip(present.tolist(), zip(first.tolist(), first[1:].tolist() + [len(seg_slots)])))
+
+    rows = []
+    for i, (task, slot) in enumerate(sorted((names[s], s) for s in bounds)):
+        lo, hi = bounds[slot]
+        life = (arrivals.get(task, 0), finishes.get(task, total_time))
+        exec_starts, exec_ends = _clip(seg_starts[lo:hi], seg_ends[lo:hi], *life)
+        wait = _complement(exec_starts, exec_ends, *life)
+        log = suspended_map.get(task) if suspended_map else None
+        if log:
+            suspended = _difference(*_clip(*_intervals(log.intervals()), *life), exec_starts, exec_ends)
+        else:
+            suspended = _intervals(())
+        rows.append({
+            "id": task,
+            "color": task_colors.get(task) or DEFAULT_COLORS[i % len(DEFAULT_COLORS)],
+            "life": life,
+            "exec": (exec_starts, exec_ends),
+            "wait": wait,
+            "suspended": suspended,
+        })
+    return {"total_time": total_time, "rows": rows}
+
+
+def _boxes(rows, key):
+    """Vértices (N, 4, 2) dos retângulos de uma categoria e o índice da linha de cada um."""
+    starts, ends, ys = [], [], []
+    for y, row in enumerate(rows):
+        s, e = row[key]
+        starts.append(s)
+        ends.append(e)
+        ys.append(np.full(len(s), y, dtype=np.float64))
+    if not starts:
+        return np.empty((0, 4, 2)), np.empty(0, np.intp)
+    s = np.concatenate(starts).astype(np.float64)
+    e = np.concatenate(ends).astype(np.float64)
+    y = np.concatenate(ys)
+    bottom, top = y - 0.4, y + 0.4
+    verts = np.stack((np.stack((s, bottom), -1), np.stack((e, bottom), -1),
+                      np.stack((e, top), -1), np.stack((s, top), -1)), axis=1)
+    return verts, y.astype(np.intp)
+
+
+def draw_gantt(ax, data, title="Gráfico de Gantt"):
+    """Desenha `gantt_rows(...)` em `ax`: uma coleção por categoria."""
+    from matplotlib.collections import PolyCollection
+    from matplotlib.ticker import MaxNLocator
+
+    rows, total_time = data["rows"], data["total_time"]
+    if not rows:
+        ax.text(0.5, 0.5, 'Nenhuma tarefa executada', ha='center', va='center')
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.set_title(title)
+        return
+
+    lives = [{"life": (np.array([start]), np.array([max(start, end)]))} for start, end in (r["life"] for r in rows)]
+    life_verts, _ = _boxes(lives, "life")
+    ax.add_collection(PolyCollection(life_verts, facecolors="none", edgecolors="black", linewidths=1.2))
+
+    exec_verts, exec_rows = _boxes(rows, "exec")
+    colors = [row["color"] for row in rows]
+    ax.add_collection(PolyCollection(exec_verts, facecolors=[colors[k] for k in exec_rows],
+                                     edgecolors="black", linewidths=1.2))
+
+    wait_verts, _ = _boxes(rows, "wait")
+    ax.add_collection(PolyCollection(wait_verts, facecolors="white", edgecolors="black", linewidths=0.8))
+
+    susp_verts, susp_rows = _boxes(rows, "suspended")
+    ax.add_collection(PolyCollection(susp_verts, facecolors="#D3D3D3", edgecolors="black", linewidths=0.8))
+    widths = susp_verts[:, 1, 0] - susp_verts[:, 0, 0]
+    labeled = np.flatnonzero(widths >= total_time * LABEL_MIN_FRACTION)
+    if len(labeled) <= MAX_DURATION_LABELS:
+        for k in labeled:
+            start, width = susp_verts[k, 0, 0], widths[k]
+            ax.text(start + width / 2, susp_rows[k], f"{int(width)}", ha='center', va='center',
+                    fontsize=8, weight='bold', color='black')
+
+    ax.autoscale_view()
+    ax.set_xlabel("Tempo (t)")
+    ax.set_ylabel("Tarefas")
+    ax.set_yticks(range(len(rows)))
+    ax.set_yticklabels([row["id"] for row in rows])
+    if total_time <= MAX_TICK_LABELS:
+        ax.set_xticks(range(total_time + 1))
+    else:
+        ax.xaxis.set_major_locator(MaxNLocator(nbins=20, integer=True))
+    ax.grid(True, axis='x', linestyle=':', alpha=0.5)
+    ax.set_title(title)
+
+
+def build_figure(data, figsize=None, dpi=100):
+    """Nova `Figure` (sem pyplot) com o Gantt desenhado.
+
+    `figsize=None` usa 10 polegadas de largura e altura proporcional ao
+    número de tarefas (mínimo 3).
+    """
+    from matplotlib.figure import Figure
+
+    if figsize is None:
+        figsize = (10, max(3, 0.3 * len(data["rows"]) + 1))
+    fig = Figure(figsize=figsize, dpi=dpi)
+    draw_gantt(fig.add_subplot(111), data)
+    fig.tight_layout()
+    return fig
+
+
+def save_figure(data, path="gantt.png", dpi=300):
+    """Grava o Gantt em `path` (formato pela extensão: png, svg, pdf).
+
+    Usa figura própria com canvas Agg, sem pyplot nem backend de janela:
+    funciona em máquinas sem display.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = build_figure(data)
+    FigureCanvasAgg(fig)
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    return path
+
+
+def export_gantt(simulator, path="gantt.png", dpi=300):
+    """Extrai os intervalos de uma simulação concluída e grava o Gantt."""
+    return save_figure(gantt_rows(simulator), path, dpi)
+
+
+def save_figure_async(data, path="gantt.png", dpi=300, done=None):
+    """`save_figure` numa thread daemon; `done(path)` é chamado ao terminar.
+
+    Usa uma figura própria (nada é compartilhado com a figura exibida), e
+    `data` só contém arrays já calculados.
+    """
+    def work():
+        save_figure(data, path, dpi)
+        if done:
+            done(path)
+
+    thread = threading.Thread(target=work, name="gantt-export", daemon=True)
+    thread.start()
+    return thread
@@ -8,17 +8,26 @@ Decisões:
 - Salvamento explícito no arquivo padrão `sample_config.txt` antes de rodar
     simulação (mantém compatibilidade com CLI).
 - Modo Debug expõe ticking manual, útil para fins didáticos.
+- "Executar Simulação" roda o `Simulator` numa thread de trabalho; a thread
+    do Tk só lê o progresso por `root.after` e pode pedir o cancelamento.
 """
 
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 from config_loader import load_config
 from simulator import Simulator
+from debug_history import DebugHistory
+from event_sink import make_sink
 from config_loader import load_config
-import matplotlib.pyplot as plt
+from gantt import gantt_rows, draw_gantt, save_figure_async
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
+# Intervalo (ms) entre leituras do progresso da simulação em andamento
+SIM_POLL_MS = 100
+
+
 class TaskEditorApp:
     """Aplicação principal da GUI de edição de tarefas.
 
@@ -35,11 +44,11 @@ class TaskEditorApp:
         self.task_counter = 1
         
         
-        self.debug_history = []  
+        self.debug_history = DebugHistory()  # snapshots em deltas (ver debug_history.py)
         self.debug_current_index = -1  
 
         tk.Label(root, text="Algoritmo").grid(row=0, column=0, sticky="e")
-        self.algorithm_cb = ttk.Combobox(root, values=["FIFO", "SRTF", "PRIOP", "PRIOPEnv"], state="readonly", width=18)
+        self.algorithm_cb = ttk.Combobox(root, values=["FIFO", "SRTF", "PRIOP", "PRIOPEnv", "RR", "MLFQ", "CFS", "EDF"], state="readonly", width=18)
         self.algorithm_cb.grid(row=0, column=1, pady=2)
         self.algorithm_cb.set("FIFO")
 
@@ -99,6 +108,12 @@ class TaskEditorApp:
             entry.grid(row=i+2, column=1, pady=2, columnspan=3, sticky="w")
             self.fields[label.lower()] = entry
 
+        # Prazo relativo ao ingresso (opcional, EDF e métricas de prazo)
+        tk.Label(root, text="Prazo").grid(row=2, column=4, sticky="e")
+        prazo_entry = tk.Entry(root, width=8)
+        prazo_entry.grid(row=2, column=5, sticky="w")
+        self.fields["prazo"] = prazo_entry
+
         # Campo de eventos (mutex)
         tk.Label(root, text="Eventos").grid(row=5, column=0, sticky="ne")
         eventos_entry = tk.Entry(root, width=20)
@@ -128,6 +143,17 @@ class TaskEditorApp:
         ]
         for i, (label, cmd) in enumerate(btn_specs):
             tk.Button(buttons_frame, text=label, command=cmd).grid(row=0, column=i, padx=4)
+
+        # Exportar gantt.png ao executar (gravado em segundo plano)
+        self.save_png_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(buttons_frame, text="Salvar PNG", variable=self.save_png_var).grid(row=0, column=len(btn_specs), padx=4)
+
+        # Progresso da simulação (roda numa thread; ver run_simulation)
+        self.cancel_run_btn = tk.Button(buttons_frame, text="Cancelar", command=self.cancel_simulation, state=tk.DISABLED)
+        self.cancel_run_btn.grid(row=0, column=len(btn_specs) + 1, padx=4)
+        self.run_status_label = tk.Label(buttons_frame, text="", font=('Arial', 9), fg='gray')
+        self.run_status_label.grid(row=0, column=len(btn_specs) + 2, padx=4, sticky="w")
+        self.sim_thread = None
         
         
         self.debug_toolbar = tk.Frame(root, bd=2, relief='sunken', bg='#f0f0f0')
@@ -168,6 +194,22 @@ class TaskEditorApp:
         )
         self.next_tick_btn.pack(side=tk.LEFT, padx=10, pady=5)
         
+        # Ir para tick (usa histórico e checkpoints do simulador)
+        self.jump_tick_entry = tk.Entry(self.debug_toolbar, width=6)
+        self.jump_tick_entry.pack(side=tk.LEFT, padx=(5, 0), pady=5)
+        self.jump_tick_entry.bind('<Return>', lambda event: self.jump_to_tick())
+        self.jump_tick_btn = tk.Button(
+            self.debug_toolbar,
+            text='Ir para tick',
+            command=self.jump_to_tick,
+            bg='#2196F3',
+            fg='white',
+            font=('Arial', 10),
+            padx=10,
+            pady=8
+        )
+        self.jump_tick_btn.pack(side=tk.LEFT, padx=5, pady=5)
+        
         # Separador
         ttk.Separator(self.debug_toolbar, orient='vertical').pack(side=tk.LEFT, fill='y', padx=5)
         
@@ -211,7 +253,7 @@ class TaskEditorApp:
         self.exit_debug_btn.pack(side=tk.LEFT, padx=5, pady=5)
 
         
-        self.tree = ttk.Treeview(root, columns=["ID", "Cor", "Ingresso", "Duração", "Prioridade", "Eventos", "IO Eventos"], show="headings", height=8)
+        self.tree = ttk.Treeview(root, columns=["ID", "Cor", "Ingresso", "Duração", "Prioridade", "Eventos", "IO Eventos", "Prazo"], show="headings", height=8)
         
         
         col_widths = {
@@ -221,10 +263,11 @@ class TaskEditorApp:
             "Duração": 70,
             "Prioridade": 70,
             "Eventos": 150,
-            "IO Eventos": 150
+            "IO Eventos": 150,
+            "Prazo": 60
         }
         
-        for col in ["ID", "Cor", "Ingresso", "Duração", "Prioridade", "Eventos", "IO Eventos"]:
+        for col in ["ID", "Cor", "Ingresso", "Duração", "Prioridade", "Eventos", "IO Eventos", "Prazo"]:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=col_widths[col])
         
@@ -257,7 +300,7 @@ class TaskEditorApp:
         filepath = "sample_config.txt"
         
         try:
-            config = load_config(filepath)
+            config = load_config(filepath, cache=True)
             self.algorithm_cb.set(config["algorithm"])
             self.quantum_entry.delete(0, tk.END)
             self.quantum_entry.insert(0, str(config["quantum"]))
@@ -308,7 +351,8 @@ class TaskEditorApp:
                     task_dict["duration"],
                     task_dict["priority"],
                     eventos_str,
-                    io_eventos_str
+                    io_eventos_str,
+                    "" if task_dict.get("deadline") is None else task_dict["deadline"]
                 )
                 self.tasks.append(task)
                 self.tree.insert("", "end", values=task)
@@ -339,7 +383,8 @@ class TaskEditorApp:
                 int(self.fields["duração"].get()),
                 int(self.fields["prioridade"].get()),
                 eventos_str,
-                io_eventos_str
+                io_eventos_str,
+                self._deadline_field()
             )
             self.tasks.append(task)
             self.tree.insert("", "end", values=task)
@@ -354,7 +399,7 @@ class TaskEditorApp:
         if not selected:
             return
         values = self.tree.item(selected, "values")
-        keys = ["cor", "ingresso", "duração", "prioridade", "eventos", "io_eventos"]
+        keys = ["cor", "ingresso", "duração", "prioridade", "eventos", "io_eventos", "prazo"]
         for k, v in zip(keys, values[1:]):
             if k == "cor":
                 # Tenta encontrar o nome da cor pelo hex
@@ -370,6 +415,16 @@ class TaskEditorApp:
                 self.fields[k].delete(0, tk.END)
                 self.fields[k].insert(0, str(v))
 
+    def _deadline_field(self):
+        """Prazo do campo de edição: "" (sem prazo) ou inteiro >= 0 (ValueError se inválido)."""
+        prazo = self.fields["prazo"].get().strip()
+        if not prazo:
+            return ""
+        value = int(prazo)
+        if value < 0:
+            raise ValueError(prazo)
+        return value
+
     def update_task(self):
         """Atualiza tarefa existente mantendo o mesmo ID."""
         selected = self.tree.focus()
@@ -389,7 +444,8 @@ class TaskEditorApp:
                 int(self.fields["duração"].get()),
                 int(self.fields["prioridade"].get()),
                 eventos_str,
-                io_eventos_str
+                io_eventos_str,
+                self._deadline_field()
             )
             self.tree.item(selected, values=updated_task)
             index = self.tree.index(selected)
@@ -401,8 +457,15 @@ class TaskEditorApp:
     def run_simulation(self):
         """Salva tarefas em arquivo e executa simulação completa.
         Se não houver tarefas, carrega do arquivo automaticamente.
-        Depois exibe o snapshot final com a mesma formatação do debug.
+
+        A simulação roda numa thread de trabalho para não congelar a janela;
+        `_poll_simulation` (via `root.after`) mostra o progresso e, ao fim,
+        exibe o Gantt e o snapshot final com a mesma formatação do debug.
         """
+        if self.sim_thread is not None and self.sim_thread.is_alive():
+            messagebox.showinfo("Aguarde", "Já há uma simulação em andamento.")
+            return
+
         # Se não há tarefas, tenta carregar do arquivo
         if not self.tasks:
             self.load_from_file()
@@ -431,21 +494,58 @@ class TaskEditorApp:
                     if io_eventos:
                         all_events = f"{eventos},{io_eventos}" if eventos else io_eventos
                     
-                    linha = f"{task[0]};{task[1]};{task[2]};{task[3]};{task[4]};{all_events}\n"
+                    prazo = task[7] if len(task) > 7 else ""
+                    linha = f"{task[0]};{task[1]};{task[2]};{task[3]};{task[4]};{all_events}"
+                    linha += f";{prazo}\n" if prazo != "" else "\n"
                     f.write(linha)
 
-            config = load_config("sample_config.txt")
+            config = load_config("sample_config.txt", cache=True)
             self.simulator = Simulator(config)
-            self.simulator.run()
-            
-           
-            self.render_gantt_in_frame(self.simulator)
-            
-          
-            self._show_final_snapshot()
-            
         except Exception as e:
             messagebox.showerror("Erro ao simular", str(e))
+            return
+
+        self.sim_error = None
+        self.sim_thread = threading.Thread(target=self._simulation_worker, args=(self.simulator,),
+                                           name="simulation", daemon=True)
+        self.cancel_run_btn.config(state=tk.NORMAL)
+        self.sim_thread.start()
+        self._poll_simulation()
+
+    def _simulation_worker(self, simulator):
+        """Corpo da thread de trabalho: só executa a simulação (nada de Tk aqui)."""
+        try:
+            simulator.run()
+        except Exception as e:
+            self.sim_error = e
+
+    def _poll_simulation(self):
+        """Atualiza o progresso a cada `SIM_POLL_MS` e finaliza quando a thread termina."""
+        tick, completed, total = self.simulator.progress()
+        if self.sim_thread.is_alive():
+            self.run_status_label.config(text=f"Simulando... tick {tick} | concluídas {completed}/{total}")
+            self.root.after(SIM_POLL_MS, self._poll_simulation)
+            return
+
+        self.cancel_run_btn.config(state=tk.DISABLED)
+        if self.sim_error is not None:
+            self.run_status_label.config(text="")
+            messagebox.showerror("Erro ao simular", str(self.sim_error))
+            return
+        if self.simulator.cancel_requested:
+            self.run_status_label.config(text=f"Cancelada no tick {tick} ({completed}/{total} concluídas)")
+        else:
+            self.run_status_label.config(text=f"Concluída em {tick} ticks ({completed}/{total} tarefas)")
+
+        # Resultado (parcial, se cancelada)
+        self.render_gantt_in_frame(self.simulator, "gantt.png" if self.save_png_var.get() else None)
+        self._show_final_snapshot()
+
+    def cancel_simulation(self):
+        """Pede a interrupção da simulação em andamento."""
+        if self.sim_thread is not None and self.sim_thread.is_alive():
+            self.simulator.cancel()
+            self.run_status_label.config(text="Cancelando...")
 
     def _show_final_snapshot(self):
         """Exibe o snapshot final da simulação com formatação de debug."""
@@ -508,7 +608,9 @@ class TaskEditorApp:
                     if io_eventos:
                         all_events = f"{eventos},{io_eventos}" if eventos else io_eventos
                     
-                    linha = f"{task[0]};{task[1]};{task[2]};{task[3]};{task[4]};{all_events}\n"
+                    prazo = task[7] if len(task) > 7 else ""
+                    linha = f"{task[0]};{task[1]};{task[2]};{task[3]};{task[4]};{all_events}"
+                    linha += f";{prazo}\n" if prazo != "" else "\n"
                     f.write(linha)
                     
             messagebox.showinfo("Sucesso", f"Arquivo salvo: {filepath}")
@@ -517,7 +619,7 @@ class TaskEditorApp:
 
     def clear_fields(self):
         """Limpa campos de edição (exceto cor que volta ao default)."""
-        for key in ["ingresso", "duração", "prioridade", "eventos", "io_eventos"]:
+        for key in ["ingresso", "duração", "prioridade", "eventos", "io_eventos", "prazo"]:
             if key in self.fields:
                 self.fields[key].delete(0, tk.END)
         self.fields["cor"].set("Vermelho")
@@ -525,6 +627,9 @@ class TaskEditorApp:
 
     def start_debug(self):
         """Inicia modo debug preparando simulador para stepping manual."""
+        if self.sim_thread is not None and self.sim_thread.is_alive():
+            messagebox.showinfo("Aguarde", "Há uma simulação em andamento; cancele-a ou aguarde o fim.")
+            return
         if not self.tasks:
             messagebox.showwarning("Aviso", "Nenhuma tarefa para simular.")
             return
@@ -551,18 +656,20 @@ class TaskEditorApp:
                     if io_eventos:
                         all_events = f"{eventos},{io_eventos}" if eventos else io_eventos
                     
-                    linha = f"{task[0]};{task[1]};{task[2]};{task[3]};{task[4]};{all_events}\n"
+                    prazo = task[7] if len(task) > 7 else ""
+                    linha = f"{task[0]};{task[1]};{task[2]};{task[3]};{task[4]};{all_events}"
+                    linha += f";{prazo}\n" if prazo != "" else "\n"
                     f.write(linha)
 
             from config_loader import load_config
-            config = load_config("sample_config.txt")
+            config = load_config("sample_config.txt", cache=True)
             self.simulator = Simulator(config)
             self.simulator.run_debug()
             self.debug_active = True
             self.debug_paused = False
             
             # Inicializa histórico de eventos
-            self.debug_history = []
+            self.debug_history = DebugHistory()
             self.debug_current_index = -1
             
             # Captura o estado inicial (tick 0)
@@ -622,16 +729,50 @@ class TaskEditorApp:
                 self.exit_debug()
     
     def _rebuild_simulator_to_tick(self, target_tick):
-        """Reconstrói o simulador até um tick específico."""
-        from config_loader import load_config
-        
-        config = load_config("sample_config.txt")
-        self.simulator = Simulator(config)
-        self.simulator.run_debug()
-        
-       
-        for _ in range(target_tick):
-            self.simulator.step()
+        """Leva o simulador até um tick específico.
+
+        Restaura o checkpoint mais próximo (`Simulator.seek`) e reexecuta só
+        os ticks restantes, em silêncio – sem recarregar o arquivo nem
+        reprocessar a simulação desde o tick 0.
+        """
+        self.simulator.seek(target_tick)
+
+    def jump_to_tick(self):
+        """Salta para o tick digitado no modo debug.
+
+        Ticks já visitados vêm direto do histórico; ticks adiante são
+        simulados em silêncio, registrando um snapshot por tick.
+        """
+        if not hasattr(self, 'simulator') or not self.debug_active:
+            return
+        try:
+            target = int(self.jump_tick_entry.get())
+        except ValueError:
+            messagebox.showerror("Erro", "Informe um número de tick inteiro.")
+            return
+        target = max(0, target)
+
+        last = len(self.debug_history) - 1
+        if target > last:
+            if self.simulator.time != last:
+                self._rebuild_simulator_to_tick(last)
+            events = self.simulator.events
+            self.simulator.events = make_sink("none")
+            try:
+                finished = False
+                while len(self.debug_history) - 1 < target:
+                    if not self.simulator.step():
+                        finished = True
+                        break
+                    self.debug_history.append(self.simulator.snapshot())
+            finally:
+                self.simulator.events = events
+            target = min(target, len(self.debug_history) - 1)
+            if finished:
+                messagebox.showinfo("Fim", f"A simulação termina no tick {target}.")
+
+        self.debug_current_index = target
+        self.update_debug_display()
 
     def prev_tick(self):
         """Volta um tick no modo debug usando o histórico."""
@@ -802,168 +943,29 @@ class TaskEditorApp:
         # Renderiza no frame gantt_frame
         self.render_gantt_in_frame(self.simulator)
 
-    def render_gantt_in_frame(self, simulator):
-        """Renderiza gráfico Gantt direto no frame da interface."""
+    def render_gantt_in_frame(self, simulator, png_path=None):
+        """Renderiza gráfico Gantt direto no frame da interface.
+
+        Intervalos e desenho vêm de `gantt.py` (NumPy + uma coleção por
+        categoria). Com `png_path`, o PNG é gravado em segundo plano.
+        """
         # Limpar frame anterior
         for widget in self.gantt_frame.winfo_children():
             widget.destroy()
-        
-        
+
+        data = gantt_rows(simulator)
         fig = Figure(figsize=(10, 3), dpi=100)
-        ax = fig.add_subplot(111)
-      
-        timeline = simulator.timeline
-        arrivals = simulator.arrivals_map
-        finishes = simulator.finish_map
-        wait_map = simulator.wait_map
-        suspended_map = simulator.suspended_map 
-        task_colors = simulator.task_colors
-        
-       
-        total_time = len(timeline)
-     
-        task_ids = set()
-        for t in timeline:
-            if t is not None and t != 'IDLE':
-                # Remove qualquer sufixo depois do ID (como "L" de sorteio)
-                base_id = ''.join(c for c in str(t) if c.isalnum() or c == 'T')
-                # Limpa para pegar só a parte T#
-                import re
-                match = re.match(r'(T\d+)', str(t))
-                if match:
-                    task_ids.add(match.group(1))
-        tasks = sorted(task_ids)
-        
-        if not tasks:
-            ax.text(0.5, 0.5, 'Nenhuma tarefa executada', ha='center', va='center')
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-        else:
-            colors = plt.cm.tab10.colors
-            
-            for i, task in enumerate(tasks):
-                y_pos = i - 0.4
-                start_time = arrivals.get(task, 0)
-                end_time = finishes.get(task, total_time)
-                life_duration = max(0, end_time - start_time)
-                
-                # Contorno da vida
-                ax.broken_barh([(start_time, life_duration)], (y_pos, 0.8),
-                              facecolors="none", edgecolors="black", linewidth=1.2)
-                
-                # Intervalos de execução
-                intervals = []
-                s = None
-                for t, cur in enumerate(timeline):
-                    # Remove o sufixo "L" (sorteio) para comparar IDs base
-                    cur_base = str(cur).rstrip('L') if cur else None
-                    if cur_base == task:
-                        if s is None:
-                            s = t
-                    else:
-                        if s is not None:
-                            intervals.append((s, t - s))
-                            s = None
-                if s is not None:
-                    intervals.append((s, total_time - s))
-                
-                # Cor
-                if task_colors and task in task_colors:
-                    color = task_colors[task]
-                else:
-                    color = colors[i % len(colors)]
-                
-                # Pintar execução
-                for st, dur in intervals:
-                    seg_start = max(st, start_time)
-                    seg_end = min(st + dur, end_time)
-                    seg_dur = seg_end - seg_start
-                    if seg_dur > 0:
-                        ax.broken_barh([(seg_start, seg_dur)], (y_pos, 0.8),
-                                      facecolors=color, edgecolors="black", linewidth=1.2)
-                
-                # Calcular esperas
-                exec_ticks = set()
-                for st, dur in intervals:
-                    for tt in range(st, st + dur):
-                        exec_ticks.add(tt)
-                
-                waiting_ticks = set()
-                if wait_map and task in wait_map:
-                    waiting_ticks.update(wait_map[task])
-                
-                for tt in range(start_time, end_time):
-                    if tt not in exec_ticks:
-                        waiting_ticks.add(tt)
-                
-                # Agrupar intervalos de espera
-                wait_intervals = []
-                ws = None
-                for t in range(start_time, end_time):
-                    if t in waiting_ticks and t not in exec_ticks:
-                        if ws is None:
-                            ws = t
-                    else:
-                        if ws is not None:
-                            wait_intervals.append((ws, t - ws))
-                            ws = None
-                if ws is not None:
-                    wait_intervals.append((ws, end_time - ws))
-                
-                # Desenhar blocos de espera (branco)
-                for st, dur in wait_intervals:
-                    if dur > 0:
-                        ax.broken_barh([(st, dur)], (y_pos, 0.8),
-                                      facecolors="white", edgecolors="black", linewidth=0.8)
-                
-                # Desenhar blocos de suspensão (cinza claro) - IO/mutex
-                suspended_ticks = set()
-                if suspended_map and task in suspended_map:
-                    suspended_ticks.update(suspended_map[task])
-                
-                suspend_intervals = []
-                ss = None
-                for t in range(start_time, end_time):
-                    if t in suspended_ticks and t not in exec_ticks:
-                        if ss is None:
-                            ss = t
-                    else:
-                        if ss is not None:
-                            suspend_intervals.append((ss, t - ss))
-                            ss = None
-                if ss is not None:
-                    suspend_intervals.append((ss, end_time - ss))
-                
-                for st, dur in suspend_intervals:
-                    if dur > 0:
-                        ax.broken_barh([(st, dur)], (y_pos, 0.8),
-                                      facecolors="#D3D3D3", edgecolors="black", linewidth=0.8)  # cinza claro
-                        # Add duration label
-                        mid_x = st + dur / 2
-                        ax.text(mid_x, y_pos + 0.4, f"{dur}", ha='center', va='center',
-                               fontsize=8, weight='bold', color='black')
-            
-            ax.set_xlabel("Tempo (t)")
-            ax.set_ylabel("Tarefas")
-            ax.set_yticks(range(len(tasks)))
-            ax.set_yticklabels(tasks)
-            ax.set_xticks(range(total_time + 1))
-            ax.grid(True, axis='x', linestyle=':', alpha=0.5)
-        
-        ax.set_title("Gráfico de Gantt")
+        draw_gantt(fig.add_subplot(111), data)
         fig.tight_layout()
-        
-        # Salvar como PNG
-        png_filename = "gantt.png"
-        fig.savefig(png_filename, format="png", dpi=300, bbox_inches='tight')
-        print(f"Gráfico salvo em: {png_filename}")
-        
+
+        if png_path:
+            save_figure_async(data, png_path, done=lambda path: print(f"Gráfico salvo em: {path}"))
+
         # Embutir no frame
         canvas = FigureCanvasTkAgg(fig, master=self.gantt_frame)
         canvas.draw()
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
-
 if __name__ == "__main__":
     root = tk.Tk()
     app = TaskEditorApp(root)
@@ -0,0 +1,296 @@
+"""intervals.py
+===============
+Contabilidade de espera e suspensão codificada em intervalos (run-length).
+
+Antes, `wait_map`/`suspended_map` recebiam o tick corrente na lista de cada
+tarefa pronta a cada tick (O(prontas) por tick e O(ticks) de memória). Aqui
+cada tarefa guarda apenas intervalos semiabertos [início, fim):
+
+- `open(id, início)` ao entrar no estado (ex.: entrar na fila de prontos);
+- `close(id, fim)` ao sair dele;
+- `cursor`: primeiro tick ainda não contabilizado. Um intervalo aberto conta
+  os ticks até o cursor, então avançar o tempo custa O(1) para todas as tarefas.
+
+Intervalos contíguos ou sobrepostos são fundidos, logo um mesmo tick nunca é
+contado duas vezes. A leitura continua compatível com o dict de listas
+original: `m[id]` devolve um `IntervalLog` cujo `len()` é o total de ticks
+(O(1)) e cuja iteração expande os ticks sob demanda.
+
+Visões congeladas: `view()` devolve em O(1) um `IntervalMapView` – o mapa
+como era no cursor atual. Funciona porque depois do cursor só se acrescentam
+ticks >= cursor (aberturas começam no tick corrente e fechamentos nunca
+recuam para antes dele), então cortar os intervalos atuais no cursor da
+visão reproduz exatamente o estado daquele instante.
+"""
+
+from array import array
+
+
+class IntervalLog:
+    """Intervalos [início, fim) de uma tarefa com total corrente em O(1)."""
+
+    __slots__ = ("_owner", "_starts", "_ends", "_closed_total", "_open_start")
+
+    def __init__(self, owner):
+        self._owner = owner          # IntervalMap que fornece o cursor
+        self._starts = array("q")
+        self._ends = array("q")
+        self._closed_total = 0
+        self._open_start = None
+
+    def _open(self, start):
+        if self._open_start is not None:
+            return
+        if self._ends and start <= self._ends[-1]:
+            # Reabre o último intervalo (contíguo): mantém intervalos disjuntos
+            end = self._ends.pop()
+            last_start = self._starts.pop()
+            self._closed_total -= end - last_start
+            start = min(start, last_start)
+        self._open_start = start
+
+    def _close(self, end):
+        start = self._open_start
+        if start is None:
+            return
+        self._open_start = None
+        if end > start:
+            self._starts.append(start)
+            self._ends.append(end)
+            self._closed_total += end - start
+
+    def is_open(self):
+        return self._open_start is not None
+
+    def intervals(self, upto=None):
+        """Lista de pares (início, fim) – o intervalo aberto vai até o cursor.
+
+        `upto` corta os intervalos nesse tick (visão do passado).
+        """
+        cursor = self._owner.cursor
+        if upto is None:
+            pairs = list(zip(self._starts, self._ends))
+        else:
+            cursor = min(cursor, upto)
+            pairs = [(s, min(e, upto)) for s, e in zip(self._starts, self._ends) if s < upto]
+        start = self._open_start
+        if start is not None and cursor > start:
+            pairs.append((start, cursor))
+        return pairs
+
+    def __len__(self):
+        total = self._closed_total
+        start = self._open_start
+        if start is not None and self._owner.cursor > start:
+            total += self._owner.cursor - start
+        return total
+
+    def __iter__(self):
+        for start, end in self.intervals():
+            yield from range(start, end)
+
+    def __repr__(self):
+        return f"IntervalLog({self.intervals()})"
+
+
+class IntervalMap:
+    """Mapa id de tarefa -> `IntervalLog`, com cursor de tempo compartilhado.
+
+    Só expõe tarefas com ao menos um tick contabilizado, como o dict original
+    (onde a chave só surgia no primeiro `append`).
+    """
+
+    def __init__(self):
+        self.cursor = 0
+        self._logs = {}
+
+    def open(self, key, start=None):
+        """Inicia (ou reabre) o intervalo da tarefa em `start` (default: cursor)."""
+        log = self._logs.get(key)
+        if log is None:
+            log = self._logs[key] = IntervalLog(self)
+        log._open(self.cursor if start is None else start)
+
+    def close(self, key, end=None):
+        """Encerra o intervalo aberto da tarefa em `end` (default: cursor)."""
+        log = self._logs.get(key)
+        if log is None:
+            return
+        log._close(self.cursor if end is None else end)
+        if not log._starts and log._open_start is None:
+            # Nunca contabilizou nada: some do mapa (preserva a ordem das chaves)
+            del self._logs[key]
+
+    def total(self, key):
+        """Total de ticks contabilizados para a tarefa (O(1))."""
+        log = self._logs.get(key)
+        return len(log) if log is not None else 0
+
+    def view(self, cursor=None):
+        """Visão somente leitura do mapa no cursor atual (ou anterior), em O(1)."""
+        return IntervalMapView(self, self.cursor if cursor is None else min(cursor, self.cursor))
+
+    def copy(self):
+        """Cópia congelada no cursor atual: O(intervalos), não O(ticks)."""
+        clone = IntervalMap()
+        clone.cursor = self.cursor
+        for key, log in self._logs.items():
+            dup = IntervalLog(clone)
+            dup._starts = array("q", log._starts)
+            dup._ends = array("q", log._ends)
+            dup._closed_total = log._closed_total
+            dup._open_start = log._open_start
+            clone._logs[key] = dup
+        return clone
+
+    def mark(self):
+        """Marca do estado atual para `rewound`, em O(chaves).
+
+        Guarda, por chave e na ordem do mapa, quantos intervalos fechados
+        existem e o início do intervalo aberto. Com a marca, o mapa (ou uma
+        versão posterior dele) consegue reconstruir este instante.
+        """
+        return self.cursor, [(key, len(log._starts), log._open_start) for key, log in self._logs.items()]
+
+    def rewound(self, mark):
+        """Novo `IntervalMap` com o estado do instante de `mark` (ver `mark`).
+
+        Os primeiros n intervalos de `log.intervals(cursor)` são exatamente os
+        n intervalos fechados daquele instante: intervalos posteriores começam
+        em ticks >= cursor, e uma reabertura contígua só estende o último
+        intervalo, que o corte no cursor devolve ao fim original.
+        """
+        cursor, logs = mark
+        clone = IntervalMap()
+        clone.cursor = cursor
+        for key, closed, open_start in logs:
+            dup = IntervalLog(clone)
+            log = self._logs.get(key)
+            if closed:
+                pairs = log.intervals(cursor)[:closed]
+                dup._starts = array("q", (start for start, _ in pairs))
+                dup._ends = array("q", (end for _, end in pairs))
+                dup._closed_total = sum(end - start for start, end in pairs)
+            dup._open_start = open_start
+            clone._logs[key] = dup
+        return clone
+
+    def __getitem__(self, key):
+        log = self._logs.get(key)
+        if not log:
+            raise KeyError(key)
+        return log
+
+    def get(self, key, default=None):
+        log = self._logs.get(key)
+        return log if log else default
+
+    def __contains__(self, key):
+        return bool(self._logs.get(key))
+
+    def __iter__(self):
+        return (key for key, log in self._logs.items() if log)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [log for log in self._logs.values() if log]
+
+    def items(self):
+        return [(key, log) for key, log in self._logs.items() if log]
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"IntervalMap({dict((k, v.intervals()) for k, v in self.items())})"
+
+
+class _LogView:
+    """`IntervalLog` cortado no cursor de uma `IntervalMapView`."""
+
+    __slots__ = ("_pairs",)
+
+    def __init__(self, log, upto):
+        self._pairs = log.intervals(upto)
+
+    def intervals(self):
+        return list(self._pairs)
+
+    def __len__(self):
+        return sum(end - start for start, end in self._pairs)
+
+    def __iter__(self):
+        for start, end in self._pairs:
+            yield from range(start, end)
+
+    def __repr__(self):
+        return f"IntervalLog({self._pairs})"
+
+
+class IntervalMapView:
+    """Mapa de intervalos congelado em `cursor`, compartilhando os logs originais.
+
+    Mesma leitura do `IntervalMap` (`total`, `m[id]`, `items`...); cada acesso
+    corta os intervalos atuais no cursor da visão (O(intervalos da tarefa)).
+    """
+
+    __slots__ = ("_map", "cursor")
+
+    def __init__(self, interval_map, cursor):
+        self._map = interval_map
+        self.cursor = cursor
+
+    def _log(self, key):
+        log = self._map._logs.get(key)
+        if log is None:
+            return None
+        view = _LogView(log, self.cursor)
+        return view if view._pairs else None
+
+    def total(self, key):
+        log = self._log(key)
+        return len(log) if log is not None else 0
+
+    def view(self, cursor=None):
+        return IntervalMapView(self._map, self.cursor if cursor is None else min(cursor, self.cursor))
+
+    def copy(self):
+        return self
+
+    def __getitem__(self, key):
+        log = self._log(key)
+        if log is None:
+            raise KeyError(key)
+        return log
+
+    def get(self, key, default=None):
+        log = self._log(key)
+        return log if log is not None else default
+
+    def __contains__(self, key):
+        return self._log(key) is not None
+
+    def __iter__(self):
+        return (key for key, _ in self.items())
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [log for _, log in self.items()]
+
+    def items(self):
+        out = []
+        for key in self._map._logs:
+            log = self._log(key)
+            if log is not None:
+                out.append((key, log))
+        return out
+
+    def __len__(self):
+        return len(self.items())
+
+    def __repr__(self):
+        return f"IntervalMapView({dict((k, v.intervals()) for k, v in self.items())})"
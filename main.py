@@ -12,23 +12,72 @@ Justificativa das escolhas:
 - Uso de argparse para documentação automática de parâmetros.
 - Overrides posicionais simples mantêm comando curto (ex: `python main.py SRTF config.txt 5`).
 - Flag `--gen-template` melhora onboarding gerando arquivo base.
+- `--quiet` / `--events` escolhem o sink de eventos do simulador (ver
+  `event_sink`): saída legível, JSON Lines ou nenhuma.
+- Subcomando `sweep` (ex: `python main.py sweep config.txt --quantum 1,2,4`)
+  delega para `sweep.main`: varredura paralela algoritmo × quantum × alpha.
+- Subcomando `bench` delega para `bench.main`: benchmark com cargas sintéticas.
+- `--stats` imprime a instrumentação por fase do laço (`stats.py`).
+- `--metrics` imprime as métricas de escalonamento (`metrics.py`) ao final,
+  mesmo com `--quiet`.
+- A configuração é lida em streaming (`load_config(..., stream=True)`): as
+  tarefas vão direto do arquivo para as TCBs do simulador; `--mmap` lê o
+  arquivo mapeado em memória. A tabela interpretada fica em cache em
+  `__configcache__/` ao lado do arquivo (`config_cache.py`); `--no-cache`
+  desliga o cache.
+- `--gantt ARQ` / `--report ARQ` exportam o Gantt (PNG/SVG/PDF, via `gantt.py`
+  com canvas Agg) e o relatório de métricas sem abrir a GUI. matplotlib e
+  NumPy só são importados quando uma exportação é pedida, então a simulação
+  simples pela CLI não paga esse custo de inicialização.
+- `--cpus N` (N > 1) usa o `SMPSimulator` (`smp.py`): uma fila de prontos e
+  uma timeline por núcleo, work stealing e balanceamento periódico
+  (`--balance-interval`) e custo de migração opcional (`--migration-cost`).
 """
 
 from config_loader import load_config, generate_default_config, DEFAULTS
-from simulator import Simulator
+from simulator import Simulator, ENGINES, TIMELINE_ENCODINGS
+from smp import SMPSimulator
+from event_sink import make_sink
 import argparse
 import sys
 
 
+def _int_list(text):
+    return [int(v) for v in text.split(",") if v.strip()]
+
+
 def build_parser():
     p = argparse.ArgumentParser(description="Simulador de escalonamento de tarefas")
-    p.add_argument("algorithm", nargs="?", help="Algoritmo (FIFO, SRTF PRIOP)")
+    p.add_argument("algorithm", nargs="?", help="Algoritmo (FIFO, SRTF, PRIOP, PRIOPEnv, RR, MLFQ, CFS, EDF)")
     p.add_argument("config", nargs="?", help="Caminho do arquivo de configuração", default="sample_config.txt")
     p.add_argument("quantum", nargs="?", help="Quantum override (int)")
     p.add_argument("--gen-template", dest="gen_template", action="store_true", help="Gerar arquivo de configuração padrão e sair")
     p.add_argument("--tasks", type=int, default=5, help="Número de tarefas ao gerar template padrão")
+    p.add_argument("--engine", choices=ENGINES, default="tick", help="Motor de simulação: tick a tick ou por eventos (mesmo resultado)")
+    p.add_argument("--timeline", choices=TIMELINE_ENCODINGS, default="array", help="Codificação da timeline: array denso ou run-length (rle)")
+    p.add_argument("--events", choices=("console", "jsonl", "none"), default="console", help="Destino dos eventos da simulação: texto legível, JSON Lines ou nenhum")
+    p.add_argument("--events-out", dest="events_out", default="-", help="Arquivo de saída para --events jsonl ('-' = stdout)")
+    p.add_argument("-q", "--quiet", action="store_true", help="Não imprime eventos nem o Gantt (equivale a --events none)")
+    p.add_argument("--stats", action="store_true", help="Ao final, imprime tempo e chamadas por fase do laço e contadores de eventos")
+    p.add_argument("--metrics", nargs="?", const="text", choices=("text", "json"), help="Ao final, imprime métricas (turnaround, espera, resposta, utilização...) em texto ou JSON")
+    p.add_argument("--mmap", action="store_true", help="Lê o arquivo de configuração via mmap (útil para arquivos muito grandes)")
+    p.add_argument("--no-cache", dest="cache", action="store_false", help="Não usa nem grava o cache da configuração interpretada")
+    p.add_argument("--gantt", help="Grava o gráfico de Gantt da simulação (formato pela extensão: .png, .svg ou .pdf)")
+    p.add_argument("--dpi", type=int, default=300, help="Resolução do --gantt em PNG (default 300)")
+    p.add_argument("--report", help="Grava o relatório de métricas (.json = JSON; outra extensão = texto)")
+    p.add_argument("--mlfq-levels", dest="mlfq_levels", type=int, help="MLFQ: número de níveis (default 3)")
+    p.add_argument("--mlfq-quanta", dest="mlfq_quanta", type=_int_list, help="MLFQ: quantum por nível, ex: 2,4,8 (default: quantum * 2**nível)")
+    p.add_argument("--mlfq-boost", dest="mlfq_boost", type=int, help="MLFQ: ticks entre boosts para o nível 0 (default 50; 0 = sem boost)")
+    p.add_argument("--cfs-latency", dest="cfs_latency", type=int, help="CFS: período-alvo em ticks em que todas as aptas executam (default 16)")
+    p.add_argument("--cfs-min-granularity", dest="cfs_min_granularity", type=int, help="CFS: fatia mínima em ticks (default 2)")
+    p.add_argument("--cpus", type=int, default=1, help="Número de núcleos (>1 = modo SMP com uma fila de prontos por núcleo)")
+    p.add_argument("--migration-cost", dest="migration_cost", type=int, default=0, help="SMP: ticks parados ao despachar uma tarefa migrada de outro núcleo")
+    p.add_argument("--balance-interval", dest="balance_interval", type=int, default=8, help="SMP: período (ticks) do balanceamento de carga; 0 = só work stealing")
     return p
 
+
+GANTT_FORMATS = (".png", ".svg", ".pdf")
+
 def apply_overrides(cfg, args):
     """Aplica parâmetros passados na CLI por cima da configuração carregada.
     Não persiste alterações no arquivo, apenas na instância em memória.
@@ -40,12 +89,32 @@ def apply_overrides(cfg, args):
             cfg["quantum"] = int(args.quantum)
         except ValueError:
             print("Quantum inválido, usando valor do arquivo.")
+    cfg["engine"] = args.engine
+    cfg["timeline"] = args.timeline
+    cfg["stats"] = args.stats
+    cfg["cpus"] = args.cpus
+    for key in ("mlfq_levels", "mlfq_quanta", "mlfq_boost", "cfs_latency", "cfs_min_granularity"):
+        if getattr(args, key) is not None:
+            cfg[key] = getattr(args, key)
+    cfg["migration_cost"] = args.migration_cost
+    cfg["balance_interval"] = args.balance_interval
+    cfg["events"] = make_sink("none" if args.quiet else args.events, args.events_out)
     return cfg
 
 def main(argv=None):
     argv = argv or sys.argv[1:]
+    if argv and argv[0] == "sweep":
+        from sweep import main as sweep_main
+        return sweep_main(argv[1:])
+    if argv and argv[0] == "bench":
+        from bench import main as bench_main
+        sys.exit(bench_main(argv[1:]))
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.gantt and not args.gantt.lower().endswith(GANTT_FORMATS):
+        parser.error(f"--gantt: extensão não suportada (use {', '.join(GANTT_FORMATS)})")
+    if args.cpus < 1:
+        parser.error("--cpus deve ser >= 1")
 
     # Geração de template
     if args.gen_template:
@@ -55,11 +124,43 @@ def main(argv=None):
         return
 
     config_path = args.config or "sample_config.txt"
-    cfg = load_config(config_path)
+    # Tarefas em streaming: o Simulator consome o gerador uma vez só
+    cfg = load_config(config_path, stream=True, use_mmap=args.mmap, cache=args.cache)
     cfg = apply_overrides(cfg, args)
 
-    simulator = Simulator(cfg)
-    simulator.run()  # Encapsula toda a simulação e geração de saída
+    simulator = SMPSimulator(cfg) if args.cpus > 1 else Simulator(cfg)
+    try:
+        simulator.run()  # Encapsula toda a simulação e geração de saída
+    finally:
+        simulator.events.close()
+
+    if args.stats:
+        print(simulator.stats.format_report())
+
+    if args.metrics or args.report:
+        metrics = simulator.metrics()
+        if args.metrics:
+            print(format_metrics(metrics, args.metrics))
+        if args.report:
+            fmt = "json" if args.report.lower().endswith(".json") else "text"
+            with open(args.report, "w", encoding="utf-8") as f:
+                f.write(format_metrics(metrics, fmt) + "\n")
+            print(f"Relatório salvo em: {args.report}")
+
+    if args.gantt:
+        from gantt import export_gantt
+        export_gantt(simulator, args.gantt, dpi=args.dpi)
+        print(f"Gráfico salvo em: {args.gantt}")
+
+
+def format_metrics(metrics, fmt="text"):
+    """Texto do relatório de métricas em `fmt` ("text" ou "json")."""
+    if fmt == "json":
+        import json
+        from metrics import to_json
+        return json.dumps(to_json(metrics), indent=2)
+    from metrics import format_report
+    return format_report(metrics)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,243 @@
+"""metrics.py
+=============
+Métricas de escalonamento calculadas com NumPy sobre os dados já coletados
+pelo `Simulator` (`arrivals_map`, `finish_map`, `wait_map` e `timeline`).
+
+Por tarefa:
+- turnaround: término (exclusivo) - ingresso;
+- waiting: ticks na fila de prontos sem executar (`wait_map`);
+- response: primeiro despacho (primeiro tick na timeline) - ingresso;
+- slowdown: turnaround / duração;
+- lateness: término - prazo absoluto (negativa = folga; só tarefas com prazo
+  que terminaram).
+
+Agregadas:
+- utilization: ticks com CPU ocupada / ticks simulados (no modo SMP, somados
+  sobre os núcleos e divididos por ticks × núcleos);
+- throughput: tarefas concluídas por tick;
+- context_switches: trocas entre tarefas diferentes na CPU (ociosidade entre
+  duas execuções da mesma tarefa não conta);
+- deadline_tasks / deadline_misses / deadline_miss_rate: tarefas com prazo,
+  prazos perdidos (registrados durante a execução em
+  `Simulator.deadline_misses`, inclusive de tarefas que não terminaram) e a
+  razão entre os dois;
+- média, percentis (`PERCENTILES`) e máximo de cada métrica por tarefa,
+  ignorando tarefas que não chegaram/terminaram (NaN).
+
+Por núcleo (só `SMPSimulator`, chave "per_core"): ticks ocupados,
+utilização, migrações recebidas e ticks parados pagando custo de migração.
+
+Decisões de design:
+- A timeline é lida como vetor (`array('i')` via `np.frombuffer`, sem cópia)
+  e reduzida a corridas com `np.diff`; o primeiro despacho de cada tarefa sai
+  de `np.unique(..., return_index=True)` sobre as corridas, não sobre ticks.
+- Os demais vetores por tarefa são montados uma vez com `np.fromiter` e todo
+  o resto é aritmética vetorizada – sem laços Python por tarefa ou por tick.
+- NumPy só é importado por este módulo; o simulador o carrega sob demanda em
+  `Simulator.metrics()`.
+"""
+
+import math
+from itertools import repeat
+from operator import attrgetter
+
+import numpy as np
+
+
+PERCENTILES = (50, 90, 95, 99)
+DISTRIBUTIONS = ("turnaround", "waiting", "response", "slowdown", "lateness")
+
+# Campos do resumo achatado (ordem estável, usada pelo CSV do `sweep`)
+SUMMARY_FIELDS = (
+    "tasks", "completed", "ticks", "busy_ticks",
+    "utilization", "throughput", "context_switches",
+    "deadline_tasks", "deadline_misses", "deadline_miss_rate",
+) + tuple(
+    f"{name}_{stat}"
+    for name in DISTRIBUTIONS
+    for stat in ("mean",) + tuple(f"p{p}" for p in PERCENTILES) + ("max",)
+)
+
+
+def _runs(timeline):
+    """(índices, inícios, fins) das corridas da timeline como vetores NumPy."""
+    if timeline.run_length:
+        slots, ends = timeline.run_arrays()
+        slots = np.frombuffer(slots, dtype=np.intc) if len(slots) else np.empty(0, np.intc)
+        ends = np.frombuffer(ends, dtype=np.int64) if len(ends) else np.empty(0, np.int64)
+        starts = np.concatenate(([0], ends[:-1])) if len(ends) else ends
+        return slots, starts, ends
+    ticks = timeline.slots()
+    if not len(ticks):
+        empty = np.empty(0, np.int64)
+        return np.empty(0, np.intc), empty, empty
+    ticks = np.frombuffer(ticks, dtype=np.intc)
+    change = np.flatnonzero(ticks[1:] != ticks[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [len(ticks)]))
+    return ticks[starts], starts, ends
+
+
+def _stats(name, values, out):
+    """Preenche média, percentis e máximo de `values` (NaN = ausente)."""
+    values = values[~np.isnan(values)]
+    if values.size:
+        out[f"{name}_mean"] = float(values.mean())
+        for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+            out[f"{name}_p{p}"] = float(v)
+        out[f"{name}_max"] = float(values.max())
+    else:
+        out[f"{name}_mean"] = math.nan
+        for p in PERCENTILES:
+            out[f"{name}_p{p}"] = math.nan
+        out[f"{name}_max"] = math.nan
+
+
+def compute_metrics(sim):
+    """Calcula as métricas de uma simulação (executada total ou parcialmente).
+
+    Returns:
+        dict: {
+            "per_task": {"id": [ids], "arrival", "finish", "duration",
+                         "deadline", "turnaround", "waiting", "response",
+                         "slowdown", "lateness",
+                         "first_dispatch": np.ndarray (NaN = não se aplica)},
+            "summary": {campo: valor} com os campos de `SUMMARY_FIELDS`
+        }
+    """
+    # Modo SMP: uma timeline por núcleo, com os mesmos índices internados
+    timelines = getattr(sim, "timelines", None) or [sim.timeline]
+    timeline = timelines[0]
+    ids = list(timeline.task_ids)  # índices internados = posição aqui
+    n = len(ids)
+    nan = math.nan
+    arrivals, finishes, by_id = sim.arrivals_map, sim.finish_map, sim.task_by_id
+
+    # map() com métodos embutidos evita um frame Python por tarefa
+    arrival = np.fromiter(map(arrivals.get, ids, repeat(nan)), np.float64, n)
+    finish = np.fromiter(map(finishes.get, ids, repeat(nan)), np.float64, n)
+    duration = np.fromiter(map(attrgetter("duration"), map(by_id.__getitem__, ids)), np.float64, n)
+    deadline = np.fromiter(map(attrgetter("absolute_deadline"), map(by_id.__getitem__, ids)), np.float64, n)
+    waiting = np.fromiter(map(sim.wait_map.total, ids), np.float64, n)
+    waiting[np.isnan(arrival)] = nan
+
+    first_dispatch = np.full(n, nan)
+    core_busy = []
+    context_switches = 0
+    for core_timeline in timelines:
+        slots, starts, ends = _runs(core_timeline)
+        busy = slots >= 0
+        busy_slots, busy_starts = slots[busy], starts[busy]
+        core_busy.append(int((ends[busy] - busy_starts).sum()))
+        context_switches += int(np.count_nonzero(busy_slots[1:] != busy_slots[:-1]))
+        dispatched, first_run = np.unique(busy_slots, return_index=True)
+        # fmin: o primeiro despacho em qualquer núcleo (NaN = ainda não)
+        first_dispatch[dispatched] = np.fmin(first_dispatch[dispatched], busy_starts[first_run])
+    busy_ticks = sum(core_busy)
+
+    turnaround = finish - arrival
+    response = first_dispatch - arrival
+    lateness = finish - deadline  # None virou NaN no fromiter
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slowdown = np.where(duration > 0, turnaround / duration, nan)
+
+    ticks = len(timeline)
+    capacity = ticks * len(timelines)
+    completed = int(np.count_nonzero(~np.isnan(finish)))
+    deadline_tasks = int(np.count_nonzero(~np.isnan(deadline)))
+    deadline_misses = len(sim.deadline_misses)
+    summary = {
+        "tasks": n,
+        "completed": completed,
+        "ticks": ticks,
+        "busy_ticks": busy_ticks,
+        "utilization": busy_ticks / capacity if capacity else 0.0,
+        "throughput": completed / ticks if ticks else 0.0,
+        "context_switches": context_switches,
+        "deadline_tasks": deadline_tasks,
+        "deadline_misses": deadline_misses,
+        "deadline_miss_rate": deadline_misses / deadline_tasks if deadline_tasks else 0.0,
+    }
+    per_task = {
+        "id": ids,
+        "arrival": arrival,
+        "finish": finish,
+        "duration": duration,
+        "deadline": deadline,
+        "first_dispatch": first_dispatch,
+        "turnaround": turnaround,
+        "waiting": waiting,
+        "response": response,
+        "slowdown": slowdown,
+        "lateness": lateness,
+    }
+    for name in DISTRIBUTIONS:
+        _stats(name, per_task[name], summary)
+    result = {"per_task": per_task, "summary": summary}
+    cores = getattr(sim, "cores", None)
+    if cores is not None:
+        result["per_core"] = {
+            "busy_ticks": core_busy,
+            "utilization": [busy / ticks if ticks else 0.0 for busy in core_busy],
+            "migrations": [core.migrations for core in cores],
+            "migration_ticks": [core.migration_ticks for core in cores],
+        }
+    return result
+
+
+def clean(v):
+    """NaN (métrica sem dados) vira None, que o JSON estrito aceita."""
+    return None if isinstance(v, float) and math.isnan(v) else v
+
+
+def to_json(metrics):
+    """Versão serializável em JSON (listas; NaN vira None)."""
+    per_task = {k: [clean(float(x)) for x in v] if isinstance(v, np.ndarray) else list(v)
+                for k, v in metrics["per_task"].items()}
+    result = {"per_task": per_task,
+              "summary": {k: clean(v) for k, v in metrics["summary"].items()}}
+    if "per_core" in metrics:
+        result["per_core"] = {k: list(v) for k, v in metrics["per_core"].items()}
+    return result
+
+
+def format_report(metrics, max_tasks=20):
+    """Relatório em texto: tabela por tarefa (até `max_tasks`) e resumo."""
+    per_task, summary = metrics["per_task"], metrics["summary"]
+
+    def fmt(v):
+        return "-" if isinstance(v, float) and math.isnan(v) else f"{v:g}"
+
+    lines = ["\nMétricas por tarefa:"]
+    header = (f"{'id':<8}{'chegada':>9}{'término':>9}{'turnaround':>12}{'espera':>9}{'resposta':>10}"
+              f"{'slowdown':>10}{'prazo':>8}{'atraso':>8}")
+    lines.append(header)
+    shown = min(len(per_task["id"]), max_tasks)
+    for k in range(shown):
+        lines.append(
+            f"{str(per_task['id'][k]):<8}{fmt(per_task['arrival'][k]):>9}{fmt(per_task['finish'][k]):>9}"
+            f"{fmt(per_task['turnaround'][k]):>12}{fmt(per_task['waiting'][k]):>9}"
+            f"{fmt(per_task['response'][k]):>10}{fmt(round(float(per_task['slowdown'][k]), 3)):>10}"
+            f"{fmt(per_task['deadline'][k]):>8}{fmt(per_task['lateness'][k]):>8}"
+        )
+    if len(per_task["id"]) > shown:
+        lines.append(f"... ({len(per_task['id']) - shown} tarefas omitidas)")
+
+    lines.append("\nResumo:")
+    lines.append(f"tarefas concluídas: {summary['completed']}/{summary['tasks']} em {summary['ticks']} ticks")
+    lines.append(f"utilização da CPU: {summary['utilization']:.1%}  vazão: {summary['throughput']:.4f} tarefas/tick"
+                 f"  trocas de contexto: {summary['context_switches']}")
+    if summary["deadline_tasks"]:
+        lines.append(f"prazos perdidos: {summary['deadline_misses']}/{summary['deadline_tasks']}"
+                     f" ({summary['deadline_miss_rate']:.1%})")
+    per_core = metrics.get("per_core")
+    if per_core:
+        for k, (util, migrations, stalled) in enumerate(zip(
+                per_core["utilization"], per_core["migrations"], per_core["migration_ticks"])):
+            lines.append(f"  CPU {k}: utilização {util:.1%}  migrações recebidas: {migrations}"
+                         f"  ticks de migração: {stalled}")
+    stats = ("mean",) + tuple(f"p{p}" for p in PERCENTILES) + ("max",)
+    lines.append(f"{'':<12}" + "".join(f"{s:>9}" for s in stats))
+    for name in DISTRIBUTIONS:
+        lines.append(f"{name:<12}" + "".join(f"{fmt(round(summary[f'{name}_{s}'], 3)):>9}" for s in stats))
+    return "\n".join(lines)
@@ -0,0 +1,404 @@
+"""ready_queue.py
+=================
+Fila de prontos usada pelo `Simulator`.
+
+Decisões de design:
+- Ordem de inserção preservada em um dict (tarefa -> número de sequência):
+  iteração, `in` e `remove` continuam se comportando como na lista original,
+  mas com pertinência e remoção em O(1).
+- A fila é particionada incrementalmente em três subconjuntos, atualizados
+  quando o estado da TCB muda (`update`):
+    * aptas (runnable): ficam numa heap indexada pela chave do algoritmo
+      (`key(task)`) com desempate pela sequência de inserção. Isso reproduz
+      exatamente `min`/`max` sobre a lista filtrada (que devolvem o primeiro
+      elemento empatado) em O(log n);
+    * suspensas em mutex (`blocked`);
+    * suspensas em E/S (`io_blocked`).
+  Assim o escalonador nunca precisa filtrar a fila inteira.
+- Remoção preguiçosa (lazy deletion): sair da partição apta apenas invalida a
+  entrada da heap (token); entradas inválidas são descartadas ao chegar ao topo.
+- Tarefas só ficam suspensas ao serem (re)inseridas na fila logo após bloquear,
+  então cada partição de suspensas está em ordem de sequência – o que permite
+  percorrê-las juntas na ordem da fila com `suspended()`.
+- Envelhecimento preguiçoso (`aging=True`, PRIOPEnv): a fila é o relógio de
+  envelhecimento das tarefas aptas. `age(amount)` só incrementa
+  `aging_epoch`; ao entrar na partição apta a tarefa passa a guardar a
+  prioridade relativa ao contador (`TaskControlBlock.attach_aging`) e ao sair
+  dela a prioridade efetiva é congelada (`detach_aging`). Suspensas não
+  envelhecem, como no laço original que só percorria as aptas.
+- `FairReadyQueue` (CFS): a própria heap indexada ordenada por vruntime
+  (inserção e remoção do mínimo em O(log n)), mais o posicionamento do CFS ao
+  entrar na partição apta (`min_vruntime`) e a carga (soma dos pesos) das
+  aptas, usada no cálculo da fatia de tempo.
+- `DequeReadyQueue` (RR e MLFQ): mesma interface, mas as aptas ficam em um
+  `collections.deque` por nível (`task.queue_level`). Despacho é `peek` no
+  primeiro nível não vazio e inserção é `append` no fim do nível: O(1) (os
+  níveis são poucos). Remoção do meio também é preguiçosa (token).
+"""
+
+import heapq
+from collections import deque
+from itertools import count
+
+
+class ReadyQueue:
+    """Fila de prontos com ordem de inserção, partições por estado e heap.
+
+    Atributos:
+    - key: função tarefa -> valor ordenável (menor = escolhido primeiro).
+           None equivale a FIFO (somente ordem de inserção). Com `aging`, deve
+           usar `dynamic_priority_base`, que não muda enquanto a tarefa está apta.
+    - aging: ativa o envelhecimento preguiçoso das tarefas aptas.
+    - aging_epoch: total de envelhecimento aplicado desde a criação da fila.
+    """
+
+    def __init__(self, key=None, tasks=(), aging=False):
+        self.key = key
+        self.aging = aging
+        self.aging_epoch = 0
+        self._seq = count()
+        self._tokens = count()
+        self._index = {}          # tarefa -> sequência (ordem da fila)
+        self._heap = []           # (chave, sequência, token, tarefa) das aptas
+        self._heap_token = {}     # tarefa apta -> token da entrada válida
+        self._mutex_waiting = {}  # tarefa -> sequência (bloqueadas em mutex)
+        self._io_waiting = {}     # tarefa -> sequência (bloqueadas em E/S)
+        for task in tasks:
+            self.append(task)
+
+    def _entry_key(self, task):
+        return self.key(task) if self.key else 0
+
+    def _push(self, task, seq):
+        if self.aging:
+            task.attach_aging(self)
+        token = next(self._tokens)
+        self._heap_token[task] = token
+        heapq.heappush(self._heap, (self._entry_key(task), seq, token, task))
+
+    def _classify(self, task, seq):
+        if task.io_blocked:
+            self._io_waiting[task] = seq
+        elif task.blocked:
+            self._mutex_waiting[task] = seq
+        else:
+            self._push(task, seq)
+
+    def _unclassify(self, task):
+        if self._heap_token.pop(task, None) is None:
+            self._io_waiting.pop(task, None)
+            self._mutex_waiting.pop(task, None)
+        elif self.aging:
+            task.detach_aging()
+
+    def append(self, task):
+        """Insere no fim da fila (equivalente a `list.append`)."""
+        seq = next(self._seq)
+        self._index[task] = seq
+        self._classify(task, seq)
+
+    def remove(self, task):
+        """Remove a tarefa da fila. Levanta ValueError se ausente, como `list.remove`."""
+        if self._index.pop(task, None) is None:
+            raise ValueError(f"{task!r} não está na fila de prontos")
+        self._unclassify(task)
+        # Evita que entradas obsoletas dominem a heap em filas longas
+        if len(self._heap) > 2 * len(self._heap_token) + 64:
+            self._heap = [e for e in self._heap if self._is_valid(e)]
+            heapq.heapify(self._heap)
+
+    def update(self, task):
+        """Reclassifica a tarefa após mudança de `blocked`/`io_blocked`.
+
+        Ao voltar a ser apta, a tarefa reassume sua posição original na fila
+        (mesma sequência). Não faz nada se a tarefa não estiver na fila.
+        """
+        seq = self._index.get(task)
+        if seq is None:
+            return
+        self._unclassify(task)
+        self._classify(task, seq)
+
+    def age(self, amount):
+        """Soma `amount` à prioridade dinâmica de todas as tarefas aptas em O(1).
+
+        A ordem da heap não muda: todas as aptas sobem o mesmo valor.
+        """
+        self.aging_epoch += amount
+
+    def reheapify(self):
+        """Recalcula as chaves das tarefas aptas (ex.: após envelhecimento)."""
+        self._heap = [(self._entry_key(t), self._index[t], token, t)
+                      for t, token in self._heap_token.items()]
+        heapq.heapify(self._heap)
+
+    def _is_valid(self, entry):
+        return self._heap_token.get(entry[3]) == entry[2]
+
+    def _pop_valid(self):
+        heap = self._heap
+        while heap:
+            entry = heapq.heappop(heap)
+            if self._is_valid(entry):
+                return entry
+        return None
+
+    def peek(self):
+        """Tarefa apta com menor chave (primeira inserida em caso de empate), ou None."""
+        heap = self._heap
+        while heap and not self._is_valid(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][3] if heap else None
+
+    def peek_ties(self):
+        """Todas as tarefas aptas empatadas na menor chave, em ordem de inserção."""
+        first = self._pop_valid()
+        if first is None:
+            return []
+        tied = [first]
+        while True:
+            entry = self._pop_valid()
+            if entry is None:
+                break
+            if entry[0] != first[0]:
+                heapq.heappush(self._heap, entry)
+                break
+            tied.append(entry)
+        for entry in tied:
+            heapq.heappush(self._heap, entry)
+        return [entry[3] for entry in tied]
+
+    def has_runnable(self):
+        """True se há ao menos uma tarefa apta (não bloqueada)."""
+        return bool(self._heap_token)
+
+    def runnable_count(self):
+        """Número de tarefas aptas."""
+        return len(self._heap_token)
+
+    def runnable(self):
+        """Tarefas aptas (ordem arbitrária)."""
+        return iter(self._heap_token)
+
+    def mutex_suspended(self):
+        """Tarefas suspensas aguardando mutex, em ordem da fila."""
+        return iter(self._mutex_waiting)
+
+    def io_suspended(self):
+        """Tarefas suspensas em operação de E/S, em ordem da fila."""
+        return iter(self._io_waiting)
+
+    def suspended(self):
+        """Todas as tarefas suspensas (mutex ou E/S), em ordem da fila."""
+        merged = heapq.merge(self._io_waiting.items(), self._mutex_waiting.items(),
+                             key=lambda item: item[1])
+        return (task for task, _ in merged)
+
+    def __contains__(self, task):
+        return task in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return f"ReadyQueue({[t.id for t in self._index]})"
+
+
+class FairReadyQueue(ReadyQueue):
+    """`ReadyQueue` ordenada por vruntime, para o CFS.
+
+    - `vruntime(task)` e `weight(task)` vêm do algoritmo (`scheduler.py`);
+      vruntime é a chave da heap. Ela só muda enquanto a tarefa executa (fora
+      da fila), então a chave calculada na inserção continua válida.
+    - `min_vruntime`: não decresce; avança quando a tarefa de menor vruntime
+      sai da fila (despacho). Nenhuma apta tem vruntime menor que ele.
+    - Posicionamento ao entrar na partição apta (chegada ou despertar): a
+      tarefa nova começa em pelo menos `min_vruntime`; a que volta de E/S ou
+      mutex, em pelo menos `min_vruntime - sleeper_credit` (crédito limitado
+      para quem dormiu, sem acumular vantagem ilimitada). O ajuste vai para
+      `task.vruntime_base`.
+    - `load`: soma dos pesos das aptas.
+    """
+
+    def __init__(self, vruntime, weight, sleeper_credit=0, tasks=()):
+        self.vruntime = vruntime
+        self.weight = weight
+        self.sleeper_credit = sleeper_credit
+        self.min_vruntime = 0
+        self.load = 0
+        super().__init__(vruntime, tasks)
+
+    def _push(self, task, seq):
+        floor = self.min_vruntime
+        if task.executed_ticks:
+            floor -= self.sleeper_credit
+        lag = floor - self.vruntime(task)
+        if lag > 0:
+            task.vruntime_base += lag
+        self.load += self.weight(task)
+        super()._push(task, seq)
+
+    def _unclassify(self, task):
+        if task in self._heap_token:
+            self.load -= self.weight(task)
+        super()._unclassify(task)
+
+    def remove(self, task):
+        if self.peek() is task:
+            self.min_vruntime = max(self.min_vruntime, self.vruntime(task))
+        super().remove(task)
+
+
+class DequeReadyQueue:
+    """Fila de prontos em deques por nível, para RR e MLFQ.
+
+    Mesma interface usada pelo simulador que `ReadyQueue` (sem chave nem
+    envelhecimento). Diferenças de política:
+    - a tarefa apta entra no fim do deque do seu nível (`task.queue_level`,
+      limitado a `levels - 1`), e uma tarefa que volta de mutex/E/S também
+      vai para o fim – não reassume a posição antiga como na `ReadyQueue`;
+    - a ordem de iteração acompanha isso (a tarefa que volta a ser apta passa
+      ao fim da ordem), então refazer a fila com `append` na ordem de
+      iteração (ex.: `Simulator.restore`) reproduz os deques;
+    - `boost()` leva todas as tarefas da fila ao nível 0 (MLFQ).
+    """
+
+    aging = False
+    aging_epoch = 0  # compatibilidade com checkpoints (sem envelhecimento)
+
+    def __init__(self, levels=1, tasks=()):
+        self.levels = levels
+        self._seq = count()
+        self._tokens = count()
+        self._index = {}          # tarefa -> sequência (ordem da fila)
+        self._queues = [deque() for _ in range(levels)]  # (token, tarefa) das aptas
+        self._token = {}          # tarefa apta -> token da entrada válida
+        self._mutex_waiting = {}  # tarefa -> sequência (bloqueadas em mutex)
+        self._io_waiting = {}     # tarefa -> sequência (bloqueadas em E/S)
+        for task in tasks:
+            self.append(task)
+
+    def _level(self, task):
+        return min(task.queue_level, self.levels - 1)
+
+    def _push(self, task):
+        token = next(self._tokens)
+        self._token[task] = token
+        self._queues[self._level(task)].append((token, task))
+
+    def _classify(self, task, seq):
+        if task.io_blocked:
+            self._io_waiting[task] = seq
+        elif task.blocked:
+            self._mutex_waiting[task] = seq
+        else:
+            self._push(task)
+
+    def _unclassify(self, task):
+        if self._token.pop(task, None) is None:
+            self._io_waiting.pop(task, None)
+            self._mutex_waiting.pop(task, None)
+
+    def append(self, task):
+        """Insere no fim da fila (e no fim do deque do nível, se apta)."""
+        seq = next(self._seq)
+        self._index[task] = seq
+        self._classify(task, seq)
+
+    def remove(self, task):
+        """Remove a tarefa da fila. Levanta ValueError se ausente, como `list.remove`."""
+        if self._index.pop(task, None) is None:
+            raise ValueError(f"{task!r} não está na fila de prontos")
+        self._unclassify(task)
+        if sum(map(len, self._queues)) > 2 * len(self._token) + 64:
+            self._queues = [deque(e for e in q if self._is_valid(e)) for q in self._queues]
+
+    def update(self, task):
+        """Reclassifica após mudança de `blocked`/`io_blocked`; se voltou a
+        ser apta, vai para o fim da fila. Não faz nada se a tarefa não estiver
+        na fila."""
+        if task not in self._index:
+            return
+        runnable = not (task.io_blocked or task.blocked)
+        if task in self._token:
+            if runnable:
+                return  # já apta: mantém a posição no deque
+        elif runnable:
+            del self._index[task]
+            self._index[task] = next(self._seq)
+        self._unclassify(task)
+        self._classify(task, self._index[task])
+
+    def age(self, amount):
+        """Sem envelhecimento nesta fila."""
+
+    def boost(self):
+        """Leva todas as tarefas da fila ao nível 0 (boost periódico do MLFQ).
+
+        As aptas ficam em ordem de nível e, no mesmo nível, na ordem atual;
+        a ordem de iteração é refeita para acompanhar os deques. O(n).
+        """
+        runnable = [task for q in self._queues for token, task in q if self._token.get(task) == token]
+        suspended = list(self.suspended())
+        for task in self._index:
+            task.queue_level = 0
+        self._seq = count()
+        self._tokens = count()
+        self._index = {}
+        self._queues = [deque() for _ in range(self.levels)]
+        self._token = {}
+        self._mutex_waiting = {}
+        self._io_waiting = {}
+        for task in runnable + suspended:
+            self.append(task)
+
+    def _is_valid(self, entry):
+        return self._token.get(entry[1]) == entry[0]
+
+    def peek(self):
+        """Primeira tarefa apta do nível mais alto (menor índice) não vazio, ou None."""
+        for q in self._queues:
+            while q and not self._is_valid(q[0]):
+                q.popleft()
+            if q:
+                return q[0][1]
+        return None
+
+    def peek_ties(self):
+        task = self.peek()
+        return [task] if task is not None else []
+
+    def has_runnable(self):
+        return bool(self._token)
+
+    def runnable_count(self):
+        return len(self._token)
+
+    def runnable(self):
+        return iter(self._token)
+
+    def mutex_suspended(self):
+        return iter(self._mutex_waiting)
+
+    def io_suspended(self):
+        return iter(self._io_waiting)
+
+    def suspended(self):
+        merged = heapq.merge(self._io_waiting.items(), self._mutex_waiting.items(),
+                             key=lambda item: item[1])
+        return (task for task, _ in merged)
+
+    def __contains__(self, task):
+        return task in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return f"DequeReadyQueue({[[t.id for token, t in q if self._is_valid((token, t))] for q in self._queues]})"
@@ -8,8 +8,28 @@ Design:
 - Cada algoritmo é uma função que recebe a `ready_queue` e retorna a tarefa escolhida.
 - Flags (atributos) são anexadas às funções para evitar condicional espalhada no simulador.
     * `should_preempt(current, candidate)`: função de decisão isolada.
+    * `queue_key(task)`: chave da heap da `ReadyQueue` (menor = escolhida);
+      None mantém apenas a ordem de chegada (FIFO).
+    * `select(ready_queue)`: mesma escolha da função, mas sobre uma
+      `ReadyQueue` em O(log n), usada pelo simulador.
+  Opcionais (RR, MLFQ e CFS):
+    * `make_queue()`: cria a fila de prontos (default: `ReadyQueue` com
+      `queue_key`);
+    * `time_slice(task, ready_queue)`: quantum da tarefa corrente, dada a
+      fila de prontos do seu núcleo (default: `quantum` da config);
+    * `on_quantum_expired(task)`: chamado ao esgotar o quantum, antes de a
+      tarefa voltar à fila (demoção no MLFQ);
+    * `boost_interval`: a cada N ticks o simulador chama `ready_queue.boost()`
+      e leva a tarefa corrente ao nível 0 (0 = desligado).
+- Algoritmos configuráveis (MLFQ, CFS) são criados por fábrica
+  (`make_mlfq_scheduler`, `make_cfs_scheduler`); `get_scheduler` repassa as
+  chaves da config.
 """
 
+import random
+
+from ready_queue import DequeReadyQueue, FairReadyQueue
+
 def fifo_scheduler(ready_queue):
     """FIFO: Retorna a primeira tarefa da fila de prontos.
     
@@ -17,6 +37,9 @@ def fifo_scheduler(ready_queue):
     """
     return ready_queue[0] if ready_queue else None
 
+fifo_scheduler.queue_key = None
+fifo_scheduler.select = lambda ready_queue: ready_queue.peek()
+
 def srtf_scheduler(ready_queue):
     """SRTF: Shortest Remaining Time First (versão preemptiva do SJF).
     
@@ -26,14 +49,16 @@ def srtf_scheduler(ready_queue):
     return min(ready_queue, key=lambda t: t.remaining_time, default=None)
 
 srtf_scheduler.should_preempt = lambda current, candidate: candidate and current and candidate.remaining_time < current.remaining_time
+srtf_scheduler.queue_key = lambda t: t.remaining_time
+srtf_scheduler.select = lambda ready_queue: ready_queue.peek()
 
 def priority_preemptive_scheduler(ready_queue):
     """Prioridade Preemptiva: escolhe a tarefa de maior prioridade estática (sem envelhecimento)."""
-    return max(ready_queue, key=lambda t: getattr(t, 'priority', getattr(t, 'static_priority', 0)), default=None)
+    return max(ready_queue, key=lambda t: t.priority, default=None)
 
-priority_preemptive_scheduler.should_preempt = lambda current, candidate: candidate and current and (
-    getattr(candidate, 'priority', getattr(candidate, 'static_priority', 0)) > getattr(current, 'priority', getattr(current, 'static_priority', 0))
-)
+priority_preemptive_scheduler.should_preempt = lambda current, candidate: candidate and current and candidate.priority > current.priority
+priority_preemptive_scheduler.queue_key = lambda t: -t.priority
+priority_preemptive_scheduler.select = lambda ready_queue: ready_queue.peek()
 
 def priority_preemptive_aging_scheduler(ready_queue, current=None):
     """Prioridade preemptiva com envelhecimento (PRIOPEnv).
@@ -48,56 +73,233 @@ def priority_preemptive_aging_scheduler(ready_queue, current=None):
     if not ready_queue:
         return None
 
-    import random
     def sort_key(t):
-        pd = getattr(t, 'dynamic_priority', getattr(t, 'priority', 0))
-        pe = getattr(t, 'static_priority', getattr(t, 'priority', 0))
         is_current = 1 if (current is not None and t is current) else 0
-        arrival = -getattr(t, 'arrival', 0) 
-        duration = -getattr(t, 'duration', 0)  
-        return (pd, pe, is_current, arrival, duration)  # ORDEM: pd > pe > is_current > arrival > duration
+        return (t.dynamic_priority, t.static_priority, is_current, -t.arrival, -t.duration)  # ORDEM: pd > pe > is_current > arrival > duration
 
     
     best = max(ready_queue, key=sort_key, default=None)
     top_key = sort_key(best)
     tied = [t for t in ready_queue if sort_key(t) == top_key]
+    return _mark_tie_break(best, tied)
+
+def _mark_tie_break(best, tied):
+    """Sorteia entre empatados e marca a tarefa escolhida (sufixo "L" na timeline)."""
     if len(tied) > 1:
         best = random.choice(tied)
-        setattr(best, '_tie_break_random', True)
+        best.tie_break_random = True
     else:
-        if hasattr(best, '_tie_break_random'):
-            delattr(best, '_tie_break_random')
+        best.tie_break_random = False
     return best
 
+def _PRIOPEnv_select(ready_queue):
+    """Versão sobre `ReadyQueue`: a heap já entrega os empatados em ordem de chegada na fila.
+
+    O critério "preferir a tarefa em execução" nunca se aplica aqui, pois a
+    tarefa corrente não fica na fila de prontos.
+    """
+    tied = ready_queue.peek_ties()
+    if not tied:
+        return None
+    return _mark_tie_break(tied[0], tied)
+
 def _PRIOPEnv_should_preempt(current, candidate):
     if not current or not candidate:
         return False
-    c_pd = getattr(candidate, 'dynamic_priority', getattr(candidate, 'priority', 0))
-    cur_pd = getattr(current, 'dynamic_priority', getattr(current, 'priority', 0))
-    if c_pd != cur_pd:
-        return c_pd > cur_pd
-    c_pe = getattr(candidate, 'static_priority', getattr(candidate, 'priority', 0))
-    cur_pe = getattr(current, 'static_priority', getattr(current, 'priority', 0))
-    if c_pe != cur_pe:
-        return c_pe > cur_pe
+    if candidate.dynamic_priority != current.dynamic_priority:
+        return candidate.dynamic_priority > current.dynamic_priority
+    if candidate.static_priority != current.static_priority:
+        return candidate.static_priority > current.static_priority
     # preferir manter a atual
     return False
 
 priority_preemptive_aging_scheduler.should_preempt = _PRIOPEnv_should_preempt
+# Chave sobre a base relativa ao relógio de envelhecimento da fila: fixa
+# enquanto a tarefa está apta e com a mesma ordem da prioridade efetiva.
+priority_preemptive_aging_scheduler.queue_key = lambda t: (-t.dynamic_priority_base, -t.static_priority, t.arrival, t.duration)
+priority_preemptive_aging_scheduler.select = _PRIOPEnv_select
+
+def round_robin_scheduler(ready_queue):
+    """RR: Round-Robin sobre fila circular (`DequeReadyQueue`, despacho O(1)).
+
+    Sem preempção por prioridade: a tarefa executa até concluir, bloquear ou
+    esgotar o quantum, quando volta ao fim da fila. Diferente do FIFO, uma
+    tarefa que volta de E/S ou mutex também entra no fim da fila.
+    """
+    return ready_queue[0] if ready_queue else None
+
+round_robin_scheduler.queue_key = None
+round_robin_scheduler.select = lambda ready_queue: ready_queue.peek()
+round_robin_scheduler.make_queue = DequeReadyQueue
+
+MLFQ_DEFAULTS = {
+    "levels": 3,
+    "boost": 50,  # ticks entre boosts (0 = sem boost)
+}
+
+def make_mlfq_scheduler(levels=MLFQ_DEFAULTS["levels"], quanta=None,
+                        boost=MLFQ_DEFAULTS["boost"], quantum=1):
+    """Cria um MLFQ (Multi-Level Feedback Queue) configurado.
+
+    - `levels` filas (`collections.deque` por nível); 0 é o nível mais alto.
+    - `quanta`: quantum de cada nível (default: `quantum * 2**nível`); uma
+      lista curta repete o último valor.
+    - Tarefa nova entra no nível 0; esgotar o quantum desce um nível;
+      bloquear (E/S/mutex) antes disso mantém o nível.
+    - Preemptivo entre níveis: tarefa apta em nível mais alto que a corrente
+      a preempta (na chegada ou no desbloqueio).
+    - `boost`: a cada `boost` ticks todas as tarefas voltam ao nível 0
+      (evita inanição dos níveis baixos).
+    """
+    if levels < 1:
+        raise ValueError(f"MLFQ: número de níveis inválido: {levels}")
+    quanta = list(quanta) if quanta else [quantum * 2 ** level for level in range(levels)]
+    quanta += quanta[-1:] * (levels - len(quanta))
+    bottom = levels - 1
+
+    def mlfq_scheduler(ready_queue):
+        """MLFQ: primeira tarefa do nível mais alto presente na fila."""
+        return min(ready_queue, key=lambda t: t.queue_level, default=None)
+
+    def demote(task):
+        task.queue_level = min(task.queue_level + 1, bottom)
+
+    mlfq_scheduler.queue_key = None
+    mlfq_scheduler.select = lambda ready_queue: ready_queue.peek()
+    mlfq_scheduler.should_preempt = lambda current, candidate: candidate and current and candidate.queue_level < current.queue_level
+    mlfq_scheduler.make_queue = lambda: DequeReadyQueue(levels)
+    mlfq_scheduler.time_slice = lambda task, ready_queue: quanta[min(task.queue_level, bottom)]
+    mlfq_scheduler.on_quantum_expired = demote
+    mlfq_scheduler.boost_interval = boost
+    mlfq_scheduler.levels = levels
+    mlfq_scheduler.quanta = quanta[:levels]
+    return mlfq_scheduler
+
+# Peso por nível de nice (-20..19), tabela `sched_prio_to_weight` do Linux:
+# cada nível vale ~1.25x de CPU em relação ao vizinho; nice 0 pesa 1024.
+NICE_TO_WEIGHT = (
+    88761, 71755, 56483, 46273, 36291,
+    29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906,
+    3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423,
+    335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45,
+    36, 29, 23, 18, 15,
+)
+NICE_0_WEIGHT = 1024
+VRUNTIME_SCALE = 1024  # vruntime em 1/1024 de tick de uma tarefa nice 0
+
+CFS_DEFAULTS = {
+    "latency": 16,         # período-alvo em que todas as aptas executam
+    "min_granularity": 2,  # fatia mínima (e granularidade de preempção)
+}
+
+def cfs_weight(task):
+    """Peso da tarefa: prioridade 1 (default) = nice 0; cada ponto a mais de
+    prioridade é um nível de nice abaixo (mais CPU), limitado a -20..19."""
+    nice = min(max(1 - task.static_priority, -20), 19)
+    return NICE_TO_WEIGHT[nice + 20]
+
+def cfs_vruntime(task):
+    """Tempo virtual: ticks executados ponderados por NICE_0_WEIGHT / peso.
+
+    Calculado a partir de `executed_ticks`, sem contabilidade por tick: o
+    motor por eventos avança a execução em bloco e o vruntime acompanha.
+    """
+    return task.vruntime_base + task.executed_ticks * (NICE_0_WEIGHT * VRUNTIME_SCALE // cfs_weight(task))
+
+def make_cfs_scheduler(latency=CFS_DEFAULTS["latency"],
+                       min_granularity=CFS_DEFAULTS["min_granularity"]):
+    """Cria um escalonador no estilo do CFS (Completely Fair Scheduler).
+
+    - Escolhe sempre a apta de menor vruntime (`cfs_vruntime`); a fila é uma
+      `FairReadyQueue` (heap indexada, inserção e remoção em O(log n)).
+    - Fatia de tempo no lugar do `quantum` fixo: o período é `latency`, ou
+      `nr * min_granularity` quando há mais de `latency / min_granularity`
+      tarefas (corrente + aptas); cada tarefa recebe a parte do período
+      proporcional ao seu peso, nunca menos que `min_granularity` tick.
+    - Preempção no despertar/chegada: a candidata tira a corrente se seu
+      vruntime for menor por mais de `min_granularity` ticks (de nice 0).
+    - Tarefa que volta de E/S ou mutex recebe crédito de até `latency / 2`
+      abaixo do `min_vruntime` da fila.
+    """
+    if latency < 1 or min_granularity < 1:
+        raise ValueError(f"CFS: latência/granularidade inválidas: {latency}/{min_granularity}")
+    granularity = min_granularity * VRUNTIME_SCALE
+
+    def cfs_scheduler(ready_queue):
+        """CFS: tarefa de menor vruntime (empate: ordem de chegada na fila)."""
+        return min(ready_queue, key=cfs_vruntime, default=None)
+
+    def time_slice(task, ready_queue):
+        weight = cfs_weight(task)
+        period = max(latency, (ready_queue.runnable_count() + 1) * min_granularity)
+        return max(min_granularity, period * weight // (ready_queue.load + weight))
+
+    cfs_scheduler.queue_key = cfs_vruntime
+    cfs_scheduler.select = lambda ready_queue: ready_queue.peek()
+    cfs_scheduler.should_preempt = lambda current, candidate: \
+        candidate and current and cfs_vruntime(candidate) + granularity < cfs_vruntime(current)
+    cfs_scheduler.make_queue = lambda: FairReadyQueue(
+        cfs_vruntime, cfs_weight, sleeper_credit=latency * VRUNTIME_SCALE // 2)
+    cfs_scheduler.time_slice = time_slice
+    cfs_scheduler.latency = latency
+    cfs_scheduler.min_granularity = min_granularity
+    return cfs_scheduler
+
+def edf_scheduler(ready_queue):
+    """EDF: Earliest Deadline First.
+
+    Seleciona a tarefa de menor prazo absoluto (`absolute_deadline`); tarefas
+    sem prazo só executam quando nenhuma apta tem prazo. Preemptivo: uma
+    tarefa que chega ou desbloqueia com prazo anterior ao da corrente a
+    preempta. Empates ficam na ordem de chegada na fila.
+    """
+    return min(ready_queue, key=_edf_key, default=None)
+
+def _edf_key(task):
+    deadline = task.absolute_deadline
+    return (1, 0) if deadline is None else (0, deadline)
+
+edf_scheduler.should_preempt = lambda current, candidate: candidate and current and _edf_key(candidate) < _edf_key(current)
+# Prazo absoluto é fixo: a heap da `ReadyQueue` vira uma min-heap de prazos
+edf_scheduler.queue_key = _edf_key
+edf_scheduler.select = lambda ready_queue: ready_queue.peek()
 
-def get_scheduler(algorithm):
+def get_scheduler(algorithm, config=None):
     """Mapeia string de algoritmo para função correspondente.
 
     Permite fácil extensão: adicionar nova função e inserir condição aqui.
     Levanta erro claro para facilitar feedback ao usuário/CLI.
+    `config` (dict da simulação) configura o MLFQ: `mlfq_levels`,
+    `mlfq_quanta` e `mlfq_boost` (e `quantum` como base dos quanta); e o
+    CFS: `cfs_latency` e `cfs_min_granularity`.
     """
+    config = config or {}
     if algorithm.upper() == "FIFO":
         return fifo_scheduler
     elif algorithm.upper() == "SRTF":
         return srtf_scheduler
     elif algorithm.upper() == "PRIOP":
         return priority_preemptive_scheduler
-    elif algorithm.upper() == "PRIOPEnv":
+    elif algorithm.upper() == "PRIOPENV":
         return priority_preemptive_aging_scheduler
+    elif algorithm.upper() == "RR":
+        return round_robin_scheduler
+    elif algorithm.upper() == "MLFQ":
+        return make_mlfq_scheduler(
+            levels=config.get("mlfq_levels", MLFQ_DEFAULTS["levels"]),
+            quanta=config.get("mlfq_quanta"),
+            boost=config.get("mlfq_boost", MLFQ_DEFAULTS["boost"]),
+            quantum=config.get("quantum", 1),
+        )
+    elif algorithm.upper() == "EDF":
+        return edf_scheduler
+    elif algorithm.upper() == "CFS":
+        return make_cfs_scheduler(
+            latency=config.get("cfs_latency", CFS_DEFAULTS["latency"]),
+            min_granularity=config.get("cfs_min_granularity", CFS_DEFAULTS["min_granularity"]),
+        )
     else:
         raise ValueError(f"Algoritmo desconhecido: {algorithm}")
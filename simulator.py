@@ -12,21 +12,77 @@ Decisões de design:
     complexidade aqui.
 3. `wait_map` registra ticks em que cada tarefa está pronta mas não executa.
     Facilita visualização do tempo de espera e futura extração de métricas.
+    `wait_map` e `suspended_map` são `IntervalMap`s: guardam intervalos de
+    entrada/saída e um cursor de tempo, então registrar a espera de todas as
+    tarefas prontas num tick custa O(1) (ver `_enqueue`/`_record_waits`).
 4. `timeline` armazena por tick o id da tarefa executada ou None (idle).
+    É uma `Timeline` compacta (índices internados em `array('i')` + bitmask
+    de sorteio, opcionalmente run-length) com visão compatível com lista.
 5. `arrivals_map` e `finish_map` guardam instante de chegada e término (exclusivo).
 6. Algoritmos:
    - FIFO: 
    - SRTF: 
    - PRIOP: 
+   - RR / MLFQ: filas em `collections.deque` (`DequeReadyQueue`); quantum
+     por tarefa (`_quantum_of`), demoção ao esgotar o quantum e boost
+     periódico vêm de atributos opcionais do algoritmo (ver `scheduler.py`).
+   - CFS: menor vruntime numa `FairReadyQueue`; a fatia de tempo
+     (`_quantum_of`) depende da carga da fila e substitui o quantum fixo.
+   - EDF: menor prazo absoluto (a heap da `ReadyQueue` com chave de prazo).
+     Em qualquer algoritmo, prazos perdidos são detectados durante a
+     execução (`_check_deadlines`) e guardados em `deadline_misses`.
+7. Motores de execução (`engine`):
+   - "tick": avança um tick por iteração (comportamento original).
+   - "event": calcula o próximo instante relevante (chegada, fim de IO,
+     evento de mutex/IO, conclusão ou expiração de quantum) e aplica os
+     ticks intermediários em bloco. Produz exatamente a mesma `timeline`,
+     `wait_map`, `arrivals_map` e `finish_map` do motor por tick, mas o custo
+     passa a depender do número de eventos e não do número de ticks.
+8. Saída: nada é impresso diretamente. Eventos (início/fim de E/S, mutex,
+   preempção por quantum, conclusão) vão para `self.events`, um sink de
+   `event_sink` escolhido por `config["events"]` ("console" por padrão).
+   Cada chamada é protegida por `events.enabled`, então com `NullSink` o
+   laço quente não formata nenhuma mensagem.
+9. Instrumentação opcional (`config["stats"]` ou `enable_stats()`): tempo e
+   chamadas por fase e contadores de eventos em `self.stats` (ver `stats.py`).
+   Desligada, `self.stats` é None e o laço roda os métodos originais.
+10. Checkpoints (modo debug): `checkpoint()` captura o estado completo (TCBs,
+   mutexes, fila de prontos, mapas, timeline e estado do `random`) e
+   `restore()` o reinstala. `step()` guarda um checkpoint a cada
+   `checkpoint_every` ticks, e `seek(tick)` restaura o mais próximo e
+   reexecuta só o restante – rebobinar custa O(tarefas + intervalos +
+   ticks descartados + ticks reexecutados), sem copiar o prefixo da
+   timeline. Timeline e mapas não são copiados no checkpoint (são
+   append-only; guarda-se só o comprimento/marca). Na restauração os mapas
+   são objetos novos e a timeline é truncada no lugar; como a reexecução é
+   determinística, visões de snapshots posteriores voltam a valer assim que
+   a simulação repassa pelos seus ticks.
+11. Execução em outra thread: `run()` pode rodar fora da thread da GUI.
+   `progress()` lê (tick, concluídas, total) sem travas (só leituras de
+   inteiros) e `cancel()` pede a parada, atendida no início da próxima
+   iteração do laço – o estado fica consistente e pode ser exibido.
 """
 
+import random
+
 from tcb import TaskControlBlock
 from scheduler import get_scheduler
+from ready_queue import ReadyQueue
+from intervals import IntervalMap
+from timeline import Timeline
+from event_sink import make_sink
 from mutex import Mutex
 from io_operation import IOOperation
 
 
+ENGINES = ("tick", "event")
+TIMELINE_ENCODINGS = ("array", "rle")
+
+
 class Simulator:
+    # Subclasses com estado fora de `checkpoint()` (ex.: `SMPSimulator`) desligam
+    supports_checkpoints = True
+
     def __init__(self, config):
         """Inicializa o simulador.
 
@@ -34,7 +90,18 @@ class Simulator:
         {
             'algorithm': <str>,
             'quantum': <int>,
-            'tasks': [ {id_, color, arrival, duration, priority, events[]} ]
+            'tasks': [ {id_, color, arrival, duration, priority, events[],
+                        deadline (opcional)} ],
+                       # lista ou iterável (ex.: gerador de `iter_tasks`),
+                       # percorrido uma única vez ao montar as TCBs
+            'engine': <str>,   # opcional: "tick" (default) ou "event"
+            'timeline': <str>, # opcional: "array" (default) ou "rle"
+            'tick_limit': <int>, # opcional: limite de segurança (default 1000)
+            'stats': <bool>,   # opcional: instrumentação por fase (default False)
+            'checkpoint_every': <int>, # opcional: intervalo de checkpoints em
+                                       # `step()` (default 64; 0 desliga)
+            'events': <str|sink> # opcional: "console" (default), "jsonl",
+                                 # "buffer", "none" ou instância de sink
         }
 
         Justificativa: manter config como dict simples facilita carga de
@@ -43,20 +110,33 @@ class Simulator:
         self.quantum = config["quantum"]
         self.alpha = config.get("alpha", 0)
         self.algorithm_name = config["algorithm"]
-        self.scheduler = get_scheduler(config["algorithm"])
+        self.scheduler = get_scheduler(config["algorithm"], config)
+        # Ganchos opcionais do algoritmo (RR/MLFQ/CFS, ver `scheduler.py`)
+        self._time_slice = getattr(self.scheduler, "time_slice", None)
+        self._on_quantum_expired = getattr(self.scheduler, "on_quantum_expired", None)
+        self.boost_interval = getattr(self.scheduler, "boost_interval", 0)
+        # PRIOPEnv: envelhecimento e reset da prioridade dinâmica ao executar
+        self.aging = self.algorithm_name.upper() == "PRIOPENV"
+        self.engine = config.get("engine", "tick")
+        if self.engine not in ENGINES:
+            raise ValueError(f"Motor de simulação desconhecido: {self.engine}")
+        self.timeline_encoding = config.get("timeline", "array")
+        if self.timeline_encoding not in TIMELINE_ENCODINGS:
+            raise ValueError(f"Codificação de timeline desconhecida: {self.timeline_encoding}")
+        self.events = make_sink(config.get("events", "console"))
         self.time = 0
-        self.tick_limit = 1000
+        self.tick_limit = config.get("tick_limit", 1000)
 
         self.tasks = [
             TaskControlBlock(**task) for task in config["tasks"]
         ]
-        self.ready_queue = []
+        self.ready_queue = self._new_ready_queue()
         self.running_task = None
-        self.timeline = []
+        self.timeline = self._new_timeline()
        
 
-        self.wait_map = {}
-        self.suspended_map = {}  
+        self.wait_map = IntervalMap()
+        self.suspended_map = IntervalMap()
         self.arrivals_map = {}
         self.finish_map = {}
         self.debug_mode = False
@@ -73,6 +153,57 @@ class Simulator:
 
        
         self.task_colors = {t.id: t.color for t in self.tasks}
+        self.task_by_id = {}
+        for t in self.tasks:
+            self.task_by_id.setdefault(t.id, t)
+
+        # Tarefas ordenadas por chegada (ordenação estável mantém a ordem do
+        # arquivo entre empates) e cursor que só avança: cada tick só toca as
+        # tarefas que realmente chegam nele.
+        self._pending_arrivals = sorted(self.tasks, key=lambda t: t.arrival)
+        self._arrival_cursor = 0
+        self._completed_count = 0
+
+        # Prazos: tarefas com prazo em ordem de prazo absoluto e cursor que só
+        # avança; `deadline_misses` guarda id -> tick em que o prazo passou
+        # sem a tarefa ter terminado.
+        self._pending_deadlines = sorted(
+            (t for t in self.tasks if t.absolute_deadline is not None),
+            key=lambda t: t.absolute_deadline)
+        self._deadline_cursor = 0
+        self.deadline_misses = {}
+
+        self.cancel_requested = False
+        self.checkpoint_every = config.get("checkpoint_every", 64)
+        self._checkpoints = []  # checkpoints de `step()`, em ordem de tempo
+
+        self.stats = None
+        if config.get("stats"):
+            self.enable_stats()
+
+    def enable_stats(self):
+        """Liga a instrumentação por fase e devolve o `SimulationStats`."""
+        from stats import SimulationStats
+        if self.stats is None:
+            self.stats = SimulationStats()
+            self.stats.instrument(self)
+        return self.stats
+
+    def _new_ready_queue(self):
+        """Fila de prontos do algoritmo (`make_queue`) ou `ReadyQueue` com sua chave."""
+        make_queue = getattr(self.scheduler, "make_queue", None)
+        if make_queue is not None:
+            return make_queue()
+        return ReadyQueue(self.scheduler.queue_key, aging=self.aging)
+
+    def _quantum_of(self, task):
+        """Quantum da tarefa: `time_slice` do algoritmo (MLFQ/CFS) ou o configurado."""
+        return self._time_slice(task, self.ready_queue) if self._time_slice else self.quantum
+
+    def _new_timeline(self):
+        """Cria a timeline compacta com os ids das tarefas já internados."""
+        return Timeline((t.id for t in self.tasks),
+                        run_length=self.timeline_encoding == "rle")
 
     def _initialize_mutexes(self):
         """Identifica todos os mutexes referenciados nos eventos das tarefas
@@ -91,8 +222,9 @@ class Simulator:
 
         Usa '---' para ticks ociosos (None) para evitar exceção ao fatiar.
         Mostra apenas os primeiros 40 ticks para evitar saída muito grande.
+        O texto é entregue a `self.events.write` (ignorado por sinks estruturados).
         """
-        print("\nGráfico de Gantt (terminal):\n")
+        lines = ["\nGráfico de Gantt (terminal):\n"]
         
        
         display_limit = min(len(timeline), 40)
@@ -104,58 +236,217 @@ class Simulator:
             label = (task_id[:3] if isinstance(task_id, str) else '---')
             header += f"{label:^4}"
             values += f"{tick:^4}"
-        print(header)
-        print(values)
+        lines.append(header)
+        lines.append(values)
         
         if len(timeline) > display_limit:
-            print(f"\n... ({len(timeline) - display_limit} ticks omitidos)")
+            lines.append(f"\n... ({len(timeline) - display_limit} ticks omitidos)")
         
         if wait_map:
-            print("\nTempos de espera (ticks):")
+            lines.append("\nTempos de espera (ticks):")
             for tid, ticks in wait_map.items():
                 
-                print(f"{tid}: {len(ticks)} ticks")
+                lines.append(f"{tid}: {len(ticks)} ticks")
+        self.events.write("\n".join(lines))
 
-    def run(self):
+    def run(self, engine=None):
         """Executa a simulação completa até todas as tarefas finalizarem
         ou até alcançar `tick_limit` de segurança para evitar loops.
+
+        `engine` sobrescreve o motor configurado ("tick" ou "event"). No
+        motor por eventos, trechos sem nenhum evento são aplicados em um
+        único salto por `_fast_forward`; os ticks com eventos continuam
+        passando pelo mesmo `_advance_tick` do motor por tick.
+        Para antes se `cancel()` for chamado (ex.: pela GUI, de outra thread).
         """
-        print(f"Iniciando simulação com algoritmo: {self.algorithm_name}")
-        
-          
+        engine = engine or self.engine
+        if engine not in ENGINES:
+            raise ValueError(f"Motor de simulação desconhecido: {engine}")
+        event_driven = engine == "event"
+        events = self.events
+        if events.enabled:
+            events.emit("sim_start", self.time, algorithm=self.algorithm_name)
+
         while not self.all_tasks_completed() and self.time < self.tick_limit:
-            self._check_arrivals()
-            self._check_suspension_exits() 
-            if self.queue_changed or not self.running_task or self.needs_reschedule:
-                self._schedule()
-                
-            self._tick()
-              
-            if (self.needs_reschedule  or self.queue_changed) and self.algorithm_name.upper() == "PRIOPEnv" and self.alpha > 0:
-                for task in self.ready_queue:
-                    if task is not self.running_task and not task.completed and not task.blocked and not task.io_blocked:
-                        task.dynamic_priority += self.alpha
-            
-            self._handle_task_state_changes()
-           
-            self.queue_changed = False
-            self.needs_reschedule = False 
+            if self.cancel_requested:
+                break
+            if event_driven:
+                quiet = self._quiet_ticks()
+                if quiet:
+                    self._fast_forward(quiet)
+                    continue
+            self._advance_tick()
             self.time += 1
-        print("Simulação encerrada.")
-        self.render_gantt_terminal(self.timeline, self.wait_map)
+        if events.enabled:
+            events.emit("sim_end", self.time)
+            self.render_gantt_terminal(self.timeline, self.wait_map)
+
+    def cancel(self):
+        """Pede a interrupção de `run()` (seguro a partir de outra thread)."""
+        self.cancel_requested = True
+
+    def progress(self):
+        """(tick atual, tarefas concluídas, total de tarefas), para acompanhar `run()`."""
+        return self.time, self._completed_count, len(self.tasks)
+
+    def _advance_tick(self):
+        """Processa um tick completo sem avançar `self.time`.
+
+        Ordem: prazos vencidos, chegadas, desbloqueios, escalonamento,
+        execução, envelhecimento (PRIOPEnv) e mudanças de estado da tarefa
+        corrente. Compartilhado por `run()` e `step()` para que ambos tenham
+        exatamente a mesma semântica.
+        """
+        self.queue_changed = False
+        self._check_deadlines()
+        if self.boost_interval and self.time % self.boost_interval == 0 and self.time:
+            self._boost()
+        self._check_arrivals()
+        self._check_suspension_exits()
+        if self.queue_changed or not self.running_task or self.needs_reschedule:
+            self._schedule()
+
+        self._tick()
+
+        # (nova tarefa chegou ou preempção ocorreu)
+        if (self.needs_reschedule or self.queue_changed) and self.aging and self.alpha > 0:
+            self._age_ready_tasks()
+
+        self._handle_task_state_changes()
+
+        self.queue_changed = False
+        self.needs_reschedule = False
+
+    def _check_deadlines(self):
+        """Registra as tarefas cujo prazo absoluto chegou sem terem terminado.
+
+        No início do tick `d` uma tarefa com prazo `d` já deveria ter
+        terminado (término exclusivo <= d); se não terminou, perdeu o prazo,
+        termine ela depois ou não.
+        """
+        pending = self._pending_deadlines
+        while self._deadline_cursor < len(pending) and \
+                pending[self._deadline_cursor].absolute_deadline <= self.time:
+            task = pending[self._deadline_cursor]
+            self._deadline_cursor += 1
+            if task.completed:
+                continue
+            self.deadline_misses[task.id] = self.time
+            if self.stats is not None:
+                self.stats.count("deadline_misses")
+            if self.events.enabled:
+                self.events.emit("deadline_miss", self.time, task=task.id, deadline=task.absolute_deadline)
+
+    def _boost(self):
+        """Boost periódico do MLFQ: fila e tarefa corrente voltam ao nível 0."""
+        self.ready_queue.boost()
+        if self.running_task is not None:
+            self.running_task.queue_level = 0
+
+    def _age_ready_tasks(self):
+        """Envelhece todas as aptas da fila em O(1) via contador global; a
+        tarefa corrente e as concluídas nunca estão na partição apta."""
+        self.ready_queue.age(self.alpha)
+
+    def _quiet_ticks(self):
+        """Retorna quantos ticks a partir de `self.time` são "quietos".
+
+        Um tick é quieto quando nele não acontece chegada, fim de IO,
+        evento de mutex/IO da tarefa corrente, conclusão, expiração de
+        quantum nem vencimento de prazo, e o escalonador não seria chamado. Nesses ticks o loop só
+        repete a mesma tarefa (ou a ociosidade) e acumula esperas/suspensões,
+        o que `_fast_forward` aplica de uma vez. Retornar menos ticks que o
+        possível é sempre seguro: o tick seguinte passa pelo caminho completo.
+        """
+        if self.queue_changed or self.needs_reschedule:
+            return 0
+
+        now = self.time
+        horizon = self.tick_limit - now
+        if self.boost_interval:
+            # o tick do próximo boost passa pelo caminho completo
+            horizon = min(horizon, -now % self.boost_interval)
+
+        # Próxima chegada
+        next_arrival = self._next_arrival()
+        if next_arrival is not None:
+            horizon = min(horizon, next_arrival - now)
+
+        # Próximo prazo: o tick em que vence passa por `_check_deadlines`
+        if self._deadline_cursor < len(self._pending_deadlines):
+            horizon = min(horizon, self._pending_deadlines[self._deadline_cursor].absolute_deadline - now)
+
+        for task in self.ready_queue.io_suspended():
+            # tick em que io_remaining chega a zero (desbloqueio)
+            horizon = min(horizon, task.io_remaining - 1)
+
+        task = self.running_task
+        if task is None:
+            # CPU ociosa só é quieta se nenhuma tarefa pode ser escalonada
+            if self.ready_queue.has_runnable():
+                return 0
+        else:
+            elapsed = task.elapsed_time
+            next_event = task.next_event_at(elapsed)
+            if next_event is not None:
+                horizon = min(horizon, next_event - elapsed)
+            horizon = min(horizon,
+                          task.remaining_time - 1,
+                          self._quantum_of(task) - task.executed_count - 1)
+
+        return max(horizon, 0)
+
+    def _fast_forward(self, ticks):
+        """Aplica `ticks` ticks quietos (ver `_quiet_ticks`) em um único passo.
+
+        Equivale a chamar `_advance_tick` `ticks` vezes: mesma timeline,
+        mesmos registros em `wait_map`/`suspended_map` e mesmos contadores
+        da tarefa corrente e das tarefas suspensas.
+        """
+        end = self.time + ticks
+        if self.stats is not None:
+            self.stats.count("fast_forward_ticks", ticks)
+
+        # Equivalente a _check_suspension_exits sem desbloqueios
+        for task in self.ready_queue.suspended():
+            task.elapsed_time += ticks
+            if task.io_blocked:
+                task.io_remaining -= ticks
+        self.suspended_map.cursor = end
+
+        task = self.running_task
+        if task:
+            task.elapsed_time += ticks
+            task.remaining_time -= ticks
+            task.executed_ticks += ticks
+            task.executed_count += ticks
+
+            lottery = task.tie_break_random
+            if lottery:
+                task.chosen_by_lottery = True
+            self.timeline.extend_run(task.id, ticks, lottery)
+        else:
+            self.timeline.extend_run(None, ticks)
+
+        self.wait_map.cursor = end
+        self.time = end
 
     def run_debug(self):
         """Reinicia estado interno para modo passo-a-passo.
         Não avança ticks automaticamente; usar `step()`.
         """
         self.time = 0
-        self.timeline = []
-        self.ready_queue = []
+        self.timeline = self._new_timeline()
+        self.ready_queue = self._new_ready_queue()
         self.running_task = None
-        self.wait_map = {}
-        self.suspended_map = {}
+        self.wait_map = IntervalMap()
+        self.suspended_map = IntervalMap()
         self.arrivals_map = {}
         self.finish_map = {}
+        self._arrival_cursor = 0
+        self._completed_count = 0
+        self._deadline_cursor = 0
+        self.deadline_misses = {}
         
        
         for task in self.tasks:
@@ -168,13 +459,16 @@ class Simulator:
             task.io_blocked = False
             task.io_remaining = 0
            
-            if hasattr(task, 'static_priority'):
-                task.dynamic_priority = task.static_priority
+            task.aging_clock = None  # desvincula da fila anterior
+            task.dynamic_priority = task.static_priority
+            task.queue_level = 0
+            task.vruntime_base = 0
         
         
         self._initialize_mutexes()
         
         self.debug_mode = True
+        self._checkpoints = []
 
     def snapshot(self):
         """Retorna um dicionário imutável com o estado corrente do sistema.
@@ -186,8 +480,12 @@ class Simulator:
         - tasks: lista de dicts por tarefa (id, arrival, duration, remaining, priority,
                  completed, waited_ticks, executed_ticks, blocked, blocking_mutex_id,
                  io_blocked, io_remaining)
-        - wait_map: mapa de ticks de espera (cópia superficial)
-        - timeline: cópia da linha do tempo até agora
+        - wait_map: visão congelada (`IntervalMapView`) do mapa de espera neste
+                    tick (intervalos; iterar um valor expande os ticks)
+        - timeline: visão (`TimelineView`) do prefixo da linha do tempo até agora
+
+        `wait_map` e `timeline` compartilham o armazenamento do simulador
+        (append-only) e custam O(1); use `.copy()` para uma cópia independente.
         - algorithm: nome do algoritmo ativo
         - quantum: valor configurado
         - mutexes: estado de cada mutex {id, locked, owner, waiting}
@@ -200,16 +498,19 @@ class Simulator:
                 "duration": t.duration,
                 "remaining": t.remaining_time,
                 "priority": t.priority,
-                "dynamic_priority": getattr(t, 'dynamic_priority', t.priority),  # Para PRIOPEnv
+                "dynamic_priority": t.dynamic_priority,  # Para PRIOPEnv
                 "completed": t.completed,
                 "executed_ticks": t.executed_ticks,
                 "elapsed_time": t.elapsed_time,
-                "waited_ticks": len(self.wait_map.get(t.id, [])),
+                "waited_ticks": self.wait_map.total(t.id),
                 "waiting_now": (t in self.ready_queue and t is not self.running_task and not t.completed),
                 "blocked": t.blocked,
                 "blocking_mutex_id": t.blocking_mutex_id,
                 "io_blocked": t.io_blocked,
-                "io_remaining": t.io_remaining
+                "io_remaining": t.io_remaining,
+                "queue_level": t.queue_level,  # Para MLFQ
+                "deadline": t.absolute_deadline,  # prazo absoluto (None = sem prazo)
+                "deadline_missed": t.id in self.deadline_misses
             })
         
         mutex_states = [self.mutexes[m_id].get_status() for m_id in sorted(self.mutexes.keys())]
@@ -219,8 +520,8 @@ class Simulator:
             "running": self.running_task.id if self.running_task else None,
             "ready_queue": [t.id for t in self.ready_queue],
             "tasks": task_states,
-            "wait_map": {k: list(v) for k, v in self.wait_map.items()},
-            "timeline": list(self.timeline),
+            "wait_map": self.wait_map.view(),
+            "timeline": self.timeline.view(),
             "algorithm": self.scheduler.__name__,
             "quantum": self.quantum,
             "mutexes": mutex_states
@@ -233,36 +534,158 @@ class Simulator:
         if self.all_tasks_completed() or self.time >= self.tick_limit:
             return False 
 
-        self.queue_changed = False  
-        self._check_arrivals()
-        self._check_suspension_exits() 
-        if self.queue_changed or not self.running_task or self.needs_reschedule:
-            self._schedule()
-            
-        self._tick()
-            
-            # (nova tarefa chegou ou preempção ocorreu)
-        if (self.needs_reschedule or self.queue_changed) and self.algorithm_name.upper() == "PRIOPEnv" and self.alpha > 0:
-                for task in self.ready_queue:
-                    if task is not self.running_task and not task.completed and not task.blocked and not task.io_blocked:
-                        task.dynamic_priority += self.alpha
-        
-        self._handle_task_state_changes()
-       
-        self.queue_changed = False
-        self.needs_reschedule = False
-            
-        if self.debug_mode:
-            snap = self.snapshot()
-            print(f"[Tick {self.time}] EXEC: {snap['running']} | READY: {snap['ready_queue']} | QUANTUM={self.quantum}")
-            for ts in snap['tasks']:
-                print(f"  - {ts['id']}: rem={ts['remaining']} dur={ts['duration']} prio={ts['priority']} waited={ts['waited_ticks']} completed={ts['completed']} waiting_now={ts['waiting_now']}")
-            
-        else:
-            self.render_gantt_terminal(self.timeline)
+        # `checkpoint_every` só vale se a classe suporta checkpoints
+        every = self.checkpoint_every if self.supports_checkpoints else 0
+        if every and not self._checkpoints:
+            self._checkpoints.append(self.checkpoint())
+        self._advance_tick()
+
+        if self.events.enabled:
+            if self.debug_mode:
+                snap = self.snapshot()
+                lines = [f"[Tick {self.time}] EXEC: {snap['running']} | READY: {snap['ready_queue']} | QUANTUM={self.quantum}"]
+                for ts in snap['tasks']:
+                    lines.append(f"  - {ts['id']}: rem={ts['remaining']} dur={ts['duration']} prio={ts['priority']} waited={ts['waited_ticks']} completed={ts['completed']} waiting_now={ts['waiting_now']}")
+                self.events.write("\n".join(lines))
+            else:
+                self.render_gantt_terminal(self.timeline)
         self.time += 1
+        if every and self.time % every == 0 and \
+                (not self._checkpoints or self._checkpoints[-1]["time"] < self.time):
+            self._checkpoints.append(self.checkpoint())
         return True
 
+    def checkpoint(self):
+        """Captura o estado completo da simulação para `restore()`.
+
+        O resultado é um dict serializável (pickle): estado mutável de cada
+        TCB (pela posição em `self.tasks`), fila de prontos em ordem com o
+        contador de envelhecimento, mutexes, mapas de chegada/término,
+        prazos perdidos, timeline e mapas de intervalos (objeto + comprimento/marca, sem
+        cópia) e `random.getstate()` para o sorteio de desempate. Custa
+        O(tarefas + mutexes), independente do número de ticks já simulados.
+        """
+        self._require_checkpoints()
+        position = {task: k for k, task in enumerate(self.tasks)}
+        return {
+            "time": self.time,
+            "tasks": [
+                (t.remaining_time, t.completed, t.executed_ticks, t.executed_count,
+                 t.blocked, t.blocking_mutex_id, t.io_blocked, t.io_remaining,
+                 t.elapsed_time, t.chosen_by_lottery, t.tie_break_random, t.dynamic_priority,
+                 t.queue_level, t.vruntime_base)
+                for t in self.tasks
+            ],
+            "running": None if self.running_task is None else position[self.running_task],
+            "ready_queue": [position[t] for t in self.ready_queue],
+            "aging_epoch": self.ready_queue.aging_epoch,
+            "min_vruntime": getattr(self.ready_queue, "min_vruntime", 0),
+            "mutexes": {m_id: (m.locked, m.owner_id, list(m.waiting_queue))
+                        for m_id, m in self.mutexes.items()},
+            "arrivals_map": dict(self.arrivals_map),
+            "finish_map": dict(self.finish_map),
+            "arrival_cursor": self._arrival_cursor,
+            "completed_count": self._completed_count,
+            "deadline_cursor": self._deadline_cursor,
+            "deadline_misses": dict(self.deadline_misses),
+            "queue_changed": self.queue_changed,
+            "needs_reschedule": self.needs_reschedule,
+            "timeline": (self.timeline, len(self.timeline)),
+            "wait_map": (self.wait_map, self.wait_map.mark()),
+            "suspended_map": (self.suspended_map, self.suspended_map.mark()),
+            "random_state": random.getstate(),
+        }
+
+    def restore(self, checkpoint):
+        """Reinstala um estado capturado por `checkpoint()` desta simulação.
+
+        Os mapas são recriados (objetos novos, O(intervalos)) a partir do
+        armazenamento referenciado; a timeline é truncada no lugar
+        (`Timeline.truncate`, O(ticks descartados), sem copiar o prefixo). O
+        estado do `random` é restaurado, então reexecutar a partir daqui
+        reproduz exatamente a mesma sequência – e os mesmos ticks que as
+        views de snapshots posteriores referenciam.
+        Checkpoints posteriores ao restaurado são descartados.
+        """
+        self._require_checkpoints()
+        for task, state in zip(self.tasks, checkpoint["tasks"]):
+            task.aging_clock = None
+            (task.remaining_time, task.completed, task.executed_ticks, task.executed_count,
+             task.blocked, task.blocking_mutex_id, task.io_blocked, task.io_remaining,
+             task.elapsed_time, task.chosen_by_lottery, task.tie_break_random,
+             task.dynamic_priority, task.queue_level, task.vruntime_base) = state
+
+        # A fila é refeita na mesma ordem: sequências novas preservam a ordem
+        # relativa (desempates) e, com o contador já restaurado, as aptas se
+        # reanexam ao envelhecimento com a mesma prioridade efetiva.
+        self.ready_queue = self._new_ready_queue()
+        self.ready_queue.aging_epoch = checkpoint["aging_epoch"]
+        if hasattr(self.ready_queue, "min_vruntime"):
+            # CFS: nenhuma apta fica abaixo do piso, então reinserir não a reposiciona
+            self.ready_queue.min_vruntime = checkpoint["min_vruntime"]
+        for k in checkpoint["ready_queue"]:
+            self.ready_queue.append(self.tasks[k])
+        running = checkpoint["running"]
+        self.running_task = None if running is None else self.tasks[running]
+
+        self.mutexes = {}
+        for m_id, (locked, owner, waiting) in checkpoint["mutexes"].items():
+            mutex = self.mutexes[m_id] = Mutex(m_id)
+            mutex.locked, mutex.owner_id, mutex.waiting_queue = locked, owner, list(waiting)
+
+        self.arrivals_map = dict(checkpoint["arrivals_map"])
+        self.finish_map = dict(checkpoint["finish_map"])
+        self._arrival_cursor = checkpoint["arrival_cursor"]
+        self._completed_count = checkpoint["completed_count"]
+        self._deadline_cursor = checkpoint["deadline_cursor"]
+        self.deadline_misses = dict(checkpoint["deadline_misses"])
+        self.queue_changed = checkpoint["queue_changed"]
+        self.needs_reschedule = checkpoint["needs_reschedule"]
+
+        timeline, length = checkpoint["timeline"]
+        timeline.truncate(length)
+        self.timeline = timeline
+        interval_map, mark = checkpoint["wait_map"]
+        self.wait_map = interval_map.rewound(mark)
+        interval_map, mark = checkpoint["suspended_map"]
+        self.suspended_map = interval_map.rewound(mark)
+
+        random.setstate(checkpoint["random_state"])
+        self.time = checkpoint["time"]
+        self._checkpoints = [cp for cp in self._checkpoints if cp["time"] <= self.time]
+
+    def _require_checkpoints(self):
+        if not self.supports_checkpoints:
+            raise ValueError(f"{type(self).__name__} não suporta checkpoints nem seek")
+
+    def seek(self, tick):
+        """Leva a simulação ao início de `tick` (após `tick` chamadas a `step()`).
+
+        Para trás (ou quando há checkpoint mais adiantado que o tempo atual)
+        restaura o checkpoint mais próximo <= `tick`; depois reexecuta os
+        ticks restantes com o sink de eventos silenciado. Para antes do fim da
+        simulação se ela terminar primeiro. Retorna o tempo alcançado.
+        """
+        self._require_checkpoints()
+        base = None
+        for cp in self._checkpoints:
+            if cp["time"] > tick:
+                break
+            base = cp
+        if tick < self.time or (base is not None and base["time"] > self.time):
+            if base is None:
+                raise ValueError(f"Nenhum checkpoint anterior ao tick {tick}")
+            self.restore(base)
+
+        events = self.events
+        self.events = make_sink("none")
+        try:
+            while self.time < tick and self.step():
+                pass
+        finally:
+            self.events = events
+        return self.time
+
 
     def _check_arrivals(self):
         """Move tarefas cujo tempo de chegada == tempo atual para a ready_queue.
@@ -270,17 +693,50 @@ class Simulator:
         
         Define flag `queue_changed` se nova tarefa chegou.
         """
-        for task in self.tasks:
-            if task.arrival == self.time and task not in self.ready_queue and not task.completed:
-                self.ready_queue.append(task)
+        if self._next_arrival() != self.time:
+            return
+        pending = self._pending_arrivals
+        while self._arrival_cursor < len(pending) and pending[self._arrival_cursor].arrival == self.time:
+            task = pending[self._arrival_cursor]
+            self._arrival_cursor += 1
+            if task not in self.ready_queue and not task.completed:
+                task.dynamic_priority = task.static_priority
+                self._enqueue(task)
                
                 self.arrivals_map.setdefault(task.id, self.time)
                
-                if hasattr(task, 'static_priority'):
-                    task.dynamic_priority = task.static_priority
-               
                 self.queue_changed = True
-                task.dynamic_priority = task.static_priority
+
+    def _next_arrival(self):
+        """Retorna o próximo instante de chegada >= tempo atual (ou None).
+
+        Avança o cursor sobre chegadas já passadas (ex.: ingresso negativo,
+        que nunca coincide com um tick e portanto nunca é admitido).
+        """
+        pending = self._pending_arrivals
+        while self._arrival_cursor < len(pending) and pending[self._arrival_cursor].arrival < self.time:
+            self._arrival_cursor += 1
+        if self._arrival_cursor < len(pending):
+            return pending[self._arrival_cursor].arrival
+        return None
+
+    def _enqueue(self, task):
+        """Insere na fila de prontos e abre o intervalo de espera da tarefa.
+
+        O intervalo começa no cursor de `wait_map`: se a espera deste tick já
+        foi registrada, a tarefa só passa a esperar no próximo tick.
+        """
+        self.ready_queue.append(task)
+        self.wait_map.open(task.id)
+
+    def _dequeue(self, task):
+        """Remove da fila de prontos e fecha o intervalo de espera da tarefa."""
+        self.ready_queue.remove(task)
+        self.wait_map.close(task.id)
+
+    def _record_waits(self):
+        """Registra a espera de todas as tarefas na fila no tick atual (O(1))."""
+        self.wait_map.cursor = self.time + 1
 
     def _check_suspension_exits(self):
         """Processa desbloqueios de IO e mutex ANTES de rescalonar.
@@ -288,23 +744,32 @@ class Simulator:
         Decrementa contadores de suspensão para tarefas bloqueadas,
         incrementa elapsed_time, processa eventos e marca needs_reschedule.
         TUDO acontece FORA do _tick().
+        Percorre apenas as partições de suspensas da fila (na ordem da fila).
         """
-        for task in list(self.ready_queue):
+        # Suspensões abertas passam a contar o tick atual
+        self.suspended_map.cursor = self.time + 1
+        suspended = list(self.ready_queue.suspended())
+        if self.stats is not None:
+            self.stats.count("queue_scans")
+            self.stats.count("queue_scan_tasks", len(suspended))
+        for task in suspended:
             
             if task.io_blocked:
                 task.elapsed_time += 1
                 task.io_remaining -= 1
-                if task.io_remaining > 0:
-                    self.suspended_map.setdefault(task.id, []).append(self.time)
                 if task.io_remaining <= 0:
                     task.io_blocked = False
                     task.io_remaining = 0
+                    self.suspended_map.close(task.id, self.time)
+                    self.ready_queue.update(task)
                     self.needs_reschedule = True
-                    print(f"[PRE-TICK] Tarefa {task.id} desbloqueada de IO em t={self.time}")
+                    if self.stats is not None:
+                        self.stats.count("io_completions")
+                    if self.events.enabled:
+                        self.events.emit("io_end", self.time, task=task.id)
             
             elif task.blocked:
                 task.elapsed_time += 1
-                self.suspended_map.setdefault(task.id, []).append(self.time)
 
     def _handle_task_state_changes(self):
         """Processa mudanças de estado da tarefa após envelhecimento:
@@ -320,16 +785,21 @@ class Simulator:
         # Verifica conclusão
         if self.running_task.remaining_time <= 0:
             self.running_task.completed = True
-            print(f"Tarefa {self.running_task.id} concluída em t={self.time}")
+            self._completed_count += 1
+            if self.events.enabled:
+                self.events.emit("complete", self.time, task=self.running_task.id)
             self.finish_map[self.running_task.id] = self.time + 1
             self.running_task = None
             self.needs_reschedule = True
             return
         
         # Verifica expiração de quantum
-        if self.running_task.executed_count >= self.quantum:
-            print(f"Tarefa {self.running_task.id} preemptada por quantum em t={self.time}")
-            self.ready_queue.append(self.running_task)
+        if self.running_task.executed_count >= self._quantum_of(self.running_task):
+            if self.events.enabled:
+                self.events.emit("quantum_expired", self.time, task=self.running_task.id)
+            if self._on_quantum_expired:
+                self._on_quantum_expired(self.running_task)
+            self._enqueue(self.running_task)
             self.running_task.executed_count = 0
             self.running_task = None
             self.needs_reschedule = True
@@ -341,55 +811,42 @@ class Simulator:
         SRTF/PRIOP: preemptivos, verificam a cada tick se deve trocar.
         
         Nota: Tarefas bloqueadas (mutex ou IO) não são consideradas para escalonamento.
+        A escolha usa `scheduler.select` sobre a heap da `ReadyQueue` (O(log n))
+        em vez de varrer a fila inteira.
         """
-        
         if not self.running_task or self.running_task.remaining_time <= 0:
-           
-            available = [t for t in self.ready_queue if not t.blocked and not t.io_blocked]
-        
-            if self.algorithm_name.upper() == "PRIOPEnv":
-                self.running_task = self.scheduler(available, current=self.running_task)
-            else:
-                self.running_task = self.scheduler(available)
+            if self.stats is not None:
+                self.stats.count("scheduler_invocations")
+            self.running_task = self.scheduler.select(self.ready_queue)
             if self.running_task:
                 self.running_task.executed_count = 0
-               
-                if self.running_task.elapsed_time == 0:
-                    pass  
-                if self.running_task in self.ready_queue:
-                    self.ready_queue.remove(self.running_task)
-                
-                
-                if self.algorithm_name.upper() == "PRIOPEnv":
+                self._dequeue(self.running_task)
+
+                if self.aging:
                     self.running_task.dynamic_priority = self.running_task.static_priority
-            self.queue_changed = True        
+            self.queue_changed = True
             return
 
-        
         if hasattr(self.scheduler, 'should_preempt'):
-            available = [t for t in self.ready_queue if not t.blocked and not t.io_blocked]
-        
-            if self.algorithm_name.upper() == "PRIOPEnv":
-                candidate = self.scheduler(available, current=self.running_task)
-            else:
-                candidate = self.scheduler(available)
+            if self.stats is not None:
+                self.stats.count("scheduler_invocations")
+            candidate = self.scheduler.select(self.ready_queue)
             if candidate and candidate is not self.running_task:
                 if self.scheduler.should_preempt(self.running_task, candidate):
+                    if self.stats is not None:
+                        self.stats.count("preemptions")
                    
                     if self.running_task not in self.ready_queue and not self.running_task.completed:
-                        self.ready_queue.append(self.running_task)
+                        self._enqueue(self.running_task)
                     self.running_task.executed_count = 0
                    
                     if candidate in self.ready_queue:
-                        self.ready_queue.remove(candidate)
+                        self._dequeue(candidate)
                     candidate.executed_count = 0    
                     self.running_task = candidate
                     
-                    if self.algorithm_name.upper() == "PRIOPEnv":
+                    if self.aging:
                         self.running_task.dynamic_priority = self.running_task.static_priority
-                    
-
-
 
     def _tick(self):
         """Avança um tick de tempo:
@@ -409,10 +866,8 @@ class Simulator:
                 if self.running_task.io_blocked:
                     self.timeline.append(None)
                     if self.running_task not in self.ready_queue and not self.running_task.completed:
-                        self.ready_queue.append(self.running_task)
-                    for task in self.ready_queue:
-                        if not task.completed:
-                            self.wait_map.setdefault(task.id, []).append(self.time)
+                        self._enqueue(self.running_task)
+                    self._record_waits()
                     self.running_task = None
                     return
                 
@@ -423,10 +878,8 @@ class Simulator:
                 if self.running_task.blocked:
                     self.timeline.append(None)
                     if self.running_task not in self.ready_queue and not self.running_task.completed:
-                        self.ready_queue.append(self.running_task)
-                    for task in self.ready_queue:
-                        if not task.completed:
-                            self.wait_map.setdefault(task.id, []).append(self.time)
+                        self._enqueue(self.running_task)
+                    self._record_waits()
                     self.running_task = None
                     return
                 
@@ -443,11 +896,9 @@ class Simulator:
                 if self.running_task.blocked:
                    
                     if self.running_task not in self.ready_queue and not self.running_task.completed:
-                        self.ready_queue.append(self.running_task)
+                        self._enqueue(self.running_task)
                    
-                    for task in self.ready_queue:
-                        if not task.completed:
-                            self.wait_map.setdefault(task.id, []).append(self.time)
+                    self._record_waits()
                     self.running_task = None
                    
                     self._schedule()
@@ -464,11 +915,9 @@ class Simulator:
                 if self.running_task.io_blocked:
                    
                     if self.running_task not in self.ready_queue and not self.running_task.completed:
-                        self.ready_queue.append(self.running_task)
+                        self._enqueue(self.running_task)
                    
-                    for task in self.ready_queue:
-                        if not task.completed:
-                            self.wait_map.setdefault(task.id, []).append(self.time)
+                    self._record_waits()
                     self.running_task = None
                     
                     self._schedule()
@@ -481,10 +930,8 @@ class Simulator:
                         if self.running_task.io_blocked:
                             self.timeline.append(None)
                             if self.running_task not in self.ready_queue and not self.running_task.completed:
-                                self.ready_queue.append(self.running_task)
-                            for task in self.ready_queue:
-                                if not task.completed:
-                                    self.wait_map.setdefault(task.id, []).append(self.time)
+                                self._enqueue(self.running_task)
+                            self._record_waits()
                             self.running_task = None
                             return
                         
@@ -492,10 +939,8 @@ class Simulator:
                         if self.running_task.blocked:
                             self.timeline.append(None)
                             if self.running_task not in self.ready_queue and not self.running_task.completed:
-                                self.ready_queue.append(self.running_task)
-                            for task in self.ready_queue:
-                                if not task.completed:
-                                    self.wait_map.setdefault(task.id, []).append(self.time)
+                                self._enqueue(self.running_task)
+                            self._record_waits()
                             self.running_task = None
                             return
                         
@@ -508,11 +953,8 @@ class Simulator:
                         self.running_task.elapsed_time += 1
                         
                       
-                        task_id = self.running_task.id
-                        self.timeline.append(task_id)
-                        for task in self.ready_queue:
-                            if task is not self.running_task and not task.completed:
-                                self.wait_map.setdefault(task.id, []).append(self.time)
+                        self.timeline.append(self.running_task.id)
+                        self._record_waits()
                   
                     return
                 
@@ -525,22 +967,17 @@ class Simulator:
                 self.running_task.elapsed_time += 1
             
            
-            task_id = self.running_task.id
-            if hasattr(self.running_task, '_tie_break_random') and self.running_task._tie_break_random:
-                task_id = task_id + "L" 
+            lottery = self.running_task.tie_break_random
+            if lottery:
                 self.running_task.chosen_by_lottery = True
             
-            self.timeline.append(task_id)
+            self.timeline.append(self.running_task.id, lottery)
            
-            for task in self.ready_queue:
-                if task is not self.running_task and not task.completed:
-                    self.wait_map.setdefault(task.id, []).append(self.time)
+            self._record_waits()
         else:
             # CPU ociosa
             self.timeline.append(None)
-            for task in self.ready_queue:
-                if not task.completed:
-                    self.wait_map.setdefault(task.id, []).append(self.time)
+            self._record_waits()
 
     def _process_io_events(self, task):
         """Processa eventos de IO para uma tarefa em execução.
@@ -557,9 +994,12 @@ class Simulator:
             # Inicia novo IO
             task.io_blocked = True
             task.io_remaining = pending_io["duration"]
-            self.suspended_map.setdefault(task.id, []).append(self.time)
+            self.suspended_map.open(task.id, self.time)
+            if self.stats is not None:
+                self.stats.count("io_starts")
             # CRITÉRIO 3.2: Formato IO:xx-yy onde yy é duração
-            print(f"[IO START] Tarefa {task.id} iniciando E/S (duração={pending_io['duration']} ticks) em t={self.time}")
+            if self.events.enabled:
+                self.events.emit("io_start", self.time, task=task.id, duration=pending_io["duration"])
 
 
 
@@ -572,6 +1012,8 @@ class Simulator:
         """
         events = task.get_pending_events(task.elapsed_time)
         
+        if events and self.stats is not None:
+            self.stats.count("mutex_events", len(events))
         for event in events:
             event_type = event.get("type")
             mutex_id = event.get("mutex_id")
@@ -582,26 +1024,48 @@ class Simulator:
                     if not mutex.try_lock(task.id):
                         task.blocked = True
                         task.blocking_mutex_id = mutex_id
-                        self.suspended_map.setdefault(task.id, []).append(self.time)
-                        print(f"Tarefa {task.id} bloqueada aguardando M{mutex_id}")
+                        self.suspended_map.open(task.id, self.time)
+                        if self.events.enabled:
+                            self.events.emit("mutex_block", self.time, task=task.id, mutex=mutex_id)
             
             elif event_type == "unlock":
                 mutex = self.mutexes.get(mutex_id)
                 if mutex:
                     next_task_id = mutex.unlock(task.id)
-                    print(f"Tarefa {task.id} liberou M{mutex_id}")
+                    if self.events.enabled:
+                        self.events.emit("mutex_release", self.time, task=task.id, mutex=mutex_id)
                     if next_task_id:
-                        for t in self.tasks:
-                            if t.id == next_task_id and t.blocked and t.blocking_mutex_id == mutex_id:
-                                t.blocked = False
-                                t.blocking_mutex_id = None
-                                self.needs_reschedule = True
-                                print(f"[UNLOCK] Tarefa {next_task_id} desbloqueada - adquiriu M{mutex_id}")
-                                break
+                        t = self.task_by_id.get(next_task_id)
+                        if t is not None and t.blocked and t.blocking_mutex_id == mutex_id:
+                            t.blocked = False
+                            t.blocking_mutex_id = None
+                            # desbloqueio após a contabilização deste tick
+                            self.suspended_map.close(t.id, self.time + 1)
+                            self._wake(t)
+                            if self.events.enabled:
+                                self.events.emit("mutex_acquire", self.time, task=next_task_id, mutex=mutex_id)
+
+    def _wake(self, task):
+        """Devolve à partição apta da fila uma tarefa desbloqueada por mutex.
 
+        Ponto de extensão do `SMPSimulator`, em que a tarefa pode estar na
+        fila de outro núcleo.
+        """
+        self.ready_queue.update(task)
+        self.needs_reschedule = True
+
+    def metrics(self):
+        """Métricas de escalonamento (turnaround, espera, resposta, utilização...).
+
+        Calculadas por `metrics.compute_metrics` com NumPy, importado só aqui
+        para que o simulador não dependa dele. Ver `metrics.py`.
+        """
+        from metrics import compute_metrics
+        return compute_metrics(self)
 
     def all_tasks_completed(self):
         """Retorna True se todas as tarefas marcaram `completed=True`.
-        Facilita leitura do loop principal.
+        Facilita leitura do loop principal. Usa contador mantido em
+        `_handle_task_state_changes` para não varrer todas as tarefas a cada tick.
         """
-        return all(task.completed for task in self.tasks)
+        return self._completed_count == len(self.tasks)
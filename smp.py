@@ -0,0 +1,292 @@
+"""smp.py
+=========
+Modo multiprocessador simétrico (SMP): `SMPSimulator` simula N núcleos, cada
+um com sua tarefa corrente e sua fila de prontos, com migração de tarefas
+entre núcleos.
+
+Decisões de design:
+-------------------
+1. Cada núcleo (`Core`) tem `running_task`, `ready_queue` (`ReadyQueue` com a
+   chave do algoritmo) e `timeline` próprios. Tarefas, mutexes, `wait_map`,
+   `suspended_map` e mapas de chegada/término são compartilhados: uma tarefa
+   está em no máximo um núcleo por vez.
+2. As fases do `Simulator` (`_schedule`, `_tick`, `_check_suspension_exits`,
+   `_handle_task_state_changes`) trabalham sobre `self.running_task`,
+   `self.ready_queue` e `self.timeline`. `_enter(core)` instala nesses
+   atributos o estado do núcleo e `_leave(core)` o recolhe, então toda
+   política (FIFO, SRTF, PRIOP, PRIOPEnv, RR, MLFQ – inclusive o `_boost` –,
+   CFS e EDF) roda por núcleo com exatamente a mesma semântica do
+   uniprocessador – com 1 núcleo o resultado é idêntico ao do `Simulator`.
+3. O tick percorre os núcleos em fases: prazos vencidos, chegadas,
+   desbloqueios, balanceamento, escalonamento, execução e mudanças de
+   estado. Na execução, o cursor de `wait_map` volta ao tick corrente antes
+   de cada núcleo (o `_record_waits` de um núcleo não pode antecipar o
+   registro de espera dos seguintes) e só depois de todos avança para o
+   próximo tick. Com 2+ núcleos toda timeline de núcleo ganha exatamente
+   uma entrada por tick (o tick em que uma tarefa bloqueia em mutex e outra
+   é despachada, que `_tick` não registra, vira ocioso), então as timelines
+   ficam alinhadas com `time`. Com 1 núcleo esse preenchimento é omitido,
+   como no `Simulator` (item 2; verificado por `bench.py --check-smp`).
+4. Chegadas vão para o núcleo menos carregado (carga = aptas + corrente;
+   empate no menor índice).
+5. Migração: um núcleo ocioso e sem aptas rouba (work stealing) a próxima
+   apta do núcleo mais carregado que tenha trabalho sobrando; e a cada
+   `balance_interval` ticks aptas migram do mais carregado para o menos
+   carregado enquanto a diferença de carga for >= 2. Tarefas suspensas (mutex
+   ou E/S) não migram: voltam a ser aptas no núcleo em que bloquearam.
+6. Custo de migração (`migration_cost`): ao despachar uma tarefa que
+   executou por último em outro núcleo, o núcleo fica `migration_cost` ticks
+   sem progresso (ocioso na timeline, contado em `Core.migration_ticks`)
+   antes de a tarefa voltar a executar.
+7. Só o motor por tick: `_quiet_ticks` devolve 0, então `engine="event"`
+   executa tick a tick. Checkpoints não são suportados
+   (`supports_checkpoints = False`: `checkpoint`/`restore`/`seek` levantam
+   ValueError e `checkpoint_every` é ignorado).
+"""
+
+from simulator import Simulator
+
+
+class Core:
+    """Estado de um núcleo: tarefa corrente, fila de prontos e timeline."""
+
+    def __init__(self, index, ready_queue, timeline):
+        self.index = index
+        self.running_task = None
+        self.ready_queue = ready_queue
+        self.timeline = timeline
+        self.queue_changed = False
+        self.needs_reschedule = False
+        self.stall = 0            # ticks restantes do custo de migração
+        self.migrations = 0       # tarefas recebidas de outros núcleos
+        self.migration_ticks = 0  # ticks parados pagando custo de migração
+
+    def load(self):
+        """Tarefas aptas na fila mais a corrente."""
+        return self.ready_queue.runnable_count() + (self.running_task is not None)
+
+    def __repr__(self):
+        running = self.running_task.id if self.running_task else None
+        return f"Core({self.index}, running={running}, ready={len(self.ready_queue)})"
+
+
+class SMPSimulator(Simulator):
+    """`Simulator` com `config["cpus"]` núcleos.
+
+    Sem checkpoints: o estado por núcleo (filas, timelines, `_last_core`) não
+    entra em `checkpoint()`, então `checkpoint`/`restore`/`seek` levantam
+    ValueError e `step()` ignora `checkpoint_every`.
+
+    Chaves adicionais de `config` (opcionais):
+        'cpus': <int>,             # número de núcleos (default 2)
+        'migration_cost': <int>,   # ticks parados ao despachar tarefa
+                                   # migrada (default 0)
+        'balance_interval': <int>, # período do balanceamento (default 8;
+                                   # 0 = só work stealing)
+    """
+
+    supports_checkpoints = False
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.cpus = config.get("cpus", 2)
+        if self.cpus < 1:
+            raise ValueError(f"Número de núcleos inválido: {self.cpus}")
+        self.migration_cost = config.get("migration_cost", 0)
+        self.balance_interval = config.get("balance_interval", 8)
+        self._new_cores()
+
+    def _new_cores(self):
+        self.cores = [
+            Core(k, self._new_ready_queue(), self._new_timeline())
+            for k in range(self.cpus)
+        ]
+        self.timelines = [core.timeline for core in self.cores]
+        self._last_core = {}  # tarefa -> índice do núcleo em que executou por último
+        self._enter(self.cores[0])
+
+    def _enter(self, core):
+        """Instala o estado de `core` nos atributos usados pelas fases."""
+        self.running_task = core.running_task
+        self.ready_queue = core.ready_queue
+        self.timeline = core.timeline
+        self.queue_changed = core.queue_changed
+        self.needs_reschedule = core.needs_reschedule
+
+    def _leave(self, core):
+        """Recolhe para `core` o estado deixado pelas fases."""
+        core.running_task = self.running_task
+        core.queue_changed = self.queue_changed
+        core.needs_reschedule = self.needs_reschedule
+
+    def _advance_tick(self):
+        """Processa um tick em todos os núcleos (ver item 3 do módulo)."""
+        cores = self.cores
+        for core in cores:
+            core.queue_changed = False
+
+        self._check_deadlines()
+
+        if self.boost_interval and self.time % self.boost_interval == 0 and self.time:
+            for core in cores:
+                self._enter(core)
+                self._boost()
+                self._leave(core)
+
+        self._check_arrivals()
+
+        for core in cores:
+            self._enter(core)
+            self._check_suspension_exits()
+            self._leave(core)
+
+        self._balance()
+
+        for core in cores:
+            if core.stall:
+                continue
+            self._enter(core)
+            previous = self.running_task
+            if self.queue_changed or not self.running_task or self.needs_reschedule:
+                self._schedule()
+            task = self.running_task
+            if task is not None and task is not previous and self.migration_cost and \
+                    self._last_core.get(task, core.index) != core.index:
+                core.stall = self.migration_cost
+            self._leave(core)
+
+        wait_map = self.wait_map
+        for core in cores:
+            # cada núcleo vê o cursor de espera como no início do tick
+            wait_map.cursor = self.time
+            self._enter(core)
+            if core.stall:
+                core.stall -= 1
+                core.migration_ticks += 1
+                self.timeline.append(None)
+            else:
+                length = len(self.timeline)
+                self._tick()
+                if len(self.timeline) == length and len(cores) > 1:
+                    # bloqueio em mutex seguido de novo despacho no mesmo tick:
+                    # `_tick` não registra o tick; o núcleo fica ocioso nele
+                    # (com 1 núcleo mantém a timeline do `Simulator`)
+                    self.timeline.append(None)
+                if self.running_task is not None:
+                    self._last_core[self.running_task] = core.index
+            self._leave(core)
+
+        wait_map.cursor = self.time + 1
+
+        for core in cores:
+            self._enter(core)
+            if (self.needs_reschedule or self.queue_changed) and self.aging and self.alpha > 0:
+                self._age_ready_tasks()
+            if not core.stall:
+                self._handle_task_state_changes()
+            self.queue_changed = False
+            self.needs_reschedule = False
+            self._leave(core)
+
+        self._enter(cores[0])
+
+    def _quiet_ticks(self):
+        return 0
+
+    def _check_arrivals(self):
+        """Distribui as tarefas que chegam neste tick pelos núcleos menos carregados."""
+        if self._next_arrival() != self.time:
+            return
+        pending = self._pending_arrivals
+        while self._arrival_cursor < len(pending) and pending[self._arrival_cursor].arrival == self.time:
+            task = pending[self._arrival_cursor]
+            self._arrival_cursor += 1
+            if task.completed or any(task in core.ready_queue for core in self.cores):
+                continue
+            core = min(self.cores, key=Core.load)
+            task.dynamic_priority = task.static_priority
+            core.ready_queue.append(task)
+            self.wait_map.open(task.id)
+            self.arrivals_map.setdefault(task.id, self.time)
+            core.queue_changed = True
+
+    def _migrate(self, task, source, target):
+        """Move uma tarefa apta da fila de `source` para o fim da de `target`.
+
+        O intervalo de espera em `wait_map` continua aberto: a tarefa só
+        muda de fila. Com envelhecimento, a prioridade efetiva é preservada.
+        """
+        source.ready_queue.remove(task)
+        target.ready_queue.append(task)
+        target.queue_changed = True
+        target.migrations += 1
+        if self.stats is not None:
+            self.stats.count("migrations")
+        if self.events.enabled:
+            self.events.emit("migrate", self.time, task=task.id, source=source.index, target=target.index)
+
+    def _balance(self):
+        """Work stealing dos núcleos ociosos e balanceamento periódico."""
+        cores = self.cores
+        if len(cores) < 2:
+            return
+        for thief in cores:
+            if thief.running_task is not None or thief.stall or thief.ready_queue.has_runnable():
+                continue
+            victim = max(cores, key=Core.load)
+            spare = victim.ready_queue.runnable_count()
+            if victim.running_task is None:
+                spare -= 1
+            if spare > 0:
+                self._migrate(victim.ready_queue.peek(), victim, thief)
+
+        if self.balance_interval and self.time % self.balance_interval == 0:
+            while True:
+                busiest = max(cores, key=Core.load)
+                idlest = min(cores, key=Core.load)
+                if busiest.load() - idlest.load() < 2 or not busiest.ready_queue.has_runnable():
+                    break
+                self._migrate(busiest.ready_queue.peek(), busiest, idlest)
+
+    def run_debug(self):
+        super().run_debug()
+        self._new_cores()
+
+    def _wake(self, task):
+        """Desbloqueio por mutex: a tarefa pode estar na fila de outro núcleo."""
+        for core in self.cores:
+            if core.ready_queue is not self.ready_queue and task in core.ready_queue:
+                core.ready_queue.update(task)
+                core.needs_reschedule = True
+                return
+        super()._wake(task)
+
+    def render_gantt_terminal(self, timeline, wait_map=None):
+        """Gantt em texto de cada núcleo (o argumento `timeline` é ignorado)."""
+        last = self.cores[-1]
+        for core in self.cores:
+            self.events.write(f"\nCPU {core.index}:")
+            super().render_gantt_terminal(core.timeline, wait_map if core is last else None)
+
+    def snapshot(self):
+        """Como `Simulator.snapshot`, com `running`/`ready_queue` por núcleo.
+
+        `running` e `ready_queue` viram listas por núcleo, `timelines` traz a
+        visão da timeline de cada núcleo e `cores` o estado de migração.
+        """
+        snap = super().snapshot()
+        queued = set()
+        for core in self.cores:
+            queued.update(core.ready_queue)
+        running = {core.running_task for core in self.cores}
+        for state, task in zip(snap["tasks"], self.tasks):
+            state["waiting_now"] = task in queued and task not in running and not task.completed
+        snap["running"] = [core.running_task.id if core.running_task else None for core in self.cores]
+        snap["ready_queue"] = [[t.id for t in core.ready_queue] for core in self.cores]
+        snap["timelines"] = [core.timeline.view() for core in self.cores]
+        snap["cores"] = [
+            {"index": core.index, "stall": core.stall, "migrations": core.migrations,
+             "migration_ticks": core.migration_ticks}
+            for core in self.cores
+        ]
+        return snap
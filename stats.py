@@ -0,0 +1,111 @@
+"""stats.py
+===========
+Instrumentação opcional do laço de simulação (`Simulator.stats`).
+
+Mede, por fase do tick, número de chamadas e tempo acumulado em
+`time.perf_counter_ns`:
+- arrivals          -> `_check_arrivals`
+- suspension_exits  -> `_check_suspension_exits`
+- schedule          -> `_schedule` (inclui as chamadas feitas de dentro de `_tick`)
+- tick              -> `_tick` (inclusivo: contém os `_schedule` aninhados)
+- aging             -> `_age_ready_tasks` (só quando há envelhecimento)
+- state_changes     -> `_handle_task_state_changes`
+- fast_forward      -> `_fast_forward` (motor por eventos)
+
+E contadores de eventos (`COUNTERS`): invocações do escalonador, preempções,
+varreduras das partições de suspensas (e tarefas visitadas), eventos de mutex
+processados, inícios/fins de E/S, ticks aplicados em salto, migrações entre
+núcleos (modo SMP, `smp.py`) e prazos perdidos.
+
+Custo quando desligada: os tempos são medidos substituindo, na instância, os
+métodos das fases por versões cronometradas (`instrument`), então com
+`stats=None` o laço chama os métodos originais sem nenhum teste extra. Os
+contadores ficam em pontos raros (dentro dos ramos de evento) protegidos por
+`if self.stats is not None`.
+"""
+
+from time import perf_counter_ns
+
+
+PHASES = {
+    "arrivals": "_check_arrivals",
+    "suspension_exits": "_check_suspension_exits",
+    "schedule": "_schedule",
+    "tick": "_tick",
+    "aging": "_age_ready_tasks",
+    "state_changes": "_handle_task_state_changes",
+    "fast_forward": "_fast_forward",
+}
+
+COUNTERS = (
+    "scheduler_invocations",
+    "preemptions",
+    "queue_scans",
+    "queue_scan_tasks",
+    "mutex_events",
+    "io_starts",
+    "io_completions",
+    "fast_forward_ticks",
+    "migrations",
+    "deadline_misses",
+)
+
+
+class SimulationStats:
+    """Chamadas e tempo (ns) por fase, mais contadores de eventos."""
+
+    def __init__(self):
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.ns = dict.fromkeys(PHASES, 0)
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def timed(self, phase, method):
+        """Envolve `method` acumulando chamadas e tempo na fase `phase`."""
+        calls, ns = self.calls, self.ns
+
+        def wrapper(*args):
+            start = perf_counter_ns()
+            try:
+                return method(*args)
+            finally:
+                ns[phase] += perf_counter_ns() - start
+                calls[phase] += 1
+
+        wrapper.__wrapped__ = method
+        return wrapper
+
+    def instrument(self, sim):
+        """Substitui na instância `sim` os métodos das fases por versões cronometradas."""
+        for phase, name in PHASES.items():
+            method = getattr(sim, name)
+            if hasattr(method, "__wrapped__"):  # já instrumentado
+                method = method.__wrapped__
+            setattr(sim, name, self.timed(phase, method))
+
+    def reset(self):
+        # Zera no lugar: os wrappers de `timed` guardam referências a estes dicts
+        for phase in PHASES:
+            self.calls[phase] = self.ns[phase] = 0
+        for name in self.counters:
+            self.counters[name] = 0
+
+    def as_dict(self):
+        return {
+            "phases": {p: {"calls": self.calls[p], "ns": self.ns[p]} for p in PHASES},
+            "counters": dict(self.counters),
+        }
+
+    def format_report(self):
+        lines = ["\nEstatísticas do laço de simulação:"]
+        lines.append(f"{'fase':<18}{'chamadas':>10}{'total_ms':>11}{'média_us':>11}")
+        for phase in PHASES:
+            calls, ns = self.calls[phase], self.ns[phase]
+            mean = ns / calls / 1000 if calls else 0.0
+            lines.append(f"{phase:<18}{calls:>10}{ns / 1e6:>11.3f}{mean:>11.2f}")
+        lines.append("\nContadores:")
+        for name in COUNTERS:
+            lines.append(f"{name:<22}{self.counters[name]:>10}")
+        return "\n".join(lines)
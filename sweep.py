@@ -0,0 +1,163 @@
+"""sweep.py
+===========
+Varredura de parâmetros: executa a mesma carga de tarefas sob vários
+algoritmos × quantum × alpha e reúne as métricas de cada execução numa tabela.
+
+Uso (CLI, subcomando de `main.py`):
+    python main.py sweep config.txt --algorithms FIFO,SRTF,PRIOP,PRIOPEnv \\
+        --quantum 1,2,4,8 --alpha 0,1,2 --workers 8 --format csv --out sweep.csv
+
+Uso (API):
+    from sweep import sweep
+    rows = sweep("config.txt", quanta=[2, 4], alphas=[0, 1])
+
+Decisões de design:
+- A configuração é lida uma única vez no processo principal. As tarefas são
+  enviadas a cada processo do pool uma só vez (via `initializer`); cada job
+  carrega apenas a tupla (algoritmo, quantum, alpha).
+- `alpha` só afeta PRIOPEnv: para os demais algoritmos a grade usa apenas
+  alpha=0, evitando execuções duplicadas.
+- Cada execução usa sink de eventos silencioso (nada vai para stdout), o
+  motor por eventos por padrão e `random.seed(seed)` antes de rodar, então o
+  sorteio de desempate do PRIOPEnv é reproduzível.
+- Jobs são distribuídos com `chunksize` proporcional ao número de jobs por
+  processo: poucos envios pelo pipe e escala próxima de linear com os núcleos.
+- `workers=1` roda tudo no próprio processo (útil para depuração/perfil).
+- As colunas de métricas são o resumo de `metrics.compute_metrics`
+  (`SUMMARY_FIELDS`); `wall_time_s` mede só a simulação.
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config_loader import load_config
+from metrics import SUMMARY_FIELDS, clean, compute_metrics
+from simulator import Simulator, ENGINES
+
+
+ALGORITHMS = ("FIFO", "SRTF", "PRIOP", "PRIOPEnv", "RR", "MLFQ", "CFS", "EDF")
+
+COLUMNS = ("algorithm", "quantum", "alpha") + SUMMARY_FIELDS + ("wall_time_s",)
+
+# Estado de cada processo do pool (preenchido por `_init_worker`)
+_WORKLOAD = None
+
+
+def _init_worker(workload):
+    global _WORKLOAD
+    _WORKLOAD = workload
+
+
+def run_one(job, workload=None):
+    """Executa uma combinação (algoritmo, quantum, alpha) e devolve a linha da tabela."""
+    algorithm, quantum, alpha = job
+    workload = workload if workload is not None else _WORKLOAD
+    config = dict(workload["base"], algorithm=algorithm, quantum=quantum, alpha=alpha,
+                  tasks=workload["tasks"], events="none")
+    random.seed(workload["seed"])
+    started = time.perf_counter()
+    sim = Simulator(config)
+    sim.run()
+    row = {"algorithm": algorithm, "quantum": quantum, "alpha": alpha}
+    row["wall_time_s"] = time.perf_counter() - started
+    row.update(compute_metrics(sim)["summary"])
+    return row
+
+
+def build_grid(algorithms=ALGORITHMS, quanta=(None,), alphas=(None,), default_quantum=None, default_alpha=0):
+    """Produto algoritmo × quantum × alpha (alpha só varia para PRIOPEnv)."""
+    quanta = [default_quantum if q is None else q for q in quanta]
+    alphas = [default_alpha if a is None else a for a in alphas]
+    jobs = []
+    for algorithm in algorithms:
+        aging = algorithm.upper() == "PRIOPENV"
+        for quantum in quanta:
+            for alpha in (alphas if aging else [0]):
+                jobs.append((algorithm, quantum, alpha))
+    return jobs
+
+
+def sweep(config, algorithms=ALGORITHMS, quanta=None, alphas=None,
+          workers=None, engine="event", seed=0):
+    """Executa a varredura e devolve a lista de linhas (dicts com `COLUMNS`).
+
+    Args:
+        config: caminho do arquivo de configuração ou dict já carregado
+        algorithms: algoritmos a comparar
+        quanta / alphas: valores da grade (None = valor da configuração)
+        workers: processos do pool (None = os.cpu_count(); 1 = sem pool)
+        engine: motor de simulação ("event" por padrão)
+        seed: semente do sorteio de desempate, igual em todas as execuções
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Motor de simulação desconhecido: {engine}")
+    if isinstance(config, str):
+        config = load_config(config, cache=True)
+    base = {k: v for k, v in config.items() if k not in ("tasks", "events")}
+    base["engine"] = engine
+    workload = {"base": base, "tasks": config["tasks"], "seed": seed}
+    jobs = build_grid(algorithms, quanta or (None,), alphas or (None,),
+                      config.get("quantum"), config.get("alpha", 0))
+
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(jobs)) or 1
+    if workers == 1:
+        return [run_one(job, workload) for job in jobs]
+
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(workload,)) as pool:
+        return list(pool.map(run_one, jobs, chunksize=chunksize))
+
+
+def write_csv(rows, stream):
+    writer = csv.DictWriter(stream, fieldnames=COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def write_json(rows, stream):
+    rows = [{k: clean(v) for k, v in row.items()} for row in rows]
+    json.dump(rows, stream, indent=2, allow_nan=False)
+    stream.write("\n")
+
+
+def _int_list(text):
+    return [int(v) for v in text.split(",") if v.strip()]
+
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="main.py sweep", description="Varredura algoritmo × quantum × alpha em paralelo")
+    p.add_argument("config", nargs="?", default="sample_config.txt", help="Caminho do arquivo de configuração")
+    p.add_argument("--algorithms", default=",".join(ALGORITHMS), help="Lista separada por vírgula (default: todos)")
+    p.add_argument("--quantum", type=_int_list, default=None, help="Valores de quantum, ex: 1,2,4 (default: do arquivo)")
+    p.add_argument("--alpha", type=_int_list, default=None, help="Valores de alpha para PRIOPEnv, ex: 0,1,2 (default: do arquivo)")
+    p.add_argument("--workers", type=int, default=None, help="Número de processos (default: núcleos disponíveis)")
+    p.add_argument("--engine", choices=ENGINES, default="event", help="Motor de simulação")
+    p.add_argument("--seed", type=int, default=0, help="Semente do sorteio de desempate")
+    p.add_argument("--format", choices=("csv", "json"), default="csv", help="Formato da tabela")
+    p.add_argument("--out", default="-", help="Arquivo de saída ('-' = stdout)")
+    return p
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    algorithms = [a.strip() for a in args.algorithms.split(",") if a.strip()]
+    rows = sweep(args.config, algorithms, args.quantum, args.alpha,
+                 workers=args.workers, engine=args.engine, seed=args.seed)
+    writer = write_csv if args.format == "csv" else write_json
+    if args.out == "-":
+        writer(rows, sys.stdout)
+    else:
+        with open(args.out, "w", newline="") as f:
+            writer(rows, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,9 @@ Justificativa de atributos:
 - `arrival`: tick de criação/ingresso no sistema (usado para liberar a tarefa).
 - `duration`: tempo total necessário de CPU (base para SRTF e cálculo de restante).
 - `priority`: valor numérico, maior significa maior prioridade na política atual.
+- `deadline`: prazo relativo ao ingresso (opcional, None = sem prazo);
+  `absolute_deadline` = `arrival + deadline`, tick até o qual a tarefa deve
+  terminar (chave do EDF).
 - `events`: lista de dicionários com eventos de mutex {type, mutex_id, time}
     - type: "lock" ou "unlock"
     - mutex_id: número do mutex
@@ -22,18 +25,62 @@ Justificativa de atributos:
 - `io_blocked`: bool - se tarefa está bloqueada em operação de E/S
 - `io_remaining`: tempo restante da operação de E/S atual
 - `elapsed_time`: tempo de execução relativo ao início da tarefa (para rastrear eventos)
+- `queue_level`: nível da tarefa no MLFQ (0 = mais alto; demais políticas usam 0)
+- `vruntime_base`: parte do vruntime (CFS) que não vem da execução – os
+  ajustes de posicionamento na fila (ver `scheduler.cfs_vruntime`)
+
+Eventos pré-indexados: na construção, `events` e `io_events` são compilados em
+dicts tempo relativo -> tupla de eventos, e os instantes com algum evento são
+guardados ordenados com um cursor que só avança. Assim `get_pending_*` é O(1)
+e `next_event_at` é O(1) amortizado, independente do número de eventos.
+As listas originais continuam disponíveis para exibição (não devem ser
+alteradas após a construção).
+
+Layout de memória: a classe declara `__slots__`, eliminando o `__dict__` por
+instância (menos memória e acesso a atributo mais rápido no laço quente do
+simulador). Como consequência, atributos não listados não podem ser criados
+dinamicamente – todo estado da tarefa deve ser declarado aqui, inclusive
+`tie_break_random` (escolha por sorteio no PRIOPEnv, antes um atributo ad hoc).
+
+Envelhecimento preguiçoso (PRIOPEnv): enquanto a tarefa está apta na fila de
+prontos, `aging_clock` aponta para a fila, que mantém um contador global
+`aging_epoch` (soma de todos os incrementos alpha aplicados). A tarefa guarda
+apenas `dynamic_priority_base`, a prioridade relativa ao contador, e
+`dynamic_priority` é calculada sob demanda (`base + aging_epoch`). Envelhecer
+todas as aptas vira incrementar o contador (O(1)), e como todas sobem o mesmo
+valor a ordem relativa – e a heap indexada pela base – continua válida.
+Fora da fila (`aging_clock is None`) a base é a própria prioridade dinâmica.
 """
 
+from bisect import bisect_left
+
+
 class TaskControlBlock:
-    def __init__(self, id_, color, arrival, duration, priority, events, io_events=None):
+    __slots__ = (
+        "id", "color", "arrival", "duration", "deadline", "absolute_deadline",
+        "priority", "static_priority", "dynamic_priority_base", "aging_clock",
+        "events", "io_events",
+        "remaining_time", "completed", "executed_ticks", "executed_count",
+        "blocked", "blocking_mutex_id",
+        "io_blocked", "io_remaining",
+        "elapsed_time",
+        "chosen_by_lottery", "tie_break_random",
+        "queue_level", "vruntime_base",
+        "_mutex_at", "_io_at", "_event_times", "_event_cursor",
+    )
+
+    def __init__(self, id_, color, arrival, duration, priority, events, io_events=None, deadline=None):
         self.id = id_
         self.color = color
         self.arrival = arrival
         self.duration = duration
+        self.deadline = deadline
+        self.absolute_deadline = None if deadline is None else arrival + deadline
         # Prioridade estática (pe) e dinâmica (pd)
         self.priority = priority  # manter compatibilidade: pe
         self.static_priority = priority
-        self.dynamic_priority = priority
+        self.aging_clock = None
+        self.dynamic_priority_base = priority
         
         self.events = events if events else []
         
@@ -56,7 +103,71 @@ class TaskControlBlock:
         self.elapsed_time = 0
         
         self.chosen_by_lottery = False
-    
+        self.tie_break_random = False  # escolhida por sorteio no último desempate
+        self.queue_level = 0  # nível no MLFQ (0 = mais alto)
+        self.vruntime_base = 0  # CFS: vruntime = base + executed_ticks * passo do peso
+
+        self._index_events()
+
+    @property
+    def dynamic_priority(self):
+        """Prioridade dinâmica efetiva (pd), incluindo o envelhecimento acumulado."""
+        clock = self.aging_clock
+        if clock is None:
+            return self.dynamic_priority_base
+        return self.dynamic_priority_base + clock.aging_epoch
+
+    @dynamic_priority.setter
+    def dynamic_priority(self, value):
+        clock = self.aging_clock
+        self.dynamic_priority_base = value if clock is None else value - clock.aging_epoch
+
+    def attach_aging(self, clock):
+        """Passa a envelhecer com `clock` (preserva a prioridade efetiva)."""
+        if self.aging_clock is not clock:
+            value = self.dynamic_priority
+            self.aging_clock = clock
+            self.dynamic_priority = value
+
+    def detach_aging(self):
+        """Congela a prioridade efetiva atual e para de envelhecer."""
+        if self.aging_clock is not None:
+            value = self.dynamic_priority
+            self.aging_clock = None
+            self.dynamic_priority_base = value
+
+    def _index_events(self):
+        """Compila as listas de eventos em tabelas indexadas por tempo relativo."""
+        mutex_at = {}
+        for event in self.events:
+            mutex_at.setdefault(event.get("time"), []).append(event)
+        io_at = {}
+        for io_event in self.io_events:
+            io_at.setdefault(io_event.get("time"), []).append(io_event)
+
+        self._mutex_at = {t: tuple(evs) for t, evs in mutex_at.items()}
+        self._io_at = {t: tuple(evs) for t, evs in io_at.items()}
+        self._event_times = sorted(set(self._mutex_at) | set(self._io_at))
+        self._event_cursor = 0
+
+    def next_event_at(self, elapsed):
+        """Retorna o menor tempo relativo >= `elapsed` com evento de mutex ou IO.
+
+        O cursor só avança enquanto `elapsed` cresce; se o tempo voltar
+        (ex.: reinício do modo debug) ele é reposicionado por busca binária.
+
+        Returns:
+            int or None: próximo instante com evento, ou None se não houver
+        """
+        times = self._event_times
+        i = self._event_cursor
+        if i and times[i - 1] >= elapsed:
+            i = bisect_left(times, elapsed)
+        while i < len(times) and times[i] < elapsed:
+            i += 1
+        self._event_cursor = i
+        return times[i] if i < len(times) else None
+
     def get_pending_events(self, current_time):
         """Retorna eventos de mutex que devem acontecer no tempo atual.
         
@@ -64,9 +175,9 @@ class TaskControlBlock:
             current_time (int): tempo decorrido desde o início da execução
             
         Returns:
-            list: eventos que acontecem neste tick
+            tuple: eventos que acontecem neste tick (vazia se nenhum)
         """
-        return [e for e in self.events if e.get("time") == current_time]
+        return self._mutex_at.get(current_time, ())
     
     def get_pending_io(self, current_time):
         """Retorna PRIMEIRO evento de IO que deve iniciar no tempo atual.
@@ -79,10 +190,8 @@ class TaskControlBlock:
         Returns:
             dict or None: evento de IO que inicia neste tick, ou None
         """
-        for io_event in self.io_events:
-            if io_event.get("time") == current_time:
-                return io_event
-        return None
+        io_events = self._io_at.get(current_time)
+        return io_events[0] if io_events else None
     
     def get_pending_ios(self, current_time):
         """Retorna TODOS os eventos de IO que devem iniciar no tempo atual.
@@ -93,9 +202,9 @@ class TaskControlBlock:
             current_time (int): tempo decorrido desde o início da execução
             
         Returns:
-            list: eventos de IO que iniciam neste tick, em ordem
+            tuple: eventos de IO que iniciam neste tick, em ordem
         """
-        return [io_event for io_event in self.io_events if io_event.get("time") == current_time]
+        return self._io_at.get(current_time, ())
     
     def __repr__(self):
         status = "BLOCKED" if self.blocked else "IO_BLOCKED" if self.io_blocked else "RUNNING" if not self.completed else "DONE"
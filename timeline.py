@@ -0,0 +1,403 @@
+"""timeline.py
+==============
+Linha do tempo compacta da simulação.
+
+A `timeline` original era uma lista de strings por tick, com sufixo "L" quando
+a tarefa foi escolhida por sorteio (`task_id + "L"`), depois removido pelo
+renderizador com regex. Aqui cada tick ocupa um inteiro:
+
+- ids de tarefa internados: `task_ids[i]` é o id da tarefa de índice `i`;
+- `slots`: `array('i')` com o índice da tarefa por tick, ou `IDLE` (-1);
+- `lottery`: bitmask paralelo (1 bit por tick) marcando ticks decididos por sorteio;
+- `run_length=True`: armazena apenas corridas (valor, sorteio, fim), ideal
+  para o motor por eventos, em que um salto vira uma única corrida.
+
+Para consumidores existentes a classe se comporta como a lista antiga
+(somente leitura): `len`, indexação, fatias e iteração devolvem o id (com
+"L" se sorteado) ou None.
+
+Compartilhamento estrutural: durante a simulação a timeline só cresce
+(ticks já gravados nunca mudam), então `view()` devolve em O(1) um
+`TimelineView` – o prefixo com o comprimento atual, lendo o mesmo
+armazenamento. Snapshots do modo debug guardam views em vez de cópias. A
+única remoção é `truncate` (restauração de checkpoint); views mais longas
+que a timeline truncada ficam ilegíveis até ela crescer de novo. As leituras de uma view param no comprimento
+dela (bisect nas corridas), sem percorrer o resto da timeline.
+
+No modo denso as corridas (`runs`, `run_arrays`) são derivadas com NumPy
+(`np.flatnonzero` sobre as trocas de índice/sorteio), sem laço Python por
+tick. NumPy só é importado nessa leitura: o laço de simulação não depende dele.
+"""
+
+from array import array
+from bisect import bisect_right
+from itertools import islice
+
+IDLE = -1
+
+
+def _dense_runs(slots, lottery, length):
+    """(índices, fins, sorteios) das corridas dos primeiros `length` ticks densos.
+
+    `slots` é o `array('i')` por tick e `lottery` o bitmask paralelo. Devolve
+    listas (cópias): nenhum buffer de `slots` fica exportado, então a
+    timeline pode continuar crescendo.
+    """
+    if not length:
+        return [], [], []
+    import numpy as np
+    ticks = np.frombuffer(slots, dtype=np.intc, count=length)
+    bits = np.unpackbits(np.frombuffer(lottery, dtype=np.uint8, count=(length + 7) >> 3),
+                         count=length, bitorder="little")
+    change = np.flatnonzero((ticks[1:] != ticks[:-1]) | (bits[1:] != bits[:-1])) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [length]))
+    runs = ticks[starts].tolist(), ends.tolist(), bits[starts].tolist()
+    del ticks, bits
+    return runs
+
+
+def _set_bits(mask, start, end):
+    """Liga os bits [start, end) do bytearray `mask` (bytes inteiros de uma vez)."""
+    while start < end and start & 7:
+        mask[start >> 3] |= 1 << (start & 7)
+        start += 1
+    full_end = end & ~7
+    if start < full_end:
+        mask[start >> 3:full_end >> 3] = b"\xff" * ((full_end - start) >> 3)
+        start = full_end
+    while start < end:
+        mask[start >> 3] |= 1 << (start & 7)
+        start += 1
+
+
+class Timeline:
+    """Timeline compacta com visão compatível com lista."""
+
+    def __init__(self, task_ids=(), run_length=False):
+        self.task_ids = []
+        self._index = {}
+        for task_id in task_ids:
+            self.intern(task_id)
+        self.run_length = run_length
+        self._len = 0
+        # Modo denso
+        self._slots = array("i")
+        self._lottery = bytearray()
+        # Modo run-length: corrida k cobre [_run_ends[k-1], _run_ends[k])
+        self._run_slots = array("i")
+        self._run_lottery = bytearray()
+        self._run_ends = array("q")
+
+    def intern(self, task_id):
+        """Índice numérico do id de tarefa (criado na primeira vez)."""
+        index = self._index.get(task_id)
+        if index is None:
+            index = self._index[task_id] = len(self.task_ids)
+            self.task_ids.append(task_id)
+        return index
+
+    # ------------------------------------------------------------------ escrita
+    def append(self, task_id=None, lottery=False):
+        """Registra um tick: id da tarefa executada (None = ociosa)."""
+        self.extend_run(task_id, 1, lottery)
+
+    def extend_run(self, task_id, count, lottery=False):
+        """Registra `count` ticks consecutivos da mesma tarefa (ou ociosos)."""
+        if count <= 0:
+            return
+        slot = IDLE if task_id is None else self.intern(task_id)
+        lottery = bool(lottery) and slot != IDLE
+        start = self._len
+        self._len += count
+        if self.run_length:
+            if (self._run_ends and self._run_slots[-1] == slot
+                    and self._run_lottery[-1] == lottery):
+                self._run_ends[-1] = self._len
+            else:
+                self._run_slots.append(slot)
+                self._run_lottery.append(lottery)
+                self._run_ends.append(self._len)
+            return
+        if count == 1:
+            self._slots.append(slot)
+        else:
+            self._slots.extend(array("i", [slot]) * count)
+        needed = (self._len + 7) >> 3
+        if len(self._lottery) < needed:
+            self._lottery.extend(bytes(needed - len(self._lottery)))
+        if lottery:
+            _set_bits(self._lottery, start, self._len)
+
+    # ------------------------------------------------------------------ leitura
+    def slot_at(self, tick):
+        """(índice da tarefa ou IDLE, sorteado?) no tick."""
+        if self.run_length:
+            k = bisect_right(self._run_ends, tick)
+            return self._run_slots[k], bool(self._run_lottery[k])
+        return self._slots[tick], bool(self._lottery[tick >> 3] >> (tick & 7) & 1)
+
+    def _run_count(self, length):
+        """Número de corridas (modo run-length) que cobrem os primeiros `length` ticks."""
+        return bisect_right(self._run_ends, length - 1) + 1 if length else 0
+
+    def _runs(self, length):
+        """(índices, fins, sorteios) das corridas dos primeiros `length` ticks."""
+        if not self.run_length:
+            return _dense_runs(self._slots, self._lottery, length)
+        k = self._run_count(length)
+        ends = self._run_ends[:k]
+        if k:
+            ends[-1] = length
+        return self._run_slots[:k], ends, self._run_lottery[:k]
+
+    def _iter_runs(self, length):
+        slots, ends, lotteries = self._runs(length)
+        start = 0
+        for slot, end, lottery in zip(slots, ends, lotteries):
+            yield start, end, slot, bool(lottery)
+            start = end
+
+    def _run_arrays(self, length):
+        slots, ends, _ = self._runs(length)
+        if self.run_length:
+            return slots, ends
+        return array("i", slots), array("q", ends)
+
+    def _lottery_mask(self, length):
+        if not self.run_length:
+            mask = self._lottery[:(length + 7) >> 3]
+            if length & 7:
+                mask[-1] &= (1 << (length & 7)) - 1
+            return bytes(mask)
+        mask = bytearray((length + 7) >> 3)
+        for start, end, _, lottery in self._iter_runs(length):
+            if lottery:
+                _set_bits(mask, start, end)
+        return bytes(mask)
+
+    def _expanded_slots(self, length):
+        out = array("i")
+        for start, end, slot, _ in self._iter_runs(length):
+            out.extend(array("i", [slot]) * (end - start))
+        return out
+
+    def runs(self):
+        """Itera corridas (início, fim, índice ou IDLE, sorteado?) em ordem."""
+        return self._iter_runs(self._len)
+
+    def run_arrays(self):
+        """(índices, fins) das corridas de `runs()` como `array('i')`/`array('q')`.
+
+        No modo run-length é uma cópia direta do armazenamento; no modo denso
+        as corridas são calculadas com NumPy sobre o array por tick. Corridas
+        vizinhas podem repetir o índice quando só a marca de sorteio muda.
+        """
+        return self._run_arrays(self._len)
+
+    def slots(self):
+        """`array('i')` com o índice da tarefa por tick (IDLE quando ociosa)."""
+        if not self.run_length:
+            return self._slots
+        return self._expanded_slots(self._len)
+
+    def lottery_mask(self):
+        """Bitmask (bit `t & 7` do byte `t >> 3`) dos ticks decididos por sorteio."""
+        if not self.run_length:
+            return bytes(self._lottery)
+        return self._lottery_mask(self._len)
+
+    def ids(self):
+        """Itera os ids base por tick (sem sufixo de sorteio; None = ociosa)."""
+        names = self.task_ids
+        for start, end, slot, _ in self.runs():
+            name = None if slot == IDLE else names[slot]
+            for _ in range(end - start):
+                yield name
+
+    def view(self, length=None):
+        """Prefixo somente leitura dos primeiros `length` ticks (default: todos), em O(1)."""
+        return TimelineView(self, self._len if length is None else min(length, self._len))
+
+    def copy(self, length=None):
+        """Cópia independente dos primeiros `length` ticks (default: todos).
+
+        Copia fatias do armazenamento (sem percorrer ticks), mas ainda
+        O(length); para rebobinar sem copiar o prefixo use `truncate`.
+        """
+        length = self._len if length is None else max(0, min(length, self._len))
+        clone = Timeline(run_length=self.run_length)
+        clone.task_ids = list(self.task_ids)
+        clone._index = dict(self._index)
+        clone._len = length
+        if self.run_length:
+            k = self._run_count(length)
+            clone._run_slots = self._run_slots[:k]
+            clone._run_lottery = self._run_lottery[:k]
+            clone._run_ends = self._run_ends[:k]
+            if k:
+                clone._run_ends[-1] = length
+            return clone
+        clone._slots = self._slots[:length]
+        clone._lottery = self._lottery[:(length + 7) >> 3]
+        if length & 7:
+            clone._lottery[-1] &= (1 << (length & 7)) - 1
+        return clone
+
+    def truncate(self, length):
+        """Descarta os ticks a partir de `length`, no próprio armazenamento.
+
+        Custa O(ticks descartados): o prefixo não é copiado. Usado para
+        rebobinar ao restaurar um checkpoint do simulador. Views mais longas
+        que `length` só voltam a ser legíveis quando a timeline crescer de
+        novo até o comprimento delas (até lá levantam IndexError).
+        """
+        length = max(0, min(length, self._len))
+        self._len = length
+        if self.run_length:
+            k = self._run_count(length)
+            del self._run_slots[k:]
+            del self._run_lottery[k:]
+            del self._run_ends[k:]
+            if k:
+                self._run_ends[-1] = length
+            return
+        del self._slots[length:]
+        del self._lottery[(length + 7) >> 3:]
+        if length & 7:
+            self._lottery[-1] &= (1 << (length & 7)) - 1
+
+    # ---------------------------------------------------- visão compatível com lista
+    def _label(self, slot, lottery):
+        if slot == IDLE:
+            return None
+        name = self.task_ids[slot]
+        return name + "L" if lottery else name
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(self._len))]
+        if item < 0:
+            item += self._len
+        if not 0 <= item < self._len:
+            raise IndexError("timeline index out of range")
+        return self._label(*self.slot_at(item))
+
+    def __iter__(self):
+        if not self.run_length:
+            names, mask = self.task_ids, self._lottery
+            for tick, slot in enumerate(self._slots):
+                if slot == IDLE:
+                    yield None
+                elif mask[tick >> 3] >> (tick & 7) & 1:
+                    yield names[slot] + "L"
+                else:
+                    yield names[slot]
+            return
+        for start, end, slot, lottery in self.runs():
+            label = self._label(slot, lottery)
+            for _ in range(end - start):
+                yield label
+
+    def __eq__(self, other):
+        if isinstance(other, (Timeline, TimelineView, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        preview = self[:20]
+        more = ", ..." if self._len > 20 else ""
+        return f"Timeline({preview}{more} len={self._len})"
+
+
+class TimelineView:
+    """Prefixo congelado de uma `Timeline` que compartilha o armazenamento.
+
+    A timeline só cresce durante a simulação: ticks anteriores a `len(view)`
+    não mudam (no modo run-length só o fim da última corrida cresce, e a
+    view corta as corridas no próprio comprimento). A exceção é
+    `Timeline.truncate` (restauração de checkpoint), que encolhe o
+    armazenamento compartilhado: enquanto a timeline estiver mais curta que
+    a view, só os ticks abaixo do comprimento atual dela podem ser lidos
+    (`slot_at`, indexação) e as leituras da view inteira levantam
+    IndexError. Como a reexecução é determinística, a view volta a valer
+    quando a timeline repassa pelo seu comprimento.
+
+    Mesma API de leitura da `Timeline`; `copy()` materializa uma `Timeline`
+    independente.
+    """
+
+    __slots__ = ("_timeline", "_len")
+
+    def __init__(self, timeline, length):
+        self._timeline = timeline
+        self._len = length
+
+    @property
+    def task_ids(self):
+        return self._timeline.task_ids
+
+    @property
+    def run_length(self):
+        return self._timeline.run_length
+
+    def _live(self):
+        """A timeline; levanta IndexError se foi truncada abaixo da view."""
+        if self._len > len(self._timeline):
+            raise IndexError(f"view de {self._len} ticks sobre timeline truncada "
+                             f"para {len(self._timeline)}")
+        return self._timeline
+
+    def slot_at(self, tick):
+        if not 0 <= tick < min(self._len, len(self._timeline)):
+            raise IndexError("timeline index out of range")
+        return self._timeline.slot_at(tick)
+
+    def runs(self):
+        return self._live()._iter_runs(self._len)
+
+    def run_arrays(self):
+        return self._live()._run_arrays(self._len)
+
+    def slots(self):
+        if not self.run_length:
+            return self._live()._slots[:self._len]
+        return self._live()._expanded_slots(self._len)
+
+    def lottery_mask(self):
+        return self._live()._lottery_mask(self._len)
+
+    def ids(self):
+        return islice(self._live().ids(), self._len)
+
+    def view(self, length=None):
+        return TimelineView(self._timeline, self._len if length is None else min(length, self._len))
+
+    def copy(self):
+        return self._live().copy(self._len)
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(self._len))]
+        if item < 0:
+            item += self._len
+        return self._timeline._label(*self.slot_at(item))
+
+    def __iter__(self):
+        return islice(iter(self._live()), self._len)
+
+    def __eq__(self, other):
+        if isinstance(other, (Timeline, TimelineView, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        preview = [self[i] for i in range(min(20, self._len, len(self._timeline)))]
+        more = ", ..." if self._len > len(preview) else ""
+        return f"TimelineView({preview}{more} len={self._len})"
@@ -0,0 +1,138 @@
+"""workload.py
+==============
+Gerador de cargas sintéticas parametrizadas para benchmarks e varreduras.
+
+`generate_default_config` só escreve N tarefas triviais (duração 2–4, sem
+eventos). Aqui a carga é descrita por:
+
+- `tasks`: número de tarefas;
+- `arrival`: processo de chegada
+    * "poisson": intervalos exponenciais com taxa `rate` (tarefas/tick);
+    * "uniform": ingressos uniformes em [0, tasks / rate);
+    * "batch": todas no tick 0;
+- `burst`: distribuição da duração (ticks de CPU), média `mean_burst`
+    * "exponential", "uniform" (1 .. 2·média), "pareto" (cauda pesada,
+      forma 2.5) ou "constant";
+- `mutex_density`: probabilidade de uma tarefa ter uma seção crítica
+  (lock/unlock de um dos `mutexes` mutexes);
+- `io_density`: operações de E/S esperadas por tick de CPU da tarefa, com
+  duração média `mean_io`;
+- `deadline_factor`: prazo relativo = ⌈fator × duração⌉ (0 = sem prazo).
+  Não consome o gerador aleatório: a mesma semente gera a mesma carga com ou
+  sem prazos.
+
+Eventos ficam em tempos relativos < duração (eventos no último instante
+nunca disparariam), cada tarefa usa no máximo uma seção crítica (sem
+aninhamento) e o unlock vem depois do lock. Sem mutexes toda carga termina.
+Com `mutex_density > 0` isso não é garantido: uma tarefa suspensa em lock
+continua avançando `elapsed_time` (semântica do simulador), então pode
+adquirir o mutex já depois do instante do próprio unlock e retê-lo para
+sempre; a execução então para em `tick_limit` (ver `completed` no benchmark).
+
+O resultado tem o mesmo formato de `load_config`, e `write_config` o grava no
+formato de arquivo do projeto.
+"""
+
+import math
+import random
+
+
+ARRIVALS = ("poisson", "uniform", "batch")
+BURSTS = ("exponential", "uniform", "pareto", "constant")
+
+
+def _burst(rng, kind, mean):
+    if kind == "constant":
+        return max(1, round(mean))
+    if kind == "uniform":
+        return rng.randint(1, max(1, round(2 * mean) - 1))
+    if kind == "pareto":
+        shape = 2.5  # média de paretovariate = shape / (shape - 1)
+        return max(1, round(rng.paretovariate(shape) * mean * (shape - 1) / shape))
+    return max(1, round(rng.expovariate(1 / mean)))
+
+
+def generate_workload(tasks=100, arrival="poisson", rate=0.2, burst="exponential",
+                      mean_burst=5, mutex_density=0.0, mutexes=1, io_density=0.0,
+                      mean_io=3, priorities=5, seed=0, deadline_factor=0.0):
+    """Gera a lista de tarefas (dicts aceitos por `TaskControlBlock`).
+
+    Returns:
+        list[dict]: tarefas no formato de `config_loader.parse_task_line`
+    """
+    if arrival not in ARRIVALS:
+        raise ValueError(f"Processo de chegada desconhecido: {arrival}")
+    if burst not in BURSTS:
+        raise ValueError(f"Distribuição de duração desconhecida: {burst}")
+    rng = random.Random(seed)
+    span = tasks / rate if rate > 0 else 0
+    clock = 0.0
+    out = []
+    for i in range(tasks):
+        if arrival == "poisson":
+            at = int(clock)
+            clock += rng.expovariate(rate) if rate > 0 else 0
+        elif arrival == "uniform":
+            at = int(rng.random() * span)
+        else:
+            at = 0
+        duration = _burst(rng, burst, mean_burst)
+
+        events = []
+        if duration > 1 and rng.random() < mutex_density:
+            mutex_id = rng.randint(1, mutexes)
+            lock_at = rng.randrange(0, duration - 1)
+            unlock_at = rng.randint(lock_at + 1, duration - 1)
+            events = [{"type": "lock", "mutex_id": mutex_id, "time": lock_at},
+                      {"type": "unlock", "mutex_id": mutex_id, "time": unlock_at}]
+
+        io_events = []
+        if io_density > 0:
+            for _ in range(_poisson(rng, io_density * duration)):
+                io_events.append({"type": "io", "time": rng.randrange(0, duration),
+                                  "duration": max(1, round(rng.expovariate(1 / mean_io)))})
+            io_events.sort(key=lambda e: e["time"])
+
+        out.append({
+            "id_": f"T{i + 1}",
+            "color": "#%06X" % rng.randrange(0x1000000),
+            "arrival": at,
+            "duration": duration,
+            "priority": rng.randint(1, priorities),
+            "events": events,
+            "io_events": io_events,
+            "deadline": math.ceil(deadline_factor * duration) if deadline_factor > 0 else None,
+        })
+    return out
+
+
+def _poisson(rng, lam):
+    """Amostra de Poisson(lam) por soma de exponenciais (lam pequeno por tarefa)."""
+    count, total = 0, rng.expovariate(1.0)
+    while total < lam:
+        count += 1
+        total += rng.expovariate(1.0)
+    return count
+
+
+def tick_budget(tasks):
+    """Limite de ticks suficiente para a carga terminar (chegada + CPU + E/S).
+
+    Cada início de E/S pode custar um tick ocioso extra, daí o `+ 1` por operação.
+    """
+    last = max((t["arrival"] for t in tasks), default=0)
+    work = sum(t["duration"] + sum(io["duration"] + 1 for io in t["io_events"]) for t in tasks)
+    return last + work + len(tasks) + 1
+
+
+def write_config(path, tasks, algorithm="FIFO", quantum=3, alpha=0):
+    """Grava a carga no formato de arquivo de configuração do projeto."""
+    with open(path, "w") as f:
+        header = f"{algorithm};{quantum};{alpha}" if algorithm.upper() == "PRIOPENV" else f"{algorithm};{quantum}"
+        f.write(header + "\n")
+        for t in tasks:
+            parts = [f"M{'L' if e['type'] == 'lock' else 'U'}{e['mutex_id']:02d}:{e['time']}" for e in t["events"]]
+            parts += [f"IO:{e['time']}-{e['duration']}" for e in t["io_events"]]
+            deadline = "" if t.get("deadline") is None else f";{t['deadline']}"
+            f.write(f"{t['id_']};{t['color']};{t['arrival']};{t['duration']};{t['priority']};{','.join(parts)}{deadline}\n")
+    return path